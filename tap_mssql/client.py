@@ -1,26 +1,66 @@
 """SQL client handling.
 
-This includes MSSQLStream and MSSQLConnector.
+This includes MSSQLStream, MSSQLChangeTrackingStream, MSSQLTemporalStream and
+MSSQLConnector.
 """
 
 from __future__ import annotations
 
+import copy
 import datetime
+import decimal
+import fnmatch
+import json
+import random
+import re
+import time
 import typing as t
 from functools import cached_property
+from pathlib import Path
 
+import sqlalchemy as sa
 from singer_sdk import SQLConnector, SQLStream
 from singer_sdk.helpers._state import increment_state
+from singer_sdk.helpers._typing import to_json_compatible
 from sqlalchemy import URL, text
+from sqlalchemy.dialects import mssql
+from sqlalchemy.engine.reflection import ObjectKind
+from sqlalchemy.sql.util import ClauseAdapter
+
+from tap_mssql.pipeline import RowPrefetcher, merge_concurrently
+from tap_mssql.planner import WarningCollector, get_plan_warnings, parse_showplan
+from tap_mssql.replay import QueryRecorder, QueryReplayer
+from tap_mssql.sharding import get_segment_ranges
+from tap_mssql.snapshots import diff_key_snapshot
+from tap_mssql.tracing import StatementTracer
 
 if t.TYPE_CHECKING:
+    import threading
+
+    from singer_sdk import singerlib as singer
     from singer_sdk.helpers import types
     from singer_sdk.helpers.types import Context
+    from singer_sdk.singerlib import CatalogEntry
+    from sqlalchemy.engine import Engine, Inspector, reflection
 
 
 class MSSQLConnector(SQLConnector):
     """Connects to the MSSQL SQL source."""
 
+    # Errors after which a query can be retried on a new connection: deadlock
+    # victim, Azure SQL failovers and resource limits.
+    TRANSIENT_ERROR_CODES = frozenset({1205, 10928, 40197, 40613})
+
+    # ODBC SQLSTATEs of lost connections and serialization failures.
+    TRANSIENT_SQLSTATES = frozenset({"08S01", "08001", "40001"})
+
+    # The most table names reflected at once. The dialect binds every name as a
+    # parameter, and SQL Server accepts at most 2,100 parameters per statement.
+    DISCOVERY_BATCH_SIZE = 1000
+
+    # The connector of the primary, for connectors to read replicas.
+    primary: MSSQLConnector | None = None
+
     def get_sqlalchemy_url(self, config: dict) -> str:
         """Generates the SQLAlchemy URL.
 
@@ -45,6 +85,367 @@ class MSSQLConnector(SQLConnector):
 
         return connection_url.render_as_string(hide_password=False)
 
+    def get_replica_connector(self, replica: dict) -> MSSQLConnector:
+        """Returns a connector to a readable secondary replica.
+
+        The replica is connected to with the credentials, database and URL query
+        options of the primary, or its `sqlalchemy_url_query` with the host and
+        port replaced, and ApplicationIntent=ReadOnly. Statements are recorded
+        and traced by the recorder and tracer of the primary.
+
+        Args:
+            replica: The host and optional port of the replica.
+
+        Returns:
+            The connector.
+        """
+        config = {
+            key: value
+            for key, value in self.config.items()
+            if key != "read_replicas"
+        }
+        config["host"] = replica["host"]
+        config["port"] = replica.get("port", self.config.get("port"))
+        config["sqlalchemy_url_query_options"] = [
+            *(
+                option
+                for option in self.config.get("sqlalchemy_url_query_options", [])
+                if option["key"].lower() != "applicationintent"
+            ),
+            {"key": "ApplicationIntent", "value": "ReadOnly"},
+        ]
+        if self.config.get("sqlalchemy_url_query"):
+            url = sa.make_url(self.config["sqlalchemy_url_query"])
+            config["sqlalchemy_url_query"] = url.set(
+                host=replica["host"],
+                port=replica.get("port", url.port),
+                query={
+                    **{
+                        key: value
+                        for key, value in url.query.items()
+                        if key.lower() != "applicationintent"
+                    },
+                    "ApplicationIntent": "ReadOnly",
+                },
+            ).render_as_string(hide_password=False)
+        connector = type(self)(config)
+        connector.primary = self
+        return connector
+
+    def is_transient_error(self, error: BaseException) -> bool:
+        """Returns whether a query that failed with an error can be retried.
+
+        pyodbc errors hold the ODBC SQLSTATE as their first argument and the
+        native SQL Server error codes in parentheses in their message.
+
+        Args:
+            error: The error, or the SQLAlchemy error wrapping it.
+
+        Returns:
+            True for transient errors, False for fatal ones.
+        """
+        if isinstance(error, sa.exc.DBAPIError):
+            error = error.orig
+        args = getattr(error, "args", ())
+        if args and args[0] in self.TRANSIENT_SQLSTATES:
+            return True
+        return any(
+            int(code) in self.TRANSIENT_ERROR_CODES
+            for code in re.findall(r"\((\d+)\)", str(error))
+        )
+
+    @cached_property
+    def statement_wrappers(self) -> list[QueryRecorder | StatementTracer]:
+        """Returns the recorder and tracer wrapping the DBAPI connections.
+
+        Connectors to read replicas share those of the primary, so that a single
+        instance appends to each file.
+
+        Returns:
+            The recorder and tracer, if configured.
+        """
+        if self.primary is not None:
+            return self.primary.statement_wrappers
+        wrappers: list[QueryRecorder | StatementTracer] = []
+        if self.config.get("sql_record_file"):
+            wrappers.append(QueryRecorder(self.config["sql_record_file"]))
+        if self.config.get("trace_file"):
+            wrappers.append(
+                StatementTracer(
+                    self.config["trace_file"],
+                    statistics=self.config.get("trace_statistics", False),
+                )
+            )
+        return wrappers
+
+    def create_engine(self) -> Engine:
+        """Creates the engine, wrapping its DBAPI connections where configured.
+
+        With `sql_replay_file` set, the engine serves a recording through a fake
+        DBAPI module instead of connecting to the server. Connections are
+        recorded to `sql_record_file` and traced to `trace_file`, if set.
+
+        Returns:
+            A new SQLAlchemy Engine.
+        """
+        if self.config.get("sql_replay_file"):
+            replayer = QueryReplayer(
+                self.config["sql_replay_file"],
+                speed=self.config.get("sql_replay_speed", 1.0),
+                any_parameters=self.config.get("sql_replay_any_parameters", False),
+            )
+            engine = sa.create_engine(
+                self.sqlalchemy_url,
+                module=replayer.dbapi,
+                echo=False,
+                pool_pre_ping=True,
+                json_serializer=self.serialize_json,
+                json_deserializer=self.deserialize_json,
+            )
+        else:
+            engine = super().create_engine()
+
+        wrappers = self.statement_wrappers
+        if wrappers:
+
+            @sa.event.listens_for(engine, "do_connect")
+            def connect(
+                    dialect: sa.Dialect,
+                    connection_record: t.Any,  # noqa: ANN401, ARG001
+                    cargs: tuple,
+                    cparams: dict,
+            ) -> t.Any:  # noqa: ANN401
+                connection = dialect.loaded_dbapi.connect(*cargs, **cparams)
+                for wrapper in wrappers:
+                    connection = wrapper.wrap(
+                        connection, dialect.loaded_dbapi.Error
+                    )
+                return connection
+
+        return engine
+
+    def to_jsonschema_type(self, sql_type: sa.types.TypeEngine) -> dict:
+        """Returns a JSON Schema representation of the provided type.
+
+        rowversion/timestamp columns are represented as integers.
+
+        Returns:
+            The JSON Schema representation of the provided type.
+        """
+        if isinstance(sql_type, mssql.TIMESTAMP):
+            return {"type": ["integer"]}
+        return super().to_jsonschema_type(sql_type)
+
+    def get_table_columns(
+            self,
+            full_table_name: str,
+            column_names: list[str] | None = None,
+    ) -> dict[str, sa.Column]:
+        """Returns a list of table columns.
+
+        rowversion/timestamp columns are read as integers.
+
+        Returns:
+            An ordered list of column objects.
+        """
+        columns = super().get_table_columns(full_table_name, column_names)
+        for column in columns.values():
+            if isinstance(column.type, mssql.TIMESTAMP):
+                column.type = mssql.TIMESTAMP(convert_int=True)
+        return columns
+
+    def discover_catalog_entry(
+            self,
+            engine: Engine,
+            inspected: Inspector,
+            schema_name: str | None,
+            table_name: str,
+            is_view: bool,  # noqa: FBT001
+            **kwargs: t.Any,
+    ) -> CatalogEntry:
+        """Creates a `CatalogEntry` object for the given table or view.
+
+        A rowversion/timestamp column is advertised as a valid replication key.
+
+        Args:
+            engine: The engine discovered with.
+            inspected: The inspector of the database.
+            schema_name: The schema of the table or view.
+            table_name: The name of the table or view.
+            is_view: Whether it is a view.
+            kwargs: The reflected columns, primary key and indices, if reflected
+                in bulk.
+
+        Returns:
+            `CatalogEntry` object for the given table or a view.
+        """
+        catalog_entry = super().discover_catalog_entry(
+            engine,
+            inspected,
+            schema_name,
+            table_name,
+            is_view,
+            **kwargs,
+        )
+        reflected_columns: list[reflection.ReflectedColumn] = (
+            kwargs.get("reflected_columns") or []
+        )
+        rowversion_columns = [
+            column["name"] for column in reflected_columns
+            if isinstance(column["type"], mssql.TIMESTAMP)
+        ]
+        if rowversion_columns:
+            catalog_entry.metadata.root.valid_replication_keys = rowversion_columns
+        return catalog_entry
+
+    def get_discovery_query(self) -> sa.Select | None:
+        """Builds the query listing the tables and views selected for discovery.
+
+        `discovery_include` and `discovery_exclude` glob patterns are matched
+        against `schema.table` with LIKE, so that SQL Server filters the names.
+        The patterns and object types are bound as parameters.
+
+        Returns:
+            The query, or None if discovery is not filtered.
+        """
+        include = self.config.get("discovery_include") or []
+        exclude = self.config.get("discovery_exclude") or []
+        object_types = self.config.get("discovery_object_types") or []
+        if not include and not exclude and not object_types:
+            return None
+
+        tables = sa.table(
+            "TABLES",
+            sa.column("TABLE_SCHEMA", sa.Unicode),
+            sa.column("TABLE_NAME", sa.Unicode),
+            sa.column("TABLE_TYPE", sa.String),
+            schema="INFORMATION_SCHEMA",
+        )
+        qualified_name = tables.c.TABLE_SCHEMA + "." + tables.c.TABLE_NAME
+        table_types = [
+            DISCOVERY_TABLE_TYPES[object_type]
+            for object_type in object_types or DISCOVERY_TABLE_TYPES
+        ]
+        query = (
+            sa.select(tables.c.TABLE_SCHEMA, tables.c.TABLE_NAME, tables.c.TABLE_TYPE)
+            .where(tables.c.TABLE_TYPE.in_(table_types))
+            .order_by(tables.c.TABLE_SCHEMA, tables.c.TABLE_NAME)
+        )
+        if include:
+            query = query.where(
+                sa.or_(
+                    *(qualified_name.like(glob_to_like(pattern)) for pattern in include)
+                )
+            )
+        if exclude:
+            query = query.where(
+                sa.not_(
+                    sa.or_(
+                        *(
+                            qualified_name.like(glob_to_like(pattern))
+                            for pattern in exclude
+                        )
+                    )
+                )
+            )
+        return query
+
+    def discover_catalog_entries(
+            self,
+            *,
+            exclude_schemas: t.Sequence[str] = (),
+            reflect_indices: bool = True,
+    ) -> list[dict]:
+        """Returns the catalog entries of the tables and views selected for discovery.
+
+        With discovery filters configured, the selected tables and views are
+        listed first and only those are reflected.
+
+        Returns:
+            The discovered catalog entries as a list.
+        """
+        query = self.get_discovery_query()
+        if query is None:
+            return super().discover_catalog_entries(
+                exclude_schemas=exclude_schemas,
+                reflect_indices=reflect_indices,
+            )
+
+        object_names: dict[tuple[str, bool], list[str]] = {}
+        with self._connect() as conn:
+            for schema_name, table_name, table_type in conn.execute(query):
+                if schema_name not in exclude_schemas:
+                    object_names.setdefault(
+                        (schema_name, table_type == "VIEW"), []
+                    ).append(table_name)
+
+        inspected = sa.inspect(self._engine)
+        result: list[dict] = []
+        for (schema_name, is_view), names in object_names.items():
+            for start in range(0, len(names), self.DISCOVERY_BATCH_SIZE):
+                result.extend(
+                    self.discover_catalog_batch(
+                        inspected,
+                        schema_name,
+                        names[start:start + self.DISCOVERY_BATCH_SIZE],
+                        is_view,
+                        reflect_indices=reflect_indices,
+                    )
+                )
+        return result
+
+    def discover_catalog_batch(
+            self,
+            inspected: Inspector,
+            schema_name: str,
+            filter_names: list[str],
+            is_view: bool,  # noqa: FBT001
+            *,
+            reflect_indices: bool = True,
+    ) -> list[dict]:
+        """Returns the catalog entries of tables or views of a schema.
+
+        Args:
+            inspected: SQLAlchemy inspector instance for the engine.
+            schema_name: The schema of the tables or views.
+            filter_names: The names of the tables or views, at most
+                DISCOVERY_BATCH_SIZE.
+            is_view: Whether the names are views.
+            reflect_indices: Whether to reflect indices to detect potential primary
+                keys.
+
+        Returns:
+            The catalog entries as a list.
+        """
+        columns = inspected.get_multi_columns(
+            schema=schema_name,
+            kind=ObjectKind.ANY_VIEW if is_view else ObjectKind.TABLE,
+            filter_names=filter_names,
+        )
+        primary_keys = {}
+        indices = {}
+        if not is_view:
+            primary_keys = inspected.get_multi_pk_constraint(
+                schema=schema_name, filter_names=filter_names
+            )
+            if reflect_indices:
+                indices = inspected.get_multi_indexes(
+                    schema=schema_name, filter_names=filter_names
+                )
+        return [
+            self.discover_catalog_entry(
+                self._engine,
+                inspected,
+                schema_name,
+                table,
+                is_view,
+                reflected_columns=columns[schema, table],
+                reflected_pk=primary_keys.get((schema, table)),
+                reflected_indices=indices.get((schema, table), []),
+            ).to_dict()
+            for schema, table in columns
+        ]
+
     @cached_property
     def database_change_tracking_enabled(self) -> bool:
         """Returns if the database is enabled for change tracking.
@@ -96,6 +497,56 @@ class MSSQLConnector(SQLConnector):
                 }
             ).first()[0]
 
+    def get_delete_commit_times(
+            self,
+            table_name: str,
+            previous_version: int,
+    ) -> dict[int, datetime.datetime]:
+        """Returns the commit times of the deletes change tracking recorded for a table.
+
+        Args:
+            table_name: The table.
+            previous_version: The version after which deletes are looked up.
+
+        Returns:
+            The commit time in UTC, keyed by change tracking version.
+        """
+        with self._connect() as conn:
+            return {
+                r[0]: r[1] for r in
+                conn.execute(
+                    text(
+                        "SELECT tc.commit_ts, tc.commit_time "  # noqa: S608
+                        "FROM sys.dm_tran_commit_table AS tc "
+                        "WHERE tc.commit_ts IN ("
+                        "SELECT c.SYS_CHANGE_VERSION FROM CHANGETABLE("
+                        f"CHANGES {self.quote(table_name)}, :previous_version) AS c "
+                        "WHERE c.SYS_CHANGE_OPERATION = 'D')"
+                    ),
+                    {"previous_version": previous_version},
+                )
+            }
+
+    def get_column_ids(self, table_name: str) -> dict[str, int]:
+        """Returns the column ids of a table, as used in SYS_CHANGE_COLUMNS masks.
+
+        Returns:
+            The column ids keyed by column name.
+        """
+        with self._connect() as conn:
+            return {
+                r[0]: r[1] for r in
+                conn.execute(
+                    text(
+                        "SELECT name, column_id FROM sys.columns "
+                        "WHERE object_id = OBJECT_ID(:table_name)"
+                    ),
+                    {
+                        "table_name": table_name
+                    }
+                )
+            }
+
     @property
     def change_tracking_current_version(self) -> int:
         """Returns the current change tracking version of the connected database.
@@ -110,121 +561,2069 @@ class MSSQLConnector(SQLConnector):
                 )
             ).first()[0]
 
+    @cached_property
+    def temporal_tables(self) -> list[str]:
+        """Returns the system-versioned temporal tables of the connected database.
 
-class MSSQLStream(SQLStream):
-    """Stream class for MSSQL streams."""
+        Returns:
+            The names of all tables with temporal_type = 2.
+        """
+        with self._connect() as conn:
+            return [
+                r[0] for r in
+                conn.execute(
+                    text(
+                        "SELECT OBJECT_NAME(object_id) AS table_name FROM sys.tables "
+                        "WHERE temporal_type = 2"
+                    ))
+            ]
 
-    connector_class = MSSQLConnector
-    supports_nulls_first = False
+    def get_temporal_period_columns(self, table_name: str) -> tuple[str, str]:
+        """Returns the SYSTEM_TIME period columns of a temporal table.
 
+        Returns:
+            The names of the period start and period end columns.
+        """
+        with self._connect() as conn:
+            return tuple(conn.execute(
+                text(
+                    "SELECT cs.name, ce.name FROM sys.periods p "
+                    "INNER JOIN sys.columns cs ON cs.object_id = p.object_id "
+                    "AND cs.column_id = p.start_column_id "
+                    "INNER JOIN sys.columns ce ON ce.object_id = p.object_id "
+                    "AND ce.column_id = p.end_column_id "
+                    "WHERE p.object_id = OBJECT_ID(:table_name) AND p.period_type = 1"
+                ),
+                {
+                    "table_name": table_name
+                }
+            ).first())
 
-class MSSQLChangeTrackingStream(SQLStream):
-    """Stream class for MSSQL streams."""
+    @property
+    def system_time_current(self) -> datetime.datetime:
+        """Returns the UTC time of the server that changes can be read up to.
 
-    connector_class = MSSQLConnector
-    supports_nulls_first = False
+        The period start of a row is the begin time of the transaction that
+        wrote it, so rows of transactions still in flight will start before the
+        current time once committed. The time is therefore capped shortly before
+        the begin time of the oldest active transaction, which is only recorded
+        at a precision of a few milliseconds. If active transactions cannot be
+        read, the current time is used.
 
-    replication_key = "_sdc_change_version"
+        Returns:
+            The server time at microsecond precision, comparable with SYSTEM_TIME
+            period columns.
+        """
+        with self._connect() as conn:
+            try:
+                return conn.execute(
+                    text(
+                        "SELECT COALESCE(("
+                        "SELECT DATEADD(MILLISECOND, -4, DATEADD("
+                        "MINUTE, -DATEPART(TZOFFSET, SYSDATETIMEOFFSET()), "
+                        "CAST(MIN(at.transaction_begin_time) AS datetime2(6)))) "
+                        "FROM sys.dm_tran_active_transactions AS at "
+                        "WHERE at.transaction_type = 1 "
+                        "AND at.transaction_id <> CURRENT_TRANSACTION_ID()"
+                        "), CAST(SYSUTCDATETIME() AS datetime2(6)))"
+                    )
+                ).first()[0]
+            except sa.exc.DBAPIError as e:
+                self.logger.warning(
+                    "Cannot read active transactions from "
+                    "sys.dm_tran_active_transactions: %s Rows of transactions "
+                    "in flight may be missed.",
+                    e,
+                )
+                conn.rollback()
+            return conn.execute(
+                text("SELECT CAST(SYSUTCDATETIME() AS datetime2(6))")
+            ).first()[0]
 
     @cached_property
-    def schema(self) -> dict:
-        """Appends _sdc_deleted_at and _sdc_change_version to the schema.
+    def cdc_capture_instances(self) -> dict[str, tuple[str, bool]]:
+        """Returns the Change Data Capture instances of the connected database.
 
         Returns:
-            The dict.
+            The latest capture instance of each tracked table and whether it
+            supports net changes, keyed by table name.
         """
-        schema_dict = t.cast(dict, self._singer_catalog_entry.schema.to_dict())
+        with self._connect() as conn:
+            if conn.execute(
+                text("SELECT OBJECT_ID('cdc.change_tables')")
+            ).first()[0] is None:
+                return {}
+            return {
+                r[0]: (r[1], bool(r[2])) for r in
+                conn.execute(
+                    text(
+                        "SELECT OBJECT_NAME(source_object_id) AS table_name, "
+                        "capture_instance, supports_net_changes "
+                        "FROM cdc.change_tables ORDER BY create_date ASC"
+                    ))
+            }
 
-        schema_dict["properties"].update({"_sdc_deleted_at": {"type": ["string"]}})
+    def get_cdc_minimum_lsn(self, capture_instance: str) -> bytes:
+        """Returns the lowest LSN available for a capture instance.
 
-        schema_dict["properties"].update({"_sdc_change_version": {"type": ["integer"]}})
-        return schema_dict
+        Returns:
+            The minimum LSN of the capture instance.
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                text(
+                    "SELECT sys.fn_cdc_get_min_lsn(:capture_instance)"
+                ),
+                {
+                    "capture_instance": capture_instance
+                }
+            ).first()[0]
+
+    @property
+    def cdc_maximum_lsn(self) -> bytes:
+        """Returns the highest LSN available in the Change Data Capture tables.
+
+        Returns:
+            The maximum LSN.
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                text(
+                    "SELECT sys.fn_cdc_get_max_lsn()"
+                )
+            ).first()[0]
+
+    def get_cdc_lsn_ranges(
+            self,
+            from_lsn: bytes,
+            to_lsn: bytes,
+            interval: datetime.timedelta,
+    ) -> list[tuple[bytes, bytes]]:
+        """Splits an LSN range into ranges covering at most `interval` of commits.
+
+        Returns:
+            Consecutive (from_lsn, to_lsn) pairs covering the whole range.
+        """
+        ranges = []
+        with self._connect() as conn:
+            while from_lsn <= to_lsn:
+                first_commit_time = conn.execute(
+                    text(
+                        "SELECT MIN(tran_end_time) FROM cdc.lsn_time_mapping "
+                        "WHERE start_lsn >= :lsn"
+                    ),
+                    {
+                        "lsn": from_lsn
+                    }
+                ).first()[0]
+                if first_commit_time is None:
+                    break
+                range_end = conn.execute(
+                    text(
+                        "SELECT sys.fn_cdc_map_time_to_lsn("
+                        "'largest less than or equal', :window_end)"
+                    ),
+                    {
+                        "window_end": first_commit_time + interval
+                    }
+                ).first()[0]
+                range_end = min(range_end, to_lsn)
+                ranges.append((from_lsn, range_end))
+                from_lsn = lsn_to_bytes(lsn_to_version(range_end) + 1)
+        return ranges
 
     @cached_property
-    def change_tracking_current_version(self) -> int | None:
-        """Returns the current change tracking version of the connected database.
+    def table_sizes(self) -> dict[str, int]:
+        """Returns the space used by every table and its indexes.
 
         Returns:
-            The current change tracking version.
+            The used bytes keyed by stream id (schema-table).
         """
-        return self.connector.change_tracking_current_version
+        with self._connect() as conn:
+            return {
+                r[0]: r[1] for r in
+                conn.execute(
+                    text(
+                        "SELECT OBJECT_SCHEMA_NAME(object_id) + '-' "
+                        "+ OBJECT_NAME(object_id), SUM(used_page_count) * 8192 "
+                        "FROM sys.dm_db_partition_stats "
+                        "WHERE OBJECTPROPERTY(object_id, 'IsUserTable') = 1 "
+                        "GROUP BY object_id"
+                    )
+                )
+            }
 
     @cached_property
-    def minimum_valid_version(self) -> int | None:
-        """Returns the minimum valid version of a table as reported by SQL Server.
+    def table_row_counts(self) -> dict[str, int]:
+        """Returns the number of rows in every table.
 
         Returns:
-            The minimum valid version of the table.
+            The row counts keyed by stream id (schema-table).
         """
-        return self.connector.get_minimum_valid_version(str(self.fully_qualified_name))
+        with self._connect() as conn:
+            return {
+                r[0]: r[1] for r in
+                conn.execute(
+                    text(
+                        "SELECT OBJECT_SCHEMA_NAME(object_id) + '-' "
+                        "+ OBJECT_NAME(object_id), SUM(row_count) "
+                        "FROM sys.dm_db_partition_stats "
+                        "WHERE OBJECTPROPERTY(object_id, 'IsUserTable') = 1 "
+                        "AND index_id IN (0, 1) "
+                        "GROUP BY object_id"
+                    )
+                )
+            }
 
     @cached_property
-    def table_is_change_tracking_enabled(self) -> bool:
-        """Checks if the current table is enabled for change tracking.
+    def table_fingerprints(self) -> dict[str, list]:
+        """Returns values that change whenever rows of a table are modified.
+
+        These are the row count, the modification date of the table, the last
+        user update of any of its indexes and the server start time, since index
+        usage statistics are reset on restart.
 
         Returns:
-            True if the current table is enabled for change tracking, False otherwise.
+            The fingerprints keyed by stream id (schema-table).
         """
-        mssql_connector = t.cast(MSSQLConnector, self.connector)
-        table_name = mssql_connector.parse_full_table_name(self.fully_qualified_name)[2]
-        return table_name in mssql_connector.change_tracking_tables
+        with self._connect() as conn:
+            return {
+                r[0]: list(r[1:]) for r in
+                conn.execute(
+                    text(
+                        "SELECT OBJECT_SCHEMA_NAME(t.object_id) + '-' + t.name, "
+                        "(SELECT SUM(ps.row_count) "
+                        "FROM sys.dm_db_partition_stats AS ps "
+                        "WHERE ps.object_id = t.object_id AND ps.index_id IN (0, 1)), "
+                        "CONVERT(VARCHAR(33), t.modify_date, 126), "
+                        "CONVERT(VARCHAR(33), (SELECT MAX(us.last_user_update) "
+                        "FROM sys.dm_db_index_usage_stats AS us "
+                        "WHERE us.database_id = DB_ID() "
+                        "AND us.object_id = t.object_id), 126), "
+                        "CONVERT(VARCHAR(33), (SELECT sqlserver_start_time "
+                        "FROM sys.dm_os_sys_info), 126) "
+                        "FROM sys.tables AS t"
+                    )
+                )
+            }
 
-    @property
-    def connector(self) -> MSSQLConnector:
-        """Return the connector object.
+    def has_change_tracking_changes(self, table_name: str, version: int) -> bool:
+        """Returns whether change tracking recorded changes to a table after a version.
 
         Returns:
-            The connector object.
+            True if CHANGETABLE returns any change after the version.
         """
-        return t.cast(MSSQLConnector, self._connector)
+        with self._connect() as conn:
+            return conn.execute(
+                text(
+                    "SELECT TOP 1 1 FROM CHANGETABLE("  # noqa: S608
+                    f"CHANGES {self.quote(table_name)}, :version) AS c"
+                ),
+                {"version": version},
+            ).first() is not None
 
-    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
-        """Return a generator of record-type dictionary objects.
+    def has_cdc_changes(self, capture_instance: str, from_lsn: bytes) -> bool:
+        """Returns whether a capture instance recorded changes from an LSN on.
 
-        If the stream has a replication_key value defined, records will be sorted by the
-        incremental key. If the stream also has an available starting bookmark, the
-        records will be filtered for values greater than or equal to the bookmark value.
+        Returns:
+            True if the change table holds any change from the LSN on.
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                text(
+                    "SELECT TOP 1 1 FROM "  # noqa: S608
+                    f"{self.quote(f'cdc.{capture_instance}_CT')} "
+                    "WHERE __$start_lsn >= :from_lsn"
+                ),
+                {"from_lsn": from_lsn},
+            ).first() is not None
 
-        Args:
-            context: If partition context is provided, will read specifically from this
-                data slice.
+    def compile_query(
+            self,
+            query: sa.Executable,
+            parameters: dict[str, t.Any] | None = None,
+    ) -> tuple[str, dict[str, t.Any]]:
+        """Compiles a query into the statement sent to the server.
 
-        Yields:
-            One dict per record.
+        Returns:
+            The statement text and its bind parameters.
+        """
+        compiled = query.compile(dialect=self._dialect)
+        return str(compiled), {**compiled.params, **(parameters or {})}
 
-        Raises:
-            NotImplementedError: If partition is passed in context and the stream does
-                not support partitioning.
+    def get_showplan(
+            self,
+            query: sa.Executable,
+            parameters: dict[str, t.Any] | None = None,
+    ) -> str:
+        """Returns the estimated execution plan of a query, without executing it.
+
+        Returns:
+            The plan XML returned while SHOWPLAN_XML is on.
         """
-        bookmark: int = self.get_starting_replication_key_value(context=context)
-        minimum_valid_version = self.minimum_valid_version
-        change_tracking_enabled = self.table_is_change_tracking_enabled
+        compiled = query.compile(dialect=self._dialect)
+        bind_parameters = {**compiled.params, **(parameters or {})}
+        positional_parameters = tuple(
+            bind_parameters[name] for name in compiled.positiontup or ()
+        )
+        with self._connect() as conn:
+            conn.exec_driver_sql("SET SHOWPLAN_XML ON")
+            try:
+                return conn.exec_driver_sql(
+                    str(compiled), positional_parameters
+                ).scalar()
+            finally:
+                conn.exec_driver_sql("SET SHOWPLAN_XML OFF")
 
-        using_change_tracking = True
+    @cached_property
+    def columnstore_tables(self) -> list[str]:
+        """Returns the tables with a columnstore index.
 
-        if not self.primary_keys:
-            using_change_tracking = False
-            self.logger.warning(
-                "Table has no primary keys. Cannot use CHANGE_TRACKING. "
+        Returns:
+            The stream ids (schema-table) of the tables.
+        """
+        with self._connect() as conn:
+            return [
+                r[0] for r in
+                conn.execute(
+                    text(
+                        "SELECT DISTINCT OBJECT_SCHEMA_NAME(object_id) + '-' "
+                        "+ OBJECT_NAME(object_id) FROM sys.indexes "
+                        "WHERE type IN (5, 6) "
+                        "AND OBJECTPROPERTY(object_id, 'IsUserTable') = 1"
+                    )
+                )
+            ]
+
+    @cached_property
+    def heap_tables(self) -> list[str]:
+        """Returns the tables without a clustered index.
+
+        Returns:
+            The stream ids (schema-table) of the tables.
+        """
+        with self._connect() as conn:
+            return [
+                r[0] for r in
+                conn.execute(
+                    text(
+                        "SELECT OBJECT_SCHEMA_NAME(object_id) + '-' "
+                        "+ OBJECT_NAME(object_id) FROM sys.indexes "
+                        "WHERE index_id = 0 "
+                        "AND OBJECTPROPERTY(object_id, 'IsUserTable') = 1"
+                    )
+                )
+            ]
+
+    def get_column_segments(
+            self,
+            table_name: str,
+            column_name: str,
+    ) -> list[tuple[int, int, int]]:
+        """Returns the columnstore segments of a column.
+
+        Returns:
+            The minimum value, maximum value and row count of every segment.
+        """
+        with self._connect() as conn:
+            return [
+                (r[0], r[1], r[2]) for r in
+                conn.execute(
+                    text(
+                        "SELECT s.min_data_id, s.max_data_id, s.row_count "
+                        "FROM sys.column_store_segments AS s "
+                        "JOIN sys.partitions AS p ON p.hobt_id = s.hobt_id "
+                        "JOIN sys.index_columns AS ic "
+                        "ON ic.object_id = p.object_id AND ic.index_id = p.index_id "
+                        "AND ic.index_column_id = s.column_id "
+                        "WHERE p.object_id = OBJECT_ID(:table_name) "
+                        "AND ic.column_id = "
+                        "COLUMNPROPERTY(p.object_id, :column_name, 'ColumnId')"
+                    ),
+                    {
+                        "table_name": table_name,
+                        "column_name": column_name,
+                    }
+                )
+            ]
+
+
+# The INFORMATION_SCHEMA.TABLES type of every `discovery_object_types` value.
+DISCOVERY_TABLE_TYPES = {"table": "BASE TABLE", "view": "VIEW"}
+
+
+def glob_to_like(pattern: str) -> str:
+    """Converts a glob pattern to a LIKE pattern.
+
+    `*` matches any characters and `?` a single character. LIKE wildcards in
+    the pattern are matched literally.
+
+    Returns:
+        The LIKE pattern.
+    """
+    escaped = re.sub(r"([%_\[])", r"[\1]", pattern)
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+def from_json_compatible(value: t.Any, sql_type: sa.types.TypeEngine) -> t.Any:  # noqa: ANN401
+    """Converts a value saved in the state back to a value of a column type.
+
+    Datetimes are saved as ISO strings, naive ones as UTC, and decimals may be
+    read back as floats. Values rendered as JSON by the server are formatted the
+    same way, with binary values as hex.
+
+    Returns:
+        The value to bind against a column of the type.
+    """
+    if isinstance(value, str) and isinstance(sql_type, sa.DateTime):
+        parsed = datetime.datetime.fromisoformat(value)
+        if parsed.tzinfo is not None and not isinstance(
+            sql_type, mssql.DATETIMEOFFSET
+        ):
+            parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return parsed
+    if isinstance(value, str) and isinstance(sql_type, sa.Date):
+        return datetime.date.fromisoformat(value)
+    if isinstance(value, str) and isinstance(
+        sql_type, (sa.BINARY, sa.VARBINARY, sa.LargeBinary)
+    ):
+        return bytes.fromhex(value)
+    if (
+            isinstance(value, (str, float))
+            and isinstance(sql_type, sa.Numeric)
+            and not isinstance(sql_type, sa.Float)
+    ):
+        return decimal.Decimal(str(value))
+    return value
+
+
+def lsn_to_version(lsn: bytes) -> int:
+    """Converts a binary(10) log sequence number to an integer change version.
+
+    Returns:
+        The LSN as an integer.
+    """
+    return int.from_bytes(lsn, "big")
+
+
+def lsn_to_bytes(version: int) -> bytes:
+    """Converts an integer change version back to a binary(10) log sequence number.
+
+    Returns:
+        The LSN as bytes.
+    """
+    return version.to_bytes(10, "big")
+
+
+class MSSQLStream(SQLStream):
+    """Stream class for MSSQL streams."""
+
+    connector_class = MSSQLConnector
+    supports_nulls_first = False
+
+    FETCH_PIPELINE_BLOCK_SIZE = 1000
+    DIFFERENTIAL_SYNC_FANOUT = 16
+    DIFFERENTIAL_SYNC_RANGE_ROWS = 100000
+    TRANSIENT_ERROR_BACKOFF_SECONDS = 1.0
+    TRANSIENT_ERROR_MAX_BACKOFF_SECONDS = 60.0
+
+    # Primary key ranges read by this shard, set by the tap when a stream is split
+    # between shards. Bounds are (exclusive lower, inclusive upper).
+    shard_key_ranges: list[tuple[t.Any, t.Any]] | None = None
+
+    # Whether the pre-flight check found no changes since the last sync.
+    skip_extraction = False
+
+    # Whether records are being extracted, until the final state is written.
+    extracting = False
+
+    # Set once the process was asked to stop, after which the stream is not synced.
+    stop_requested: threading.Event | None = None
+
+    # The cached properties holding values of a single sync, which are cleared
+    # before the stream is synced again by the same process.
+    SYNC_CACHED_PROPERTIES: tuple[str, ...] = (
+        "table_fingerprint",
+        "sync_connector",
+        "server_time",
+    )
+
+    # The connector of the read replica the stream is assigned to, if any.
+    replica_connector: MSSQLConnector | None = None
+
+    # Whether get_records reads several queries at once, which does not preserve
+    # the order of their rows.
+    reads_in_parallel = False
+
+    RANGES_PER_WORKER = 4
+
+    # Properties left out of records when null with `sparse_records`, whatever
+    # their schema.
+    SPARSE_PROPERTIES: frozenset[str] = frozenset()
+
+    # The null properties left out of records with `sparse_records` during the
+    # sync, and the bytes of RECORD messages saved by leaving them out.
+    sparse_omitted_properties = 0
+    sparse_bytes_saved = 0
+
+    # The queries get_records would execute, collected instead of executed while
+    # planning a dry run.
+    planned_queries: list[tuple[sa.Executable, dict[str, t.Any] | None]] | None = None
+
+    @property
+    def STATE_MSG_FREQUENCY(self) -> int:  # noqa: N802
+        """Returns the number of records after which a STATE message is written.
+
+        Returns:
+            The configured `state_message_frequency`, or the SDK default.
+        """
+        return (
+            self.config.get("state_message_frequency")
+            or SQLStream.STATE_MSG_FREQUENCY
+        )
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return a generator of record-type dictionary objects.
+
+        If the stream has a replication_key value defined, records will be sorted by the
+        incremental key. If the stream also has an available starting bookmark, the
+        records will be filtered for values greater than or equal to the bookmark value.
+        With `composite_bookmarks`, records are sorted by the incremental key and the
+        primary key, and only records after the bookmarked row are read.
+
+        rowversion replication keys are compared as binary(8) so that an index on the
+        column can be used, only rows after the bookmark are read, and the read is
+        bounded by MIN_ACTIVE_ROWVERSION() so rows of in-flight transactions are not
+        skipped.
+
+        Args:
+            context: If partition context is provided, will read specifically from this
+                data slice.
+
+        Yields:
+            One dict per record.
+
+        Raises:
+            NotImplementedError: If partition is passed in context and the stream does
+                not support partitioning.
+        """
+        if context:
+            msg = f"Stream '{self.name}' does not support partitioning."
+            raise NotImplementedError(msg)
+
+        selected_column_names = [
+            column_name
+            for column_name in self.get_selected_schema()["properties"]
+            if column_name != "_sdc_deleted_at"
+        ]
+        table = self.connector.get_table(
+            full_table_name=self.fully_qualified_name,
+            column_names=selected_column_names,
+        )
+        query = table.select()
+
+        differential_sync_key = self.get_differential_sync_key(table)
+        if differential_sync_key is not None and self.sample_percent is None:
+            yield from self.get_differential_records(table, differential_sync_key)
+            yield from self.get_deleted_records(table)
+            return
+
+        resume_columns = self.get_resume_columns(table)
+        if self.replication_key:
+            query = self.filter_replication_key(table, query, resume_columns, context)
+        if resume_columns:
+            query = query.order_by(None).order_by(*resume_columns)
+        if self.shard_key_ranges is not None:
+            query = query.where(self.get_shard_condition(table))
+
+        if self.ABORT_AT_RECORD_COUNT is not None:
+            # Limit record count to one greater than the abort threshold. This ensures
+            # `MaxRecordsLimitException` exception is properly raised by caller
+            # `Stream._sync_records()` if more records are available than can be
+            # processed.
+            query = query.limit(self.ABORT_AT_RECORD_COUNT + 1)
+
+        yield from self.fetch_table_records(table, query, resume_columns)
+        if self.sample_percent is None:
+            yield from self.get_deleted_records(table)
+
+    def filter_replication_key(
+            self,
+            table: sa.Table,
+            query: sa.Select,
+            resume_columns: list[sa.Column] | None,
+            context: Context | None,
+    ) -> sa.Select:
+        """Orders a query by the replication key and skips rows before the bookmark.
+
+        Args:
+            table: The table the query reads from.
+            query: The query selecting the table columns.
+            resume_columns: The unique columns the query is ordered by, if any.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The query reading the rows at or after the bookmark.
+        """
+        replication_key_col = table.columns[self.replication_key]
+        query = query.order_by(replication_key_col.asc())
+
+        start_val = self.get_starting_replication_key_value(context)
+        if isinstance(replication_key_col.type, mssql.TIMESTAMP):
+            return query.where(
+                *self.get_rowversion_conditions(replication_key_col, start_val)
+            )
+        last_primary_key = self.get_last_primary_key(context)
+        if start_val and last_primary_key is not None:
+            return query.where(
+                replication_key_col >= start_val,
+                self.get_resume_condition(
+                    resume_columns,
+                    {
+                        self.replication_key: start_val,
+                        **dict(zip(self.primary_keys, last_primary_key)),
+                    },
+                ),
+            )
+        if start_val:
+            return query.where(replication_key_col >= start_val)
+        return query
+
+    def get_rowversion_conditions(
+            self,
+            replication_key_col: sa.Column,
+            start_val: int | None,
+    ) -> list[sa.ColumnElement]:
+        """Returns the conditions reading the rows after a rowversion bookmark.
+
+        The bookmark is compared as binary(8) so that an index on the column can
+        be used, and the read is bounded by MIN_ACTIVE_ROWVERSION() so rows of
+        in-flight transactions are not skipped.
+
+        Args:
+            replication_key_col: The rowversion replication key column.
+            start_val: The bookmarked rowversion, if any.
+
+        Returns:
+            The conditions.
+        """
+        conditions = []
+        if start_val is not None:
+            bookmark = int(start_val).to_bytes(8, "big")
+            conditions.append(replication_key_col > bookmark)
+        conditions.append(replication_key_col < sa.func.MIN_ACTIVE_ROWVERSION())
+        return conditions
+
+    def get_shard_condition(self, table: sa.Table) -> sa.ColumnElement:
+        """Returns the condition selecting the primary key ranges of the shard.
+
+        Args:
+            table: The table the stream reads from.
+
+        Returns:
+            The condition.
+        """
+        key_column = table.columns[self.primary_keys[0]]
+        return sa.or_(
+            *(
+                self.get_range_condition(key_column, lower, upper)
+                for lower, upper in self.shard_key_ranges or []
+            )
+        )
+
+    @property
+    def uses_composite_bookmark(self) -> bool:
+        """Returns whether the bookmark holds the primary key of the last record.
+
+        Only with `composite_bookmarks` set, for INCREMENTAL streams of tables with
+        a primary key.
+
+        Returns:
+            True if the last primary key is bookmarked, False otherwise.
+        """
+        return bool(
+            self.config.get("composite_bookmarks")
+            and self.replication_method == "INCREMENTAL"
+            and self.replication_key
+            and self.primary_keys
+        )
+
+    def get_last_primary_key(self, context: Context | None) -> list | None:
+        """Returns the primary key of the last row synced with the bookmarked value.
+
+        Returns:
+            The primary key values, or None without a composite bookmark.
+        """
+        if not self.uses_composite_bookmark:
+            return None
+        return self.get_context_state(context).get("last_primary_key")
+
+    @cached_property
+    def server_time(self) -> tuple[datetime.datetime, datetime.datetime]:
+        """Returns the time of the server at the start of the sync.
+
+        Returns:
+            The local time of the server, and the same time with its offset.
+        """
+        with self.connector._connect() as conn:  # noqa: SLF001
+            return tuple(
+                conn.execute(text("SELECT SYSDATETIME(), SYSDATETIMEOFFSET()")).first()
+            )
+
+    def is_settled(self, value: t.Any) -> bool:  # noqa: ANN401
+        """Returns whether rows may no longer be written with a replication key value.
+
+        Date and time values are settled once they are older than
+        `composite_bookmark_lag_seconds` at the start of the sync, assuming
+        transactions commit within that time of stamping their rows. Other values
+        are always taken as settled.
+
+        Args:
+            value: The replication key value of a record.
+
+        Returns:
+            True if the primary key of the record can be bookmarked with it.
+        """
+        if isinstance(value, str):
+            try:
+                value = datetime.datetime.fromisoformat(value)
+            except ValueError:
+                return True
+        if not isinstance(value, datetime.datetime):
+            if not isinstance(value, datetime.date):
+                return True
+            value = datetime.datetime.combine(
+                value + datetime.timedelta(days=1), datetime.time()
+            )
+        local_time, offset_time = self.server_time
+        lag = datetime.timedelta(
+            seconds=self.config.get("composite_bookmark_lag_seconds", 300)
+        )
+        return value < (offset_time if value.tzinfo else local_time) - lag
+
+    def get_resume_columns(self, table: sa.Table) -> list[sa.Column] | None:
+        """Returns the columns to order a read by so that it can resume after errors.
+
+        Only with `transient_error_retries` set or a composite bookmark, for tables
+        with a primary key. Records are ordered by the replication key, if any, and
+        the primary key.
+
+        Args:
+            table: The table read from.
+
+        Returns:
+            The columns, or None.
+        """
+        if not self.primary_keys or not (
+                self.config.get("transient_error_retries")
+                or self.uses_composite_bookmark
+        ):
+            return None
+        column_names = [
+            *([self.replication_key] if self.replication_key else []),
+            *(key for key in self.primary_keys if key != self.replication_key),
+        ]
+        return [table.columns[name] for name in column_names]
+
+    def get_resume_condition(
+            self,
+            columns: list[sa.Column],
+            record: dict[str, t.Any],
+    ) -> sa.ColumnElement | None:
+        """Returns the condition selecting the rows ordered after a record.
+
+        Values of records rendered as JSON by the server, or saved in the state,
+        are converted back to values of the column types.
+
+        Args:
+            columns: The columns the rows are ordered by, together unique.
+            record: The record.
+
+        Returns:
+            The condition, or None if the record has a NULL value to resume from.
+        """
+        values = []
+        for column in columns:
+            value = record.get(column.name)
+            if value is None:
+                return None
+            if isinstance(column.type, mssql.TIMESTAMP):
+                value = int(value).to_bytes(8, "big")
+            else:
+                value = from_json_compatible(value, column.type)
+            values.append(value)
+        return sa.or_(
+            *(
+                sa.and_(
+                    *(
+                        previous_column == previous_value
+                        for previous_column, previous_value in zip(
+                            columns[:index], values[:index]
+                        )
+                    ),
+                    column > value,
+                )
+                for index, (column, value) in enumerate(zip(columns, values))
+            )
+        )
+
+    @property
+    def is_sorted(self) -> bool:
+        """Expect stream to be sorted.
+
+        Returns:
+            False while rows are read in parallel, else the SQLStream default.
+        """
+        return not self.reads_in_parallel and super().is_sorted
+
+    def fetch_table_records(
+            self,
+            table: sa.Table,
+            query: sa.Select,
+            resume_columns: list[sa.Column] | None = None,
+    ) -> t.Iterator[dict[str, t.Any]]:
+        """Executes a query reading a table, in parallel ranges where possible.
+
+        Args:
+            table: The table the query reads from.
+            query: The query selecting the table columns.
+            resume_columns: The unique columns the query is ordered by, which a
+                read interrupted by a transient error resumes after.
+
+        Yields:
+            One dict per record.
+        """
+        parallel_queries = self.get_parallel_queries(table, query)
+        if not parallel_queries:
+
+            def resume(
+                    record: dict[str, t.Any],
+            ) -> tuple[sa.Select, None] | None:
+                condition = self.get_resume_condition(resume_columns, record)
+                if condition is None:
+                    return None
+                return self.get_output_query(table, query.where(condition)), None
+
+            yield from self.fetch_records(
+                self.get_output_query(table, query),
+                resume=resume if resume_columns else None,
+            )
+            return
+
+        self.reads_in_parallel = True
+        yield from merge_concurrently(
+            [
+                self.fetch_records(self.get_output_query(table, parallel_query))
+                for parallel_query in parallel_queries
+            ],
+            workers=self.config["parallel_workers"],
+            block_size=self.FETCH_PIPELINE_BLOCK_SIZE,
+        )
+
+    def get_parallel_queries(
+            self,
+            table: sa.Table,
+            query: sa.Select,
+    ) -> list[sa.Select] | None:
+        """Splits a query reading a table into queries that can be read in parallel.
+
+        Only done when `parallel_workers` is greater than 1.
+
+        Args:
+            table: The table the query reads from.
+            query: The query selecting the table columns.
+
+        Returns:
+            Queries reading disjoint parts of the query's rows, or None.
+        """
+        if (
+                self.config.get("parallel_workers", 1) <= 1
+                or self.ABORT_AT_RECORD_COUNT is not None
+                or self.sample_percent is not None
+                or self.planned_queries is not None
+        ):
+            return None
+        if self.tap_stream_id in self.connector.columnstore_tables:
+            return self.get_columnstore_queries(table, query)
+        if not self.primary_keys or self.tap_stream_id in self.connector.heap_tables:
+            return self.get_page_slice_queries(query)
+        return None
+
+    def get_columnstore_queries(
+            self,
+            table: sa.Table,
+            query: sa.Select,
+    ) -> list[sa.Select] | None:
+        """Splits a query reading a columnstore table along its segments.
+
+        The table is split on the replication key, the primary key or the first
+        selected column, whichever is an integer column first, into ranges whose
+        boundaries are segment maximums, so that the server eliminates the
+        segments outside each range. Segments entirely below the bookmark are
+        skipped.
+
+        Args:
+            table: The table the query reads from.
+            query: The query selecting the table columns.
+
+        Returns:
+            One query per range, or None without an integer column or segments.
+        """
+        candidate_names = [
+            *([self.replication_key] if self.replication_key else []),
+            *(self.primary_keys or []),
+            *(column.name for column in table.columns),
+        ]
+        split_column = next(
+            (
+                table.columns[name] for name in candidate_names
+                if isinstance(table.columns[name].type, sa.Integer)
+            ),
+            None,
+        )
+        if split_column is None:
+            return None
+
+        segments = self.connector.get_column_segments(
+            str(self.fully_qualified_name), split_column.name
+        )
+        if split_column.name == self.replication_key:
+            start_val = self.get_starting_replication_key_value(context=None)
+            if start_val is not None:
+                segments = [
+                    segment for segment in segments if segment[1] >= int(start_val)
+                ]
+        if not segments:
+            return None
+
+        ranges = get_segment_ranges(
+            segments, self.config["parallel_workers"] * self.RANGES_PER_WORKER
+        )
+        self.logger.info(
+            "Reading %d columnstore segments in %d ranges of %s.",
+            len(segments),
+            len(ranges),
+            split_column.name,
+        )
+        # The rows of different ranges are interleaved, so sorting is pointless.
+        query = query.order_by(None)
+        return [
+            query.where(self.get_range_condition(split_column, lower, upper))
+            for lower, upper in ranges
+        ]
+
+    def get_page_slice_queries(self, query: sa.Select) -> list[sa.Select]:
+        """Splits a query reading a heap or a table without keys into page slices.
+
+        Rows are assigned to one of `parallel_workers` slices by the page id in
+        their physical location (%%physloc%%) modulo the slice count, so every
+        slice reads whole pages. Every slice scans the table, but the rows of a
+        page are only converted and sent by one of them.
+
+        Args:
+            query: The query selecting the table columns.
+
+        Returns:
+            One query per slice.
+        """
+        slice_count = self.config["parallel_workers"]
+        page_id = sa.literal_column(
+            "CAST(CAST(REVERSE(SUBSTRING(%%physloc%%, 1, 4)) AS BINARY(4)) AS INT)"
+        )
+        self.logger.info("Reading %d page slices.", slice_count)
+        # The rows of different slices are interleaved, so sorting is pointless.
+        query = query.order_by(None)
+        return [
+            query.where(page_id % slice_count == slice_index)
+            for slice_index in range(slice_count)
+        ]
+
+    @property
+    def connector(self) -> MSSQLConnector:
+        """Returns the connector the stream reads from in the current sync.
+
+        Returns:
+            The connector of the read replica chosen for the sync, else the
+            connector of the primary.
+        """
+        return self.sync_connector
+
+    @cached_property
+    def sync_connector(self) -> MSSQLConnector:
+        """Chooses the connector the stream reads from in the current sync.
+
+        The stream's read replica is read from unless it lags behind the bookmark.
+        The choice is made again for every sync, so a replica that falls behind
+        between syncs of the same process is not read from.
+
+        Returns:
+            The connector of the read replica or of the primary.
+        """
+        primary = t.cast("MSSQLConnector", self._connector)
+        if self.replica_connector is None:
+            return primary
+        fallback_reason = self.get_replica_fallback_reason()
+        if fallback_reason:
+            self.logger.warning(fallback_reason)
+            return primary
+        self.logger.info(
+            "Reading from read replica %s.", self.replica_connector.config["host"]
+        )
+        return self.replica_connector
+
+    def _sync_records(
+            self,
+            context: types.Context | None = None,
+            *,
+            write_messages: bool = True,
+    ) -> t.Generator[dict, t.Any, t.Any]:
+        """Syncs the records of the stream, unless it has not changed.
+
+        Streams without changes since the last sync only emit their state, and
+        streams are not synced at all once the process was asked to stop.
+        Sampled streams write no STATE messages, and their state is restored once
+        the sync has completed. With `sparse_records`, the null properties left
+        out of records are logged as metrics once the sync has completed.
+
+        Args:
+            context: Stream partition or context dictionary.
+            write_messages: Whether to write Singer messages to stdout.
+
+        Yields:
+            Each record from the source.
+        """
+        if self.stop_requested is not None and self.stop_requested.is_set():
+            self.logger.info("Stop requested. Skipping the sync.")
+            return
+        if self.sample_percent is not None:
+            self.logger.info(
+                "Sampling %g%% of the table. Bookmarks are not advanced.",
+                self.sample_percent,
+            )
+            stream_state = copy.deepcopy(self.stream_state)
+            try:
+                yield from super()._sync_records(
+                    context=context, write_messages=write_messages
+                )
+            finally:
+                self.stream_state.clear()
+                self.stream_state.update(stream_state)
+        elif self.skip_extraction:
+            self.logger.info("No changes since the last sync. Skipping extraction.")
+            if write_messages:
+                self._write_state_message()
+            return
+        else:
+            self.extracting = True
+            try:
+                yield from super()._sync_records(
+                    context=context, write_messages=write_messages
+                )
+            finally:
+                self.extracting = False
+        if self.config.get("sparse_records"):
+            self.log_sparse_metrics()
+
+    def _finalize_state(self, state: dict | None = None) -> None:
+        """Saves the table fingerprint once all records have been synced.
+
+        With `skip_unchanged_streams`, the fingerprint taken before the sync is
+        saved in the stream state, so that the next sync can be skipped if the
+        table has not changed since.
+
+        Args:
+            state: State object to promote progress markers with.
+        """
+        if (
+                self.extracting
+                and state is self.stream_state
+                and self.config.get("skip_unchanged_streams")
+                and self.table_fingerprint is not None
+        ):
+            state["table_fingerprint"] = self.table_fingerprint
+        super()._finalize_state(state)
+
+    def _write_state_message(self) -> None:
+        """Writes a STATE message, unless the stream is sampled."""
+        if self.sample_percent is None:
+            super()._write_state_message()
+
+    def clear_sync_caches(self) -> None:
+        """Clears the values cached for a single sync, so that it can run again."""
+        for name in self.SYNC_CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+        self.reads_in_parallel = False
+        self.skip_extraction = False
+
+    @cached_property
+    def table_fingerprint(self) -> list | None:
+        """Returns the fingerprint of the table at the start of the sync.
+
+        Returns:
+            The fingerprint, or None if the table was not found.
+        """
+        return self.connector.table_fingerprints.get(self.tap_stream_id)
+
+    def has_changes(self) -> bool:
+        """Returns whether the table may have changed since the last sync.
+
+        The table fingerprint is compared with the one saved in the stream state
+        by the last completed sync.
+
+        Returns:
+            False if the fingerprints match, else True.
+        """
+        return (
+            self.table_fingerprint is None
+            or self.stream_state.get("table_fingerprint") != self.table_fingerprint
+        )
+
+    def get_replica_fallback_reason(self) -> str | None:
+        """Returns why the stream cannot be read from a replica, if it cannot.
+
+        Rows are read by key or replication key value, which a lagging replica
+        returns on a later sync, so any replica can be read from.
+
+        Returns:
+            The reason the primary is read from instead, or None.
+        """
+        return None
+
+    def get_output_query(self, table: sa.Table, query: sa.Select) -> sa.Select:
+        """Returns the query reading the rows that are emitted as records.
+
+        Args:
+            table: The table the query reads from.
+            query: The query selecting the table columns.
+
+        Returns:
+            The query, sampling rows if the stream is sampled, else rendering rows as
+            JSON if `server_side_json` is enabled.
+        """
+        if self.sample_percent is not None:
+            return self.get_sample_query(table, query)
+        if self.config.get("server_side_json"):
+            if any("." in column.name for column in table.columns):
+                self.logger.warning(
+                    "FOR JSON PATH nests column names containing '.'. "
+                    "Reading rows without server-side JSON instead."
+                )
+            else:
+                return self.get_json_query(table, query)
+        return query
+
+    @cached_property
+    def sample_percent(self) -> float | None:
+        """Returns the percentage of rows read from the table, if it is sampled.
+
+        Streams are matched against the `sample_percent` keys by their stream id,
+        e.g. `dbo-Orders`, or by glob patterns, e.g. `sales-*`.
+
+        Returns:
+            The percentage, or None if the stream is not sampled.
+        """
+        sample_percent = self.config.get("sample_percent") or {}
+        if self.tap_stream_id in sample_percent:
+            return sample_percent[self.tap_stream_id]
+        for pattern, percent in sample_percent.items():
+            if fnmatch.fnmatchcase(self.tap_stream_id, pattern):
+                return percent
+        return None
+
+    def get_sample_query(self, table: sa.Table, query: sa.Select) -> sa.Select:
+        """Returns the query reading a sample of the rows.
+
+        Tables are sampled by data page with TABLESAMPLE, which reads only the
+        sampled pages. Views cannot be sampled by page, so their rows are sampled
+        one by one.
+
+        Args:
+            table: The table the query reads from.
+            query: The query selecting the table columns.
+
+        Returns:
+            The sampling query.
+        """
+        if self._singer_catalog_entry.is_view:
+            return query.where(
+                sa.func.RAND(sa.func.CHECKSUM(sa.func.NEWID())) * 100
+                < self.sample_percent
+            )
+        sampled_table = sa.tablesample(
+            table,
+            sa.literal_column(f"{float(self.sample_percent)!r} PERCENT"),
+            name=table.name,
+        )
+        return ClauseAdapter(sampled_table).traverse(query)
+
+    def get_differential_sync_key(self, table: sa.Table) -> sa.Column | None:
+        """Returns the primary key column that differential sync splits ranges by.
+
+        Args:
+            table: The table the stream reads from.
+
+        Returns:
+            The primary key column, or None if `differential_sync` is disabled or
+            the stream cannot be synced differentially.
+        """
+        if not self.config.get("differential_sync") or self.replication_key:
+            return None
+        if not self.primary_keys or len(self.primary_keys) != 1:
+            self.logger.warning(
+                "Differential sync requires a single-column primary key. "
+                "Executing a full table sync instead."
+            )
+            return None
+        key_column = table.columns[self.primary_keys[0]]
+        if not isinstance(key_column.type, (sa.Integer, sa.String)):
+            self.logger.warning(
+                "Differential sync requires an integer or string primary key. "
+                "Executing a full table sync instead."
+            )
+            return None
+        return key_column
+
+    def get_range_condition(
+        self,
+        key_column: sa.Column,
+        lower: t.Any,  # noqa: ANN401
+        upper: t.Any,  # noqa: ANN401
+    ) -> sa.ColumnElement:
+        """Returns the condition selecting the keys in a range.
+
+        NULL values of a nullable column belong to the range unbounded below, so
+        that splitting a read on the column does not drop them.
+
+        Args:
+            key_column: The column the ranges are split on.
+            lower: The exclusive lower bound of the range, or None if unbounded.
+            upper: The inclusive upper bound of the range, or None if unbounded.
+
+        Returns:
+            The range condition.
+        """
+        conditions = []
+        if lower is not None:
+            conditions.append(key_column > lower)
+        if upper is not None:
+            conditions.append(key_column <= upper)
+        condition = sa.and_(sa.true(), *conditions)
+        if lower is None and upper is not None and key_column.nullable:
+            return sa.or_(condition, key_column.is_(None))
+        return condition
+
+    def get_row_hash_expression(self, table: sa.Table) -> sa.ColumnElement:
+        """Returns an expression hashing the current row into a bigint.
+
+        Returns:
+            The first 8 bytes of the MD5 hash of the row rendered as JSON.
+        """
+        return sa.cast(
+            sa.cast(
+                sa.func.HASHBYTES(
+                    sa.literal_column("'MD5'"), self.get_json_row_expression(table)
+                ),
+                mssql.BINARY(8),
+            ),
+            sa.BigInteger,
+        )
+
+    def get_differential_ranges(
+        self,
+        table: sa.Table,
+        key_column: sa.Column,
+        lower: t.Any,  # noqa: ANN401
+        upper: t.Any,  # noqa: ANN401
+    ) -> list[dict[str, t.Any]]:
+        """Splits a key range into ranges of `differential_sync_range_rows` rows.
+
+        Args:
+            table: The table the stream reads from.
+            key_column: The primary key column.
+            lower: The exclusive lower bound of the range, or None if unbounded.
+            upper: The inclusive upper bound of the range, or None if unbounded.
+
+        Returns:
+            The ranges covering the key range, with their upper bound, row count and
+            hash.
+        """
+        range_rows = self.config.get(
+            "differential_sync_range_rows", self.DIFFERENTIAL_SYNC_RANGE_ROWS
+        )
+        rows = sa.select(
+            key_column.label("key"),
+            self.get_row_hash_expression(table).label("row_hash"),
+            (
+                (sa.func.row_number().over(order_by=key_column) - 1) // range_rows
+            ).label("range_index"),
+        ).where(self.get_range_condition(key_column, lower, upper)).subquery()
+        query = (
+            sa.select(
+                sa.func.max(rows.c.key),
+                sa.func.count(),
+                sa.func.sum(sa.cast(rows.c.row_hash, sa.Numeric(38, 0))),
+            )
+            .group_by(rows.c.range_index)
+            .order_by(rows.c.range_index)
+        )
+        with self.connector._connect() as conn:  # noqa: SLF001
+            ranges = [
+                {"upper": range_upper, "rows": range_row_count, "hash": str(range_hash)}
+                for range_upper, range_row_count, range_hash in conn.execute(query)
+            ]
+
+        if not ranges:
+            return [{"upper": upper, "rows": 0, "hash": "0"}]
+        # The last range extends to the upper bound so that ranges stay contiguous.
+        ranges[-1]["upper"] = upper
+        return ranges
+
+    def get_changed_ranges(
+        self,
+        table: sa.Table,
+        key_column: sa.Column,
+        ranges: list[dict[str, t.Any]],
+    ) -> list[int]:
+        """Returns the ranges whose row count or hash differ from the table.
+
+        Consecutive ranges are compared in at most DIFFERENTIAL_SYNC_FANOUT groups
+        per query, and groups that differ are narrowed down the same way until
+        single ranges remain.
+
+        Args:
+            table: The table the stream reads from.
+            key_column: The primary key column.
+            ranges: The ranges recorded by the previous sync.
+
+        Returns:
+            The indexes of the changed ranges, in key order.
+        """
+        row_hash = self.get_row_hash_expression(table)
+        changed = []
+        spans = [(0, len(ranges))]
+        while spans:
+            start, end = spans.pop()
+            step = -(-(end - start) // self.DIFFERENTIAL_SYNC_FANOUT)
+            groups = [(i, min(i + step, end)) for i in range(start, end, step)]
+            range_index = sa.case(
+                *(
+                    (key_column <= ranges[group_end - 1]["upper"], index)
+                    for index, (_, group_end) in enumerate(groups[:-1])
+                ),
+                else_=len(groups) - 1,
+            )
+            lower = ranges[start - 1]["upper"] if start else None
+            rows = sa.select(
+                range_index.label("range_index"), row_hash.label("row_hash")
+            ).where(
+                self.get_range_condition(key_column, lower, ranges[end - 1]["upper"])
+            ).subquery()
+            query = sa.select(
+                rows.c.range_index,
+                sa.func.count(),
+                sa.func.sum(sa.cast(rows.c.row_hash, sa.Numeric(38, 0))),
+            ).group_by(rows.c.range_index)
+            with self.connector._connect() as conn:  # noqa: SLF001
+                current = {
+                    index: (row_count, int(group_hash))
+                    for index, row_count, group_hash in conn.execute(query)
+                }
+
+            for index, (group_start, group_end) in enumerate(groups):
+                group = ranges[group_start:group_end]
+                recorded = (
+                    sum(r["rows"] for r in group),
+                    sum(int(r["hash"]) for r in group),
+                )
+                if current.get(index, (0, 0)) == recorded:
+                    continue
+                if group_end - group_start == 1:
+                    changed.append(group_start)
+                else:
+                    spans.append((group_start, group_end))
+
+        return sorted(changed)
+
+    def get_differential_records(
+        self, table: sa.Table, key_column: sa.Column
+    ) -> t.Iterable[dict[str, t.Any]]:
+        """Yields the rows of the key ranges that changed since the previous sync.
+
+        The table is split into primary key ranges whose row counts and hashes are
+        kept in the stream state. Only the ranges whose row count or hash no longer
+        match are read again, so deleted rows are not emitted.
+
+        Args:
+            table: The table the stream reads from.
+            key_column: The primary key column.
+
+        Yields:
+            One dict per record.
+        """
+        if self.planned_queries is not None:
+            self.logger.warning(
+                "Differential sync only reads changed primary key ranges. "
+                "The plan shows reading all rows."
+            )
+            self.planned_queries.append((table.select(), None))
+            return
+
+        ranges = list(self.stream_state.get("differential_ranges") or [])
+        if not ranges:
+            self.logger.info("No differential sync ranges recorded. Reading all rows.")
+            ranges = self.get_differential_ranges(table, key_column, None, None)
+            yield from self.fetch_records(self.get_output_query(table, table.select()))
+        else:
+            changed = self.get_changed_ranges(table, key_column, ranges)
+            self.logger.info(
+                "Reading %d of %d differential sync ranges.", len(changed), len(ranges)
+            )
+            bounds = [
+                (ranges[index - 1]["upper"] if index else None, ranges[index]["upper"])
+                for index in changed
+            ]
+            # Ranges are recorded before they are read, so that rows changed while
+            # reading are detected by the next sync. Replacing ranges from the end
+            # keeps the indexes of earlier ones valid.
+            for index, (lower, upper) in reversed(list(zip(changed, bounds))):
+                ranges[index : index + 1] = self.get_differential_ranges(
+                    table, key_column, lower, upper
+                )
+            for lower, upper in bounds:
+                query = (
+                    table.select()
+                    .where(self.get_range_condition(key_column, lower, upper))
+                    .order_by(key_column)
+                )
+                yield from self.fetch_records(self.get_output_query(table, query))
+
+        self.stream_state["differential_ranges"] = ranges
+
+    def get_deleted_records(self, table: sa.Table) -> t.Iterable[dict[str, t.Any]]:
+        """Yields tombstones for rows deleted since the previous sync.
+
+        The primary keys of the table are read in ascending order and diffed
+        against the snapshot recorded by the previous sync, which is then replaced.
+        Keys are always read from the primary, even when records are read from a
+        read replica, so that snapshots of differently lagging servers are never
+        compared. String keys are ordered as nvarchar with a binary collation, by
+        UTF-16 code unit, which diff_key_snapshot compares them by too.
+
+        Args:
+            table: The table the stream reads from.
+
+        Yields:
+            One record per deleted row, holding its primary key and _sdc_deleted_at.
+        """
+        if not self.config.get("deleted_row_detection"):
+            return
+        if not self.primary_keys:
+            self.logger.warning(
+                "Deleted-row detection requires a primary key. "
+                "Deleted rows are not detected."
+            )
+            return
+
+        order_by = []
+        for primary_key in self.primary_keys:
+            key_column = table.columns[primary_key]
+            if isinstance(key_column.type, sa.Integer):
+                order_by.append(key_column)
+            elif isinstance(key_column.type, sa.String):
+                if not isinstance(key_column.type, sa.Unicode):
+                    key_column = sa.cast(key_column, mssql.NVARCHAR())
+                order_by.append(key_column.collate("Latin1_General_BIN2"))
+            else:
+                self.logger.warning(
+                    "Deleted-row detection requires integer or string primary keys. "
+                    "Deleted rows are not detected."
+                )
+                return
+
+        query = sa.select(
+            *(table.columns[primary_key] for primary_key in self.primary_keys)
+        ).order_by(*order_by)
+        if self.planned_queries is not None:
+            self.planned_queries.append((query, None))
+            return
+        deleted_at = datetime.datetime.now(tz=datetime.timezone.utc).strftime(
+            r"%Y-%m-%dT%H:%M:%SZ"
+        )
+        deleted_count = 0
+        primary = t.cast("MSSQLConnector", self._connector)
+        with primary._connect() as conn:  # noqa: SLF001
+            snapshot_path = Path(
+                self.config.get("deleted_row_snapshot_dir", ".deleted_row_snapshots"),
+                f"{conn.execute(text('SELECT DB_NAME()')).scalar()}-{self.name}"
+                ".jsonl.gz",
+            )
+            for key in diff_key_snapshot(
+                snapshot_path, self.primary_keys, conn.execute(query)
+            ):
+                deleted_count += 1
+                yield {
+                    **dict(zip(self.primary_keys, key)),
+                    "_sdc_deleted_at": deleted_at,
+                }
+        self.logger.info("Detected %d deleted rows.", deleted_count)
+
+    def _increment_stream_state(
+            self,
+            latest_record: types.Record,
+            *,
+            context: types.Context | None = None,
+    ) -> None:
+        """Skips tombstones of deleted rows, which have no replication key value.
+
+        With a composite bookmark, the primary key of the record is saved along with
+        its replication key value while records are read in order, unless rows may
+        still be written with that value.
+
+        Args:
+            latest_record: The record to update the state with.
+            context: Stream partition or context dictionary.
+        """
+        if self.replication_key and self.replication_key not in latest_record:
+            return
+        super()._increment_stream_state(latest_record, context=context)
+        if self.uses_composite_bookmark:
+            state_dict = self.get_context_state(context)
+            if self.is_sorted and self.is_settled(latest_record[self.replication_key]):
+                state_dict["last_primary_key"] = [
+                    to_json_compatible(latest_record[primary_key])
+                    for primary_key in self.primary_keys
+                ]
+            else:
+                state_dict.pop("last_primary_key", None)
+
+    @cached_property
+    def sparse_properties(self) -> frozenset[str]:
+        """Returns the properties left out of records when null with `sparse_records`.
+
+        These are the properties whose schema allows null, except primary keys.
+
+        Returns:
+            The property names.
+        """
+        nullable = set(self.SPARSE_PROPERTIES)
+        for name, property_schema in self.schema["properties"].items():
+            types = property_schema.get("type", [])
+            if "null" in ([types] if isinstance(types, str) else types):
+                nullable.add(name)
+        return frozenset(nullable.difference(self.primary_keys or []))
+
+    def _generate_record_messages(
+            self,
+            record: types.Record,
+    ) -> t.Generator[singer.RecordMessage, None, None]:
+        """Leaves null properties out of RECORD messages with `sparse_records`.
+
+        Args:
+            record: A single stream record.
+
+        Yields:
+            Record message objects.
+        """
+        for message in super()._generate_record_messages(record):
+            if self.config.get("sparse_records"):
+                message.record = self.get_sparse_record(message.record)
+            yield message
+
+    def get_sparse_record(self, record: types.Record) -> types.Record:
+        """Returns a record without its null sparse properties.
+
+        The bytes saved are those of `"name":null,` in compact JSON.
+
+        Returns:
+            The sparse record.
+        """
+        sparse_record = {}
+        for name, value in record.items():
+            if value is None and name in self.sparse_properties:
+                self.sparse_omitted_properties += 1
+                self.sparse_bytes_saved += (
+                    len(json.dumps(name, ensure_ascii=False).encode()) + len(":null,")
+                )
+            else:
+                sparse_record[name] = value
+        return sparse_record
+
+    def log_sparse_metrics(self) -> None:
+        """Logs the null properties left out of records during the sync as metrics."""
+        for metric, value in (
+                ("sparse_omitted_properties", self.sparse_omitted_properties),
+                ("sparse_bytes_saved", self.sparse_bytes_saved),
+        ):
+            self.metrics_logger.info(
+                "METRIC: %s",
+                json.dumps(
+                    {
+                        "type": "counter",
+                        "metric": metric,
+                        "value": value,
+                        "tags": {"stream": self.name},
+                    }
+                ),
+            )
+        self.sparse_omitted_properties = 0
+        self.sparse_bytes_saved = 0
+
+    def get_plan(self) -> dict[str, t.Any]:
+        """Plans a sync of the stream without extracting any records.
+
+        The queries get_records would execute are collected instead, together
+        with the warnings it logs, such as the reasons for falling back to a full
+        table sync, and their estimated execution plans.
+
+        Returns:
+            The replication method, stream class, table estimates, warnings, and
+            the statement, parameters and plan summary of every query.
+        """
+        handler = WarningCollector()
+        self.logger.addHandler(handler)
+        self.planned_queries = []
+        try:
+            for _ in self.get_records(context=None):
+                pass
+            planned_queries = self.planned_queries
+        finally:
+            self.planned_queries = None
+            self.logger.removeHandler(handler)
+
+        warnings = handler.messages
+        queries = []
+        for query, parameters in planned_queries:
+            statement, bind_parameters = self.connector.compile_query(query, parameters)
+            showplan_xml = self.connector.get_showplan(query, parameters)
+            summary = parse_showplan(showplan_xml)
+            warnings.extend(get_plan_warnings(summary))
+            queries.append(
+                {
+                    "statement": statement,
+                    "parameters": bind_parameters,
+                    **summary,
+                    "showplan_xml": showplan_xml,
+                }
+            )
+
+        return {
+            "stream": self.tap_stream_id,
+            "stream_class": type(self).__name__,
+            "replication_method": self.replication_method,
+            "estimated_table_rows": self.connector.table_row_counts.get(
+                self.tap_stream_id
+            ),
+            "estimated_table_bytes": self.connector.table_sizes.get(
+                self.tap_stream_id
+            ),
+            "warnings": warnings,
+            "queries": queries,
+        }
+
+    def get_json_row_expression(self, table: sa.Table) -> sa.ColumnElement:
+        """Returns an expression rendering the current row as a JSON object.
+
+        Values are formatted the way records are conformed on the Python side:
+        datetimes in ISO format, without an offset as UTC, GUIDs in lowercase,
+        binary values as hex and rowversion values as integers.
+
+        Args:
+            table: The table the row is read from.
+
+        Returns:
+            A correlated FOR JSON PATH subquery over the table columns.
+        """
+        dialect = self.connector._dialect  # noqa: SLF001
+        json_columns = []
+        for column in table.columns:
+            expression: sa.ColumnElement = column
+            if isinstance(column.type, mssql.TIMESTAMP):
+                expression = sa.cast(column, sa.BigInteger)
+            elif isinstance(column.type, sa.types._Binary):  # noqa: SLF001
+                expression = sa.func.lower(
+                    sa.func.CONVERT(sa.literal_column("varchar(max)"), column, 2)
+                )
+            elif isinstance(column.type, mssql.UNIQUEIDENTIFIER):
+                expression = sa.func.LOWER(
+                    sa.func.CONVERT(sa.literal_column("char(36)"), column)
+                )
+            elif isinstance(column.type, sa.DateTime):
+                expression = self.get_json_datetime_expression(column)
+            compiled_expression = expression.compile(
+                dialect=dialect, compile_kwargs={"literal_binds": True}
+            )
+            json_columns.append(
+                f"{compiled_expression} "
+                f"AS {dialect.identifier_preparer.quote(column.name)}"
+            )
+
+        return sa.literal_column(
+            f"(SELECT {', '.join(json_columns)} "
+            "FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES)"
+        )
+
+    def get_json_datetime_expression(self, column: sa.Column) -> sa.ColumnElement:
+        """Returns an expression formatting a date and time like datetime.isoformat.
+
+        Microseconds are only rendered when they are not zero, and values without
+        an offset are rendered as UTC.
+
+        Args:
+            column: The date and time column.
+
+        Returns:
+            The expression, e.g. rendering `2022-10-20T12:34:56.123456+00:00`.
+        """
+        microseconds = sa.func.DATEPART(sa.literal_column("MICROSECOND"), column)
+        fraction = sa.case(
+            (microseconds == 0, sa.literal_column("''")),
+            else_=sa.literal_column("'.'").op("+")(
+                sa.func.RIGHT(
+                    sa.literal_column("'00000'").op("+")(
+                        sa.func.CONVERT(sa.literal_column("varchar(6)"), microseconds)
+                    ),
+                    6,
+                )
+            ),
+        )
+        offset = (
+            sa.func.DATENAME(sa.literal_column("TZOFFSET"), column)
+            if isinstance(column.type, mssql.DATETIMEOFFSET)
+            else sa.literal_column("'+00:00'")
+        )
+        return (
+            sa.func.CONVERT(sa.literal_column("varchar(19)"), column, 126)
+            .op("+")(fraction)
+            .op("+")(offset)
+        )
+
+    def get_json_query(self, table: sa.Table, query: sa.Select) -> sa.Select:
+        """Returns the query with each row rendered as a JSON object by the server.
+
+        Values are formatted the way records are conformed on the Python side:
+        datetimes without an offset as UTC, binary values as hex and rowversion
+        values as integers.
+
+        Args:
+            table: The table the query reads from.
+            query: The query selecting the table columns.
+
+        Returns:
+            The query, selecting a single _sdc_json column.
+        """
+        json_column = self.get_json_row_expression(table).label("_sdc_json")
+        return query.with_only_columns(json_column, maintain_column_froms=True)
+
+    def fetch_records(
+            self,
+            query: sa.Executable,
+            parameters: dict[str, t.Any] | None = None,
+            *,
+            resume: t.Callable[
+                [dict[str, t.Any]],
+                tuple[sa.Executable, dict[str, t.Any] | None] | None,
+            ] | None = None,
+            attempt: int = 0,
+    ) -> t.Iterator[dict[str, t.Any]]:
+        """Executes a query and post-processes its rows into records.
+
+        A query failing with a transient error is retried on a new connection up
+        to `transient_error_retries` times, after a jittered exponential backoff.
+        Once records have been emitted, the read only resumes if `resume` returns
+        a query for the rows after the last emitted record.
+
+        Args:
+            query: The query to execute.
+            parameters: The bind parameters of the query.
+            resume: Returns the query and parameters reading the rows ordered after
+                a record, or None if it cannot.
+            attempt: The number of attempts that failed before this one.
+
+        Yields:
+            One dict per record.
+
+        Raises:
+            DBAPIError: If the query fails with a fatal error, runs out of retries,
+                or cannot resume.
+        """
+        if self.planned_queries is not None:
+            self.planned_queries.append((query, parameters))
+            return
+        retries = self.config.get("transient_error_retries", 0)
+        last_record = None
+        try:
+            for record in self.execute_records(query, parameters):
+                last_record = record
+                yield record
+        except sa.exc.DBAPIError as e:
+            if attempt == retries or not self.connector.is_transient_error(e):
+                raise
+            if last_record is not None:
+                resumed_query = resume(last_record) if resume else None
+                if resumed_query is None:
+                    raise
+                query, parameters = resumed_query
+            self.wait_before_retry(attempt, retries, e)
+            yield from self.fetch_records(
+                query, parameters, resume=resume, attempt=attempt + 1
+            )
+
+    def wait_before_retry(
+            self,
+            attempt: int,
+            retries: int,
+            error: sa.exc.DBAPIError,
+    ) -> None:
+        """Sleeps for a jittered exponential backoff before a query is retried.
+
+        Args:
+            attempt: The number of attempts that failed before the last one.
+            retries: The number of retries allowed.
+            error: The transient error the last attempt failed with.
+        """
+        backoff = min(
+            self.TRANSIENT_ERROR_BACKOFF_SECONDS * 2 ** attempt,
+            self.TRANSIENT_ERROR_MAX_BACKOFF_SECONDS,
+        )
+        delay = random.uniform(backoff / 2, backoff)  # noqa: S311
+        self.logger.warning(
+            "Transient error, retrying in %.1f seconds (%d/%d): %s",
+            delay,
+            attempt + 1,
+            retries,
+            error,
+        )
+        time.sleep(delay)
+
+    def execute_records(
+            self,
+            query: sa.Executable,
+            parameters: dict[str, t.Any] | None = None,
+    ) -> t.Iterator[dict[str, t.Any]]:
+        """Executes a query once and post-processes its rows into records.
+
+        Rows rendered as JSON by the server are parsed before post_process. When
+        `fetch_pipeline_memory_mb` is set, rows are fetched on a background thread
+        while the records already fetched are processed.
+
+        Args:
+            query: The query to execute.
+            parameters: The bind parameters of the query.
+
+        Yields:
+            One dict per record.
+        """
+        with self.connector._connect() as conn:  # noqa: SLF001
+            rows: t.Iterable[sa.RowMapping] = conn.execute(
+                query, parameters or {}
+            ).mappings()
+            memory_budget_mb = self.config.get("fetch_pipeline_memory_mb")
+            if memory_budget_mb:
+                rows = RowPrefetcher(
+                    rows,
+                    block_size=self.FETCH_PIPELINE_BLOCK_SIZE,
+                    memory_budget=memory_budget_mb * 1024 * 1024,
+                )
+            for row in rows:
+                record = dict(row)
+                if "_sdc_json" in record:
+                    record = json.loads(
+                        record["_sdc_json"], parse_float=decimal.Decimal
+                    )
+                transformed_record = self.post_process(record)
+                if transformed_record is None:
+                    # Record filtered out during post_process()
+                    continue
+                yield transformed_record
+
+
+class MSSQLChangeTrackingStream(MSSQLStream):
+    """Stream class for MSSQL streams."""
+
+    replication_key = "_sdc_change_version"
+
+    SYNC_CACHED_PROPERTIES = (
+        *MSSQLStream.SYNC_CACHED_PROPERTIES,
+        "change_tracking_current_version",
+        "minimum_valid_version",
+        "change_tracking_fallback_reason",
+        "commit_times",
+    )
+
+    SPARSE_PROPERTIES = frozenset({"_sdc_deleted_at"})
+
+    # Whether the commit times of deletes could not be read and are not looked up.
+    commit_times_unavailable = False
+
+    @cached_property
+    def schema(self) -> dict:
+        """Appends _sdc_deleted_at and _sdc_change_version to the schema.
+
+        Returns:
+            The dict.
+        """
+        schema_dict = t.cast(dict, self._singer_catalog_entry.schema.to_dict())
+
+        schema_dict["properties"].update({"_sdc_deleted_at": {"type": ["string"]}})
+
+        schema_dict["properties"].update({"_sdc_change_version": {"type": ["integer"]}})
+        return schema_dict
+
+    @cached_property
+    def change_tracking_current_version(self) -> int | None:
+        """Returns the current change tracking version of the connected database.
+
+        Returns:
+            The current change tracking version.
+        """
+        return self.connector.change_tracking_current_version
+
+    def has_changes(self) -> bool:
+        """Returns whether change tracking recorded changes since the bookmark.
+
+        Streams that will run a full table sync or resume a partially synced
+        version always have changes.
+
+        Returns:
+            True if CHANGETABLE returns changes after the bookmark.
+        """
+        bookmark = self.stream_state.get("replication_key_value")
+        if (
+                not bookmark
+                or not self.primary_keys
+                or not self.table_is_change_tracking_enabled
+                or self.stream_state.get("last_primary_key") is not None
+                or bookmark < self.minimum_valid_version
+        ):
+            return True
+        if self.connector.change_tracking_current_version <= bookmark:
+            return False
+        return self.connector.has_change_tracking_changes(
+            str(self.fully_qualified_name), bookmark
+        )
+
+    def get_replica_fallback_reason(self) -> str | None:
+        """Returns why the stream cannot be read from a replica, if it cannot.
+
+        The bookmark is the replica's current version after the sync, so a replica
+        that has not caught up with the bookmark would move it backwards.
+
+        Returns:
+            The reason the primary is read from instead, or None.
+        """
+        bookmark = self.stream_state.get("replication_key_value")
+        if not bookmark:
+            return None
+        replica = t.cast("MSSQLConnector", self.replica_connector)
+        replica_version = replica.change_tracking_current_version
+        if replica_version < bookmark:
+            return (
+                f"Read replica {replica.config['host']} is at change tracking "
+                f"version {replica_version}, behind the "
+                f"bookmark {bookmark}. Reading from the primary instead."
+            )
+        return None
+
+    @cached_property
+    def minimum_valid_version(self) -> int | None:
+        """Returns the minimum valid version of a table as reported by SQL Server.
+
+        Returns:
+            The minimum valid version of the table.
+        """
+        return self.connector.get_minimum_valid_version(str(self.fully_qualified_name))
+
+    @cached_property
+    def table_is_change_tracking_enabled(self) -> bool:
+        """Checks if the current table is enabled for change tracking.
+
+        Returns:
+            True if the current table is enabled for change tracking, False otherwise.
+        """
+        table_name = self.connector.parse_full_table_name(self.fully_qualified_name)[2]
+        return table_name in self.connector.change_tracking_tables
+
+    @cached_property
+    def change_tracking_fallback_reason(self) -> str | None:
+        """Returns why this sync cannot read from CHANGETABLE, if it cannot.
+
+        Returns:
+            The reason a full table sync is executed instead, or None.
+        """
+        bookmark = self.get_starting_replication_key_value(context=None)
+
+        if not self.primary_keys:
+            return (
+                "Table has no primary keys. Cannot use CHANGE_TRACKING. "
                 "Executing a full table sync instead."
             )
-        elif not change_tracking_enabled:
-            using_change_tracking = False
-            self.logger.error(
+        if not self.table_is_change_tracking_enabled:
+            return (
                 "Table is not enabled for CHANGE_TRACKING. "
                 "Executing a full table sync instead."
             )
-        elif not bookmark:
-            using_change_tracking = False
-            self.logger.warning(
-                "There is no previous bookmark. Executing a full table sync."
-            )
-        elif bookmark < minimum_valid_version:
-            using_change_tracking = False
-            self.logger.warning(
+        if not bookmark:
+            return "There is no previous bookmark. Executing a full table sync."
+        if self.get_resume_primary_key(context=None) is not None:
+            # A partially synced version is read again from the version before it.
+            bookmark -= 1
+        if bookmark < self.minimum_valid_version:
+            return (
                 "CHANGE_TRACKING_MIN_VALID_VERSION has reported a value greater "
                 "than current-log-version. Executing a full table sync."
             )
+        return None
+
+    @property
+    def is_sorted(self) -> bool:
+        """Expect stream to be sorted.
+
+        Changes read from CHANGETABLE are sorted by version and primary key, which
+        makes an interrupted sync resumable. Full table syncs are not.
+
+        Returns:
+            True if the sync reads from CHANGETABLE.
+        """
+        return self.change_tracking_fallback_reason is None
+
+    def get_resume_primary_key(self, context: Context | None) -> list | None:
+        """Returns the primary key of the last row synced within the bookmarked version.
+
+        Returns:
+            The primary key values, or None if the bookmarked version was completed.
+        """
+        return self.get_context_state(context).get("last_primary_key")
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return a generator of record-type dictionary objects.
+
+        If the stream has a replication_key value defined, records will be sorted by the
+        incremental key. If the stream also has an available starting bookmark, the
+        records will be filtered for values greater than or equal to the bookmark value.
+
+        Args:
+            context: If partition context is provided, will read specifically from this
+                data slice.
+
+        Yields:
+            One dict per record.
+
+        Raises:
+            NotImplementedError: If partition is passed in context and the stream does
+                not support partitioning.
+        """
+        bookmark: int = self.get_starting_replication_key_value(context=context)
+        resume_primary_key = self.get_resume_primary_key(context=context)
+
+        fallback_reason = self.change_tracking_fallback_reason
+        using_change_tracking = fallback_reason is None and self.sample_percent is None
+
+        if not self.primary_keys:
+            self.logger.warning(fallback_reason)
+        elif not self.table_is_change_tracking_enabled:
+            self.logger.error(fallback_reason)
+        elif fallback_reason:
+            self.logger.warning(fallback_reason)
 
         # Remove _sdc_deleted_at and _sdc_change_version from the list of selected
         # columns. They are not columns in the actual table.
@@ -247,51 +2646,181 @@ class MSSQLChangeTrackingStream(SQLStream):
                 # are available than can be processed.
                 query = query.limit(self.ABORT_AT_RECORD_COUNT + 1)
 
-        else:
+            yield from self.fetch_table_records(table, query)
+            return
 
-            table_selected_columns = ", ".join(
-                f"tb.{self.connector.quote(column)}" for column in selected_column_names if
-                column not in self.primary_keys
+        def resume(record: dict[str, t.Any]) -> tuple[sa.TextClause, dict[str, t.Any]]:
+            return (
+                self.get_changes_query(selected_column_names, resuming=True),
+                self.get_changes_parameters(
+                    record["_sdc_change_version"],
+                    [record[primary_key] for primary_key in self.primary_keys],
+                ),
             )
 
-            primary_key_selected_columns = ", ".join(
-                f"c.{self.connector.quote(primary_key)}" for primary_key in self.primary_keys
-            )
+        yield from self.fetch_records(
+            self.get_changes_query(
+                selected_column_names, resuming=resume_primary_key is not None
+            ),
+            self.get_changes_parameters(int(bookmark), resume_primary_key),
+            resume=resume,
+        )
+
+    def get_changes_parameters(
+            self,
+            version: int,
+            resume_primary_key: list | None,
+    ) -> dict[str, t.Any]:
+        """Returns the bind parameters of the CHANGETABLE query.
+
+        The versions are bind parameters, so that the statement text and its
+        cached plan are the same for every bookmark.
+
+        Args:
+            version: The version after which changes are read, or the version of
+                the last synced row when resuming.
+            resume_primary_key: The primary key of the last synced row, if resuming.
+
+        Returns:
+            The parameters.
+        """
+        if resume_primary_key is None:
+            return {"previous_version": version}
+        # The version was interrupted part way. Read it again and skip its rows up
+        # to and including the last synced primary key.
+        return {
+            "previous_version": version - 1,
+            "resume_version": version,
+            **{
+                f"resume_primary_key_{index}": value
+                for index, value in enumerate(
+                    self.get_primary_key_values(resume_primary_key)
+                )
+            },
+        }
+
+    def get_primary_key_values(self, values: list) -> list:
+        """Converts primary key values saved in the state to values of the columns.
+
+        Args:
+            values: The JSON compatible primary key values.
+
+        Returns:
+            The values to bind against the primary key columns.
+        """
+        columns = self.connector.get_table_columns(
+            str(self.fully_qualified_name), self.primary_keys
+        )
+        return [
+            from_json_compatible(value, columns[primary_key].type)
+            for primary_key, value in zip(self.primary_keys, values)
+        ]
+
+    def get_changes_query(
+            self,
+            selected_column_names: list[str],
+            *,
+            resuming: bool,
+    ) -> sa.TextClause:
+        """Returns the query reading changes from CHANGETABLE.
+
+        Changes are ordered by version and primary key, and joined with the base
+        table for their current column values.
+
+        Args:
+            selected_column_names: The selected table columns.
+            resuming: Whether to skip the rows of the resumed version up to and
+                including the last synced primary key.
+
+        Returns:
+            The query, taking the parameters of get_changes_parameters.
+        """
+        table_selected_columns = ", ".join(
+            f"tb.{self.connector.quote(column)}" for column in selected_column_names if
+            column not in self.primary_keys
+        )
+
+        quoted_primary_keys = [
+            self.connector.quote(primary_key) for primary_key in self.primary_keys
+        ]
+
+        primary_key_selected_columns = ", ".join(
+            f"c.{primary_key}" for primary_key in quoted_primary_keys
+        )
+
+        primary_key_conditions = " AND ".join(
+            f"tb.{primary_key} = c.{primary_key}" for primary_key in quoted_primary_keys
+        )
+
+        # Updates that touch none of the selected columns are skipped before the
+        # base table is joined. SYS_CHANGE_COLUMNS is NULL for inserts, deletes
+        # and tables without TRACK_COLUMNS_UPDATED, which are always kept.
+        column_ids = self.connector.get_column_ids(
+            str(self.fully_qualified_name)
+        )
+        selected_column_conditions = " OR ".join(
+            f"CHANGE_TRACKING_IS_COLUMN_IN_MASK("
+            f"{column_ids[column]}, c.SYS_CHANGE_COLUMNS) = 1"
+            for column in selected_column_names
+            if column not in self.primary_keys
+        ) or "1 = 0"
+
+        primary_key_order = ", ".join(
+            f"c.{primary_key}" for primary_key in quoted_primary_keys
+        )
 
-            primary_key_conditions = " AND ".join(
-                f"tb.{self.connector.quote(primary_key)} = c.{self.connector.quote(primary_key)}"
-                for primary_key in
-                self.primary_keys
+        resume_condition = ""
+        if resuming:
+            primary_key_after_conditions = " OR ".join(
+                "(" + " AND ".join(
+                    [
+                        *(
+                            f"c.{self.connector.quote(previous_key)} = "
+                            f":resume_primary_key_{previous_index}"
+                            for previous_index, previous_key in enumerate(
+                                self.primary_keys[:index]
+                            )
+                        ),
+                        f"c.{self.connector.quote(primary_key)} > "
+                        f":resume_primary_key_{index}",
+                    ]
+                ) + ")"
+                for index, primary_key in enumerate(self.primary_keys)
             )
-
-            previous_version = int(bookmark)
-            query = text(
-                f"""
-                SELECT
-                    c.SYS_CHANGE_VERSION AS _sdc_change_version,
-                    c.SYS_CHANGE_OPERATION AS _sdc_change_operation,
-                    {primary_key_selected_columns},
-                    {table_selected_columns}
-                FROM
-                    CHANGETABLE (
-                        CHANGES {self.connector.quote(str(self.fully_qualified_name))},
-                        {previous_version}
-                    ) AS c
-                LEFT JOIN
-                    {self.connector.quote(str(self.fully_qualified_name))} AS tb
-                ON
-                    {primary_key_conditions}
-                ORDER BY
-                    c.SYS_CHANGE_VERSION ASC
-                """  # noqa: S608, RUF100
+            resume_condition = (
+                "AND (c.SYS_CHANGE_VERSION > :resume_version "
+                "OR (c.SYS_CHANGE_VERSION = :resume_version "
+                f"AND ({primary_key_after_conditions})))"
             )
 
-        with self.connector._connect() as conn:  # noqa: SLF001
-            for record in conn.execute(query).mappings():
-                transformed_record = self.post_process(dict(record))
-                if transformed_record is None:
-                    continue
-                yield transformed_record
+        return text(
+            f"""
+            SELECT
+                c.SYS_CHANGE_VERSION AS _sdc_change_version,
+                c.SYS_CHANGE_OPERATION AS _sdc_change_operation,
+                {primary_key_selected_columns},
+                {table_selected_columns}
+            FROM
+                CHANGETABLE (
+                    CHANGES {self.connector.quote(str(self.fully_qualified_name))},
+                    :previous_version
+                ) AS c
+            LEFT JOIN
+                {self.connector.quote(str(self.fully_qualified_name))} AS tb
+            ON
+                {primary_key_conditions}
+            WHERE
+                (
+                    c.SYS_CHANGE_OPERATION <> 'U'
+                    OR c.SYS_CHANGE_COLUMNS IS NULL
+                    OR {selected_column_conditions}
+                )
+                {resume_condition}
+            ORDER BY
+                c.SYS_CHANGE_VERSION ASC,
+                {primary_key_order}
+            """  # noqa: S608, RUF100
+        )
 
     def post_process(
             self,
@@ -313,16 +2842,71 @@ class MSSQLChangeTrackingStream(SQLStream):
 
         if row.pop("_sdc_change_operation", "") == "D":
             row.update(
-                {
-                    "_sdc_deleted_at": datetime.datetime.now(tz=datetime.timezone.utc)
-                    .strftime(r"%Y-%m-%dT%H:%M:%SZ")
-                }
+                {"_sdc_deleted_at": self.get_commit_time(row["_sdc_change_version"])}
             )
         else:
             row.update({"_sdc_deleted_at": None})
 
         return row
 
+    @cached_property
+    def commit_times(self) -> dict[int, str]:
+        """Returns the formatted commit times of the deletes read in this sync.
+
+        Returns:
+            The commit times, keyed by version.
+        """
+        return {}
+
+    def load_commit_times(self, previous_version: int) -> None:
+        """Caches the commit times of the deletes recorded after a version.
+
+        The commit times are read from sys.dm_tran_commit_table in a single
+        query. If it cannot be read, deletes are stamped with the sync time.
+
+        Args:
+            previous_version: The version after which deletes are looked up.
+        """
+        if self.commit_times_unavailable:
+            return
+        try:
+            commit_times = self.connector.get_delete_commit_times(
+                str(self.fully_qualified_name), previous_version
+            )
+        except sa.exc.DBAPIError as e:
+            self.logger.warning(
+                "Cannot read commit times from sys.dm_tran_commit_table: %s "
+                "Stamping deletes with the sync time instead.",
+                e,
+            )
+            self.commit_times_unavailable = True
+            return
+        for version, commit_time in commit_times.items():
+            self.commit_times[version] = commit_time.strftime(r"%Y-%m-%dT%H:%M:%SZ")
+
+    def get_commit_time(self, version: int) -> str:
+        """Returns the formatted commit time of a delete.
+
+        Changes are read in ascending version order, so the first delete of a
+        version that is not cached loads the commit times of all later deletes.
+        Versions whose commit time is unknown are stamped with the current time.
+
+        Args:
+            version: The change tracking version of the delete.
+
+        Returns:
+            The commit time, e.g. 2024-05-01T09:30:00Z.
+        """
+        commit_time = self.commit_times.get(version)
+        if commit_time is None:
+            self.load_commit_times(version - 1)
+            commit_time = self.commit_times.setdefault(
+                version,
+                datetime.datetime.now(tz=datetime.timezone.utc)
+                .strftime(r"%Y-%m-%dT%H:%M:%SZ"),
+            )
+        return commit_time
+
     def _increment_stream_state(
             self,
             latest_record: types.Record,
@@ -337,12 +2921,15 @@ class MSSQLChangeTrackingStream(SQLStream):
         Note: The default implementation does not advance any bookmarks unless
         `self.replication_method == 'INCREMENTAL'.
 
+        The primary key of the record is saved as `last_primary_key` along with
+        its version, converted to JSON compatible values.
+
         Args:
-            latest_record: TODO
+            latest_record: The record to update the state with.
             context: Stream partition or context dictionary.
 
         Raises:
-            ValueError: TODO
+            ValueError: If the stream has no replication key.
         """
         state_dict = self.get_context_state(context)
 
@@ -365,6 +2952,13 @@ class MSSQLChangeTrackingStream(SQLStream):
                 is_sorted=treat_as_sorted,
                 check_sorted=self.check_sorted,
             )
+            if treat_as_sorted:
+                # Tiebreaker within the bookmarked version, so that a sync interrupted
+                # part way through a version resumes after the last synced row.
+                state_dict["last_primary_key"] = [
+                    to_json_compatible(latest_record[primary_key])
+                    for primary_key in self.primary_keys
+                ]
 
     def _sync_records(
             self,
@@ -375,8 +2969,14 @@ class MSSQLChangeTrackingStream(SQLStream):
 
         yield from super()._sync_records(context=context, write_messages=write_messages)
 
-        if write_messages and self.selected:
+        if (
+                write_messages
+                and self.selected
+                and self.sample_percent is None
+                and not self.skip_extraction
+        ):
             state_dict = self.get_context_state(context)
+            state_dict.pop("last_primary_key", None)
             increment_state(
                 state_dict,
                 replication_key=self.replication_key,
@@ -387,3 +2987,448 @@ class MSSQLChangeTrackingStream(SQLStream):
                 is_sorted=self.is_sorted,
                 check_sorted=self.check_sorted,
             )
+
+
+SYSTEM_TIME_EPOCH = datetime.datetime(1970, 1, 1)  # noqa: DTZ001
+
+
+def system_time_to_version(system_time: datetime.datetime) -> int:
+    """Converts a SYSTEM_TIME value to an integer change version.
+
+    Returns:
+        Microseconds elapsed since the Unix epoch.
+    """
+    return (system_time - SYSTEM_TIME_EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def version_to_system_time(version: int) -> datetime.datetime:
+    """Converts an integer change version back to a SYSTEM_TIME value.
+
+    Returns:
+        The UTC datetime the version represents.
+    """
+    return SYSTEM_TIME_EPOCH + datetime.timedelta(microseconds=version)
+
+
+class MSSQLTemporalStream(MSSQLChangeTrackingStream):
+    """Stream class for MSSQL system-versioned temporal tables.
+
+    Changes are read with FOR SYSTEM_TIME, which covers both the current and the
+    history table. The bookmark is the server time up to which changes were read,
+    stored as microseconds since the Unix epoch in _sdc_change_version.
+    """
+
+    SYNC_CACHED_PROPERTIES = (
+        *MSSQLChangeTrackingStream.SYNC_CACHED_PROPERTIES,
+        "system_time_current",
+    )
+
+    @property
+    def is_sorted(self) -> bool:
+        """Expect stream to be sorted.
+
+        Returns:
+            False, syncs are not resumable.
+        """
+        return False
+
+    @cached_property
+    def system_time_current(self) -> datetime.datetime:
+        """Returns the server time this sync reads changes up to.
+
+        Returns:
+            The current server time in UTC.
+        """
+        return self.connector.system_time_current
+
+    @cached_property
+    def change_tracking_current_version(self) -> int | None:
+        """Returns the server time this sync reads changes up to as a version.
+
+        Returns:
+            The current system time version.
+        """
+        return system_time_to_version(self.system_time_current)
+
+    def has_changes(self) -> bool:
+        """Returns whether the table may have changed since the last sync.
+
+        The bookmark is a server time, so the table fingerprint is compared.
+
+        Returns:
+            False if the fingerprints match, else True.
+        """
+        return MSSQLStream.has_changes(self)
+
+    def get_replica_fallback_reason(self) -> str | None:
+        """Returns why the stream cannot be read from a replica.
+
+        The bookmark is a server time, and rows committed on the primary before it
+        may not have reached the replica yet, so the primary is always read from.
+
+        Returns:
+            The reason the primary is read from instead.
+        """
+        return (
+            "Temporal tables are read from the primary, since replica lag cannot be "
+            "checked against a system time bookmark."
+        )
+
+    @cached_property
+    def period_columns(self) -> tuple[str, str]:
+        """Returns the SYSTEM_TIME period columns of the table.
+
+        Returns:
+            The names of the period start and period end columns.
+        """
+        return self.connector.get_temporal_period_columns(
+            str(self.fully_qualified_name)
+        )
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return a generator of record-type dictionary objects.
+
+        Without a bookmark the current table is read in full. Otherwise, the latest
+        version of every row that started or ended between the bookmark and the
+        current server time is read. Rows whose latest version ended in that window
+        were deleted and are emitted with _sdc_deleted_at set to the end time.
+
+        Args:
+            context: If partition context is provided, will read specifically from this
+                data slice.
+
+        Yields:
+            One dict per record.
+        """
+        bookmark: int = self.get_starting_replication_key_value(context=context)
+        current_system_time = self.system_time_current
+
+        selected_column_names = list(self.get_selected_schema()["properties"].keys())
+        selected_column_names.remove("_sdc_deleted_at")
+        selected_column_names.remove("_sdc_change_version")
+
+        if self.sample_percent is not None:
+            bookmark = None
+        elif not self.primary_keys:
+            bookmark = None
+            self.logger.warning(
+                "Table has no primary keys. Cannot use SYSTEM_TIME. "
+                "Executing a full table sync instead."
+            )
+        elif not bookmark:
+            self.logger.warning(
+                "There is no previous bookmark. Executing a full table sync."
+            )
+
+        if not bookmark:
+            table = self.connector.get_table(
+                full_table_name=self.fully_qualified_name,
+                column_names=selected_column_names,
+            )
+            query = table.select()
+            parameters = {}
+
+            if self.ABORT_AT_RECORD_COUNT is not None:
+                query = query.limit(self.ABORT_AT_RECORD_COUNT + 1)
+
+        else:
+            period_start, period_end = (
+                self.connector.quote(column) for column in self.period_columns
+            )
+            version_columns = ", ".join(
+                f"v.{self.connector.quote(column)}" for column in selected_column_names
+            )
+            table_columns = ", ".join(
+                f"tb.{self.connector.quote(column)}" for column in selected_column_names
+            )
+            primary_key_columns = ", ".join(
+                f"tb.{self.connector.quote(primary_key)}"
+                for primary_key in self.primary_keys
+            )
+
+            query = text(
+                f"""
+                SELECT
+                    DATEDIFF_BIG(
+                        MICROSECOND,
+                        '1970-01-01',
+                        CASE WHEN v._sdc_period_end <= :current_system_time
+                        THEN v._sdc_period_end ELSE v._sdc_period_start END
+                    ) AS _sdc_change_version,
+                    CASE WHEN v._sdc_period_end <= :current_system_time
+                    THEN v._sdc_period_end END AS _sdc_deleted_at,
+                    {version_columns}
+                FROM (
+                    SELECT
+                        {table_columns},
+                        tb.{period_start} AS _sdc_period_start,
+                        tb.{period_end} AS _sdc_period_end,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY {primary_key_columns}
+                            ORDER BY tb.{period_start} DESC
+                        ) AS _sdc_row_number
+                    FROM
+                        {self.connector.quote(str(self.fully_qualified_name))}
+                        FOR SYSTEM_TIME BETWEEN :previous_system_time
+                        AND :current_system_time AS tb
+                ) AS v
+                WHERE
+                    v._sdc_row_number = 1
+                    AND (
+                        v._sdc_period_start > :previous_system_time
+                        OR v._sdc_period_end <= :current_system_time
+                    )
+                ORDER BY
+                    _sdc_change_version ASC
+                """  # noqa: S608, RUF100
+            )
+            parameters = {
+                "previous_system_time": version_to_system_time(int(bookmark)),
+                "current_system_time": current_system_time,
+            }
+
+        if bookmark:
+            yield from self.fetch_records(query, parameters)
+        else:
+            yield from self.fetch_table_records(table, query)
+
+    def post_process(
+            self,
+            row: types.Record,
+            context: types.Context | None = None,  # noqa: ARG002
+    ) -> dict | None:
+        """Processes the record after extraction.
+
+        Formats the period end time of deleted rows into _sdc_deleted_at.
+
+        Returns:
+            The modified record.
+        """
+        deleted_at = row.get("_sdc_deleted_at")
+        if deleted_at is not None:
+            row["_sdc_deleted_at"] = deleted_at.strftime(r"%Y-%m-%dT%H:%M:%S.%fZ")
+        else:
+            row["_sdc_deleted_at"] = None
+
+        if row.get("_sdc_change_version") is None:
+            row["_sdc_change_version"] = self.change_tracking_current_version
+
+        return row
+
+
+class MSSQLChangeDataCaptureStream(MSSQLChangeTrackingStream):
+    """Stream class for MSSQL tables tracked by Change Data Capture.
+
+    Row images are read from the capture instance's change table between the
+    bookmarked LSN and the current maximum LSN, so the base table is not joined.
+    The bookmark is the LSN as an integer, stored in _sdc_change_version.
+    """
+
+    SYNC_CACHED_PROPERTIES = (
+        *MSSQLChangeTrackingStream.SYNC_CACHED_PROPERTIES,
+        "cdc_maximum_lsn",
+    )
+
+    @property
+    def is_sorted(self) -> bool:
+        """Expect stream to be sorted.
+
+        Returns:
+            False, syncs are not resumable.
+        """
+        return False
+
+    @cached_property
+    def capture_instance(self) -> tuple[str, bool]:
+        """Returns the capture instance of the table.
+
+        Returns:
+            The capture instance name and whether it supports net changes.
+        """
+        table_name = self.connector.parse_full_table_name(self.fully_qualified_name)[2]
+        return self.connector.cdc_capture_instances[table_name]
+
+    @cached_property
+    def cdc_maximum_lsn(self) -> bytes:
+        """Returns the LSN this sync reads changes up to.
+
+        Returns:
+            The maximum LSN at the start of the sync.
+        """
+        return self.connector.cdc_maximum_lsn
+
+    @cached_property
+    def change_tracking_current_version(self) -> int | None:
+        """Returns the LSN this sync reads changes up to as a version.
+
+        Returns:
+            The maximum LSN as an integer.
+        """
+        return lsn_to_version(self.cdc_maximum_lsn)
+
+    def has_changes(self) -> bool:
+        """Returns whether the capture instance recorded changes since the bookmark.
+
+        Returns:
+            True if the change table holds changes after the bookmarked LSN, or
+            if the stream will run a full table sync.
+        """
+        bookmark = self.stream_state.get("replication_key_value")
+        if not bookmark or bookmark < self.minimum_valid_version - 1:
+            return True
+        return self.connector.has_cdc_changes(
+            self.capture_instance[0], lsn_to_bytes(int(bookmark) + 1)
+        )
+
+    def load_commit_times(self, previous_version: int) -> None:
+        """Change Data Capture deletes are stamped with the sync time.
+
+        Args:
+            previous_version: Unused.
+        """
+
+    def get_replica_fallback_reason(self) -> str | None:
+        """Returns why the stream cannot be read from a replica, if it cannot.
+
+        Returns:
+            The reason the primary is read from instead if the replica's maximum
+            LSN is behind the bookmark, else None.
+        """
+        bookmark = self.stream_state.get("replication_key_value")
+        if not bookmark:
+            return None
+        replica = t.cast("MSSQLConnector", self.replica_connector)
+        replica_version = lsn_to_version(replica.cdc_maximum_lsn)
+        if replica_version < bookmark:
+            return (
+                f"Read replica {replica.config['host']} is at LSN version "
+                f"{replica_version}, behind the bookmark {bookmark}. Reading from "
+                "the primary instead."
+            )
+        return None
+
+    @cached_property
+    def minimum_valid_version(self) -> int | None:
+        """Returns the lowest LSN available for the capture instance as a version.
+
+        Returns:
+            The minimum LSN as an integer.
+        """
+        return lsn_to_version(
+            self.connector.get_cdc_minimum_lsn(self.capture_instance[0])
+        )
+
+    def get_lsn_ranges(
+            self,
+            from_lsn: bytes,
+            to_lsn: bytes,
+    ) -> list[tuple[bytes, bytes]]:
+        """Returns the LSN ranges to read changes in.
+
+        The range is split by commit time when `cdc_lsn_range_minutes` is set.
+
+        Returns:
+            Consecutive (from_lsn, to_lsn) pairs.
+        """
+        range_minutes = self.config.get("cdc_lsn_range_minutes")
+        if not range_minutes:
+            return [(from_lsn, to_lsn)] if from_lsn <= to_lsn else []
+        return self.connector.get_cdc_lsn_ranges(
+            from_lsn, to_lsn, datetime.timedelta(minutes=range_minutes)
+        )
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return a generator of record-type dictionary objects.
+
+        Without a valid bookmark the table is read in full. Otherwise, changes are
+        read from cdc.fn_cdc_get_net_changes_<capture_instance> (or all_changes when
+        the capture instance does not support net changes) in LSN ranges.
+
+        Args:
+            context: If partition context is provided, will read specifically from this
+                data slice.
+
+        Yields:
+            One dict per record.
+        """
+        bookmark: int = self.get_starting_replication_key_value(context=context)
+        maximum_lsn = self.cdc_maximum_lsn
+
+        selected_column_names = list(self.get_selected_schema()["properties"].keys())
+        selected_column_names.remove("_sdc_deleted_at")
+        selected_column_names.remove("_sdc_change_version")
+
+        if self.sample_percent is not None:
+            bookmark = None
+        elif not bookmark:
+            self.logger.warning(
+                "There is no previous bookmark. Executing a full table sync."
+            )
+        elif bookmark < self.minimum_valid_version - 1:
+            bookmark = None
+            self.logger.warning(
+                "sys.fn_cdc_get_min_lsn has reported a value greater "
+                "than current-log-version. Executing a full table sync."
+            )
+
+        if not bookmark:
+            table = self.connector.get_table(
+                full_table_name=self.fully_qualified_name,
+                column_names=selected_column_names,
+            )
+            query = table.select()
+
+            if self.ABORT_AT_RECORD_COUNT is not None:
+                query = query.limit(self.ABORT_AT_RECORD_COUNT + 1)
+
+            yield from self.fetch_table_records(table, query)
+            return
+
+        capture_instance, supports_net_changes = self.capture_instance
+        change_function = (
+            f"cdc.fn_cdc_get_net_changes_{capture_instance}"
+            if supports_net_changes
+            else f"cdc.fn_cdc_get_all_changes_{capture_instance}"
+        )
+        change_columns = ", ".join(
+            f"ct.{self.connector.quote(column)}" for column in selected_column_names
+        )
+
+        query = text(
+            f"""
+            SELECT
+                ct.__$start_lsn AS _sdc_change_version,
+                CASE WHEN ct.__$operation = 1 THEN 'D' END AS _sdc_change_operation,
+                {change_columns}
+            FROM
+                {self.connector.quote(change_function)}(
+                    :from_lsn, :to_lsn, N'all'
+                ) AS ct
+            ORDER BY
+                ct.__$start_lsn ASC
+            """  # noqa: S608, RUF100
+        )
+
+        lsn_ranges = self.get_lsn_ranges(
+            lsn_to_bytes(int(bookmark) + 1), maximum_lsn
+        )
+        for from_lsn, to_lsn in lsn_ranges:
+            yield from self.fetch_records(
+                query, {"from_lsn": from_lsn, "to_lsn": to_lsn}
+            )
+
+    def post_process(
+            self,
+            row: types.Record,
+            context: types.Context | None = None,
+    ) -> dict | None:
+        """Processes the record after extraction.
+
+        Converts the binary LSN of a change into _sdc_change_version.
+
+        Returns:
+            The modified record.
+        """
+        if isinstance(row.get("_sdc_change_version"), bytes):
+            row["_sdc_change_version"] = lsn_to_version(row["_sdc_change_version"])
+        return super().post_process(row, context)
@@ -0,0 +1,235 @@
+"""Background fetching of query results.
+
+This includes RowPrefetcher, which overlaps fetching rows from the server with
+processing them, and merge_concurrently, which reads several queries at once.
+"""
+
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+if t.TYPE_CHECKING:
+    from sqlalchemy.engine import MappingResult, RowMapping
+
+SIZE_SAMPLE_ROWS = 10
+
+T = t.TypeVar("T")
+
+_DONE = object()
+
+
+def estimate_block_size(block: list[RowMapping]) -> int:
+    """Estimates the memory used by a block of rows from a sample of its rows.
+
+    Returns:
+        The estimated size of the block in bytes.
+    """
+    sample = block[:SIZE_SAMPLE_ROWS]
+    sample_size = sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+        for row in sample
+    )
+    return sample_size * len(block) // len(sample)
+
+
+class RowPrefetcher:
+    """Fetches blocks of rows on a background thread into a bounded queue.
+
+    The queue holds at most `memory_budget` bytes of rows, as estimated by
+    `estimate_block_size`, so that fetching cannot run arbitrarily far ahead of the
+    consumer. A single block larger than the budget is still queued on its own.
+    The result must not be used by any other thread while it is being iterated.
+    """
+
+    def __init__(
+            self,
+            result: MappingResult,
+            *,
+            block_size: int,
+            memory_budget: int,
+    ) -> None:
+        """Initializes the prefetcher.
+
+        Args:
+            result: The result to fetch rows from.
+            block_size: The number of rows fetched at a time.
+            memory_budget: The maximum estimated size of queued rows in bytes.
+        """
+        self._result = result
+        self._block_size = block_size
+        self._memory_budget = memory_budget
+        self._blocks: deque[tuple[list[RowMapping], int]] = deque()
+        self._queued_bytes = 0
+        self._condition = threading.Condition()
+        self._finished = False
+        self._stopped = False
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._produce, name="tap-mssql-fetch", daemon=True
+        )
+
+    def _produce(self) -> None:
+        try:
+            while True:
+                block = self._result.fetchmany(self._block_size)
+                if not block:
+                    break
+                block_size = estimate_block_size(block)
+                with self._condition:
+                    while (
+                            self._queued_bytes
+                            and self._queued_bytes + block_size > self._memory_budget
+                            and not self._stopped
+                    ):
+                        self._condition.wait()
+                    if self._stopped:
+                        break
+                    self._blocks.append((block, block_size))
+                    self._queued_bytes += block_size
+                    self._condition.notify_all()
+        except BaseException as ex:  # noqa: BLE001
+            with self._condition:
+                self._error = ex
+        finally:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+    def __iter__(self) -> t.Iterator[RowMapping]:
+        """Iterates over the rows as they are fetched.
+
+        Yields:
+            One row at a time, in result order.
+
+        Raises:
+            BaseException: Any error raised while fetching, once the rows fetched
+                before it have been yielded.
+        """
+        self._thread.start()
+        try:
+            while True:
+                with self._condition:
+                    while not self._blocks and not self._finished:
+                        self._condition.wait()
+                    if self._blocks:
+                        block, block_size = self._blocks.popleft()
+                        self._queued_bytes -= block_size
+                        self._condition.notify_all()
+                    elif self._error is not None:
+                        raise self._error
+                    else:
+                        return
+                yield from block
+        finally:
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
+            self._thread.join()
+
+
+def merge_concurrently(
+        iterables: t.Sequence[t.Iterable[T]],
+        *,
+        workers: int,
+        block_size: int = 1000,
+) -> t.Iterator[T]:
+    """Iterates over several iterables at once, each on a worker thread.
+
+    Items are passed to the caller in blocks through a queue holding at most two
+    blocks per worker, in no particular order across iterables. Iterables are
+    started in order as workers become free. If an iterable raises, the others
+    are stopped and the error is re-raised.
+
+    Args:
+        iterables: The iterables to merge, e.g. generators reading one query each.
+        workers: The maximum number of iterables read at once.
+        block_size: The number of items passed to the caller at a time.
+
+    Yields:
+        The items of all iterables.
+
+    Raises:
+        BaseException: The first error raised by an iterable.
+    """
+    blocks: queue.Queue = queue.Queue(maxsize=2 * workers)
+    stopped = threading.Event()
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="tap-mssql-read"
+    )
+    try:
+        for iterable in iterables:
+            executor.submit(_put_blocks, iterable, blocks, stopped, block_size)
+        yield from _drain_blocks(blocks, len(iterables))
+    finally:
+        stopped.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _put_until_stopped(
+        blocks: queue.Queue,
+        stopped: threading.Event,
+        item: t.Any,  # noqa: ANN401
+) -> bool:
+    """Puts an item on the queue, waiting for room until the merge is stopped.
+
+    Returns:
+        Whether the item was put on the queue.
+    """
+    while not stopped.is_set():
+        try:
+            blocks.put(item, timeout=0.1)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _put_blocks(
+        iterable: t.Iterable[T],
+        blocks: queue.Queue,
+        stopped: threading.Event,
+        block_size: int,
+) -> None:
+    """Reads an iterable on a worker thread, putting its items on the queue.
+
+    The items are followed by `_DONE`, or by the error the iterable raised.
+    """
+    iterator = iter(iterable)
+    try:
+        block: list[T] = []
+        for item in iterator:
+            block.append(item)
+            if len(block) >= block_size:
+                if not _put_until_stopped(blocks, stopped, block):
+                    return
+                block = []
+        if block:
+            _put_until_stopped(blocks, stopped, block)
+        _put_until_stopped(blocks, stopped, _DONE)
+    except BaseException as ex:  # noqa: BLE001
+        _put_until_stopped(blocks, stopped, ex)
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def _drain_blocks(blocks: queue.Queue, remaining: int) -> t.Iterator[T]:
+    """Yields the items put on the queue until every iterable is done.
+
+    Raises:
+        BaseException: The first error raised by an iterable.
+    """
+    while remaining:
+        item = blocks.get()
+        if item is _DONE:
+            remaining -= 1
+        elif isinstance(item, BaseException):
+            raise item
+        else:
+            yield from item
@@ -0,0 +1,126 @@
+"""Estimated execution plans for dry runs.
+
+This includes parse_showplan, which summarizes the XML plans returned while
+SHOWPLAN_XML is on.
+"""
+
+from __future__ import annotations
+
+import logging
+import typing as t
+from xml.etree import ElementTree as ET
+
+SHOWPLAN_NAMESPACE = {"p": "http://schemas.microsoft.com/sqlserver/2004/07/showplan"}
+
+SCAN_OPERATORS = ("Table Scan", "Clustered Index Scan", "Index Scan")
+
+
+class WarningCollector(logging.Handler):
+    """Collects the messages of warnings logged while a sync is planned."""
+
+    def __init__(self) -> None:
+        """Initializes the handler."""
+        super().__init__(level=logging.WARNING)
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Collects the message of a log record."""
+        self.messages.append(record.getMessage())
+
+
+def get_object_name(element: ET.Element | None) -> str | None:
+    """Returns the schema-qualified name of a showplan Object element.
+
+    Returns:
+        The name, e.g. [dbo].[Persons], or None.
+    """
+    if element is None:
+        return None
+    return ".".join(
+        element.attrib[part] for part in ("Schema", "Table") if part in element.attrib
+    )
+
+
+def parse_showplan(showplan_xml: str) -> dict[str, t.Any]:
+    """Summarizes an estimated execution plan.
+
+    Args:
+        showplan_xml: The plan returned for a statement while SHOWPLAN_XML is on.
+
+    Returns:
+        The estimated rows and cost of the statement, the scans and sorts it does
+        and the indexes the optimizer reported as missing.
+    """
+    root = ET.fromstring(showplan_xml)  # noqa: S314
+    statement = root.find(".//p:StmtSimple", SHOWPLAN_NAMESPACE)
+    estimated_rows = estimated_cost = None
+    if statement is not None:
+        estimated_rows = float(statement.get("StatementEstRows", 0))
+        estimated_cost = float(statement.get("StatementSubTreeCost", 0))
+
+    scans = []
+    sorts = []
+    for operator in root.iterfind(".//p:RelOp", SHOWPLAN_NAMESPACE):
+        physical_op = operator.get("PhysicalOp")
+        operator_rows = float(operator.get("EstimateRows", 0))
+        if physical_op in SCAN_OPERATORS:
+            scans.append(
+                {
+                    "operator": physical_op,
+                    "object": get_object_name(
+                        operator.find("./*/p:Object", SHOWPLAN_NAMESPACE)
+                    ),
+                    "estimated_rows": operator_rows,
+                }
+            )
+        elif physical_op == "Sort":
+            sorts.append({"estimated_rows": operator_rows})
+
+    missing_indexes = []
+    for group in root.iterfind(".//p:MissingIndexGroup", SHOWPLAN_NAMESPACE):
+        for index in group.iterfind("p:MissingIndex", SHOWPLAN_NAMESPACE):
+            columns: dict[str, list[str]] = {}
+            for column_group in index.iterfind("p:ColumnGroup", SHOWPLAN_NAMESPACE):
+                columns[column_group.get("Usage", "").lower()] = [
+                    column.get("Name", "")
+                    for column in column_group.iterfind("p:Column", SHOWPLAN_NAMESPACE)
+                ]
+            missing_indexes.append(
+                {
+                    "object": get_object_name(index),
+                    "impact": float(group.get("Impact", 0)),
+                    **columns,
+                }
+            )
+
+    return {
+        "estimated_rows": estimated_rows,
+        "estimated_cost": estimated_cost,
+        "scans": scans,
+        "sorts": sorts,
+        "missing_indexes": missing_indexes,
+    }
+
+
+def get_plan_warnings(summary: dict[str, t.Any]) -> list[str]:
+    """Returns warnings about the expensive parts of a summarized plan.
+
+    Returns:
+        One warning per scan, sort and missing index.
+    """
+    warnings = [
+        f"{scan['operator']} of {scan['object']} "
+        f"(~{scan['estimated_rows']:.0f} rows)."
+        for scan in summary["scans"]
+    ]
+    warnings.extend(
+        f"Sort of ~{sort['estimated_rows']:.0f} rows." for sort in summary["sorts"]
+    )
+    warnings.extend(
+        f"Missing index on {index['object']} (impact {index['impact']:.0f}%): "
+        f"equality {index.get('equality', [])}, "
+        f"inequality {index.get('inequality', [])}, "
+        f"include {index.get('include', [])}."
+        for index in summary["missing_indexes"]
+    )
+    return warnings
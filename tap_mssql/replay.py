@@ -0,0 +1,423 @@
+"""Recording and replaying of the SQL statements executed by the tap.
+
+This includes QueryRecorder, which records the statements executed on DBAPI
+connections together with their result sets, and QueryReplayer, which serves
+recorded results through a fake DBAPI module without a database or driver.
+"""
+
+from __future__ import annotations
+
+import base64
+import collections
+import datetime
+import decimal
+import gzip
+import json
+import threading
+import time
+import typing as t
+import uuid
+from pathlib import Path
+
+from tap_mssql.tracing import TracingConnection, TracingCursor
+
+VALUE_TYPES: dict[str, tuple[type, t.Callable, t.Callable]] = {
+    "bytes": (bytes, lambda v: base64.b64encode(v).decode(), base64.b64decode),
+    "datetime": (
+        datetime.datetime,
+        datetime.datetime.isoformat,
+        datetime.datetime.fromisoformat,
+    ),
+    "date": (datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    "time": (datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    "decimal": (decimal.Decimal, str, decimal.Decimal),
+    "uuid": (uuid.UUID, str, uuid.UUID),
+}
+
+
+def encode_value(value: t.Any) -> t.Any:  # noqa: ANN401
+    """Encodes a column or parameter value for JSON, keeping its type.
+
+    Returns:
+        The value if JSON can represent it, else a single-key dict naming its type.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytearray):
+        value = bytes(value)
+    for type_name, (value_type, encode, _) in VALUE_TYPES.items():
+        if isinstance(value, value_type):
+            return {type_name: encode(value)}
+    return str(value)
+
+
+def decode_value(value: t.Any) -> t.Any:  # noqa: ANN401
+    """Decodes a value encoded by encode_value.
+
+    Returns:
+        The original value.
+    """
+    if isinstance(value, dict):
+        [(type_name, encoded)] = value.items()
+        return VALUE_TYPES[type_name][2](encoded)
+    return value
+
+
+def get_statement_key(statement: str, parameters: list | None) -> str:
+    """Returns the key a statement execution is recorded and looked up by.
+
+    Returns:
+        The statement and its encoded parameters as JSON.
+    """
+    return json.dumps([statement, [encode_value(p) for p in parameters or []]])
+
+
+class RecordingCursor(TracingCursor):
+    """A DBAPI cursor that records the statements it executes and their rows."""
+
+    def _start(self, statement: str, parameters: t.Any) -> None:  # noqa: ANN401
+        super()._start(statement, parameters)
+        self._rows: list = []
+
+    def _add_rows(self, rows: list) -> None:
+        if self._entry is not None:
+            self._rows.extend(tuple(row) for row in rows)
+        super()._add_rows(rows)
+
+    def _finish(self) -> None:
+        if self._entry is not None:
+            description = self._cursor.description
+            self._entry["columns"] = (
+                None if description is None else [column[0] for column in description]
+            )
+            self._entry["rowcount"] = self._cursor.rowcount
+            self._entry["rows"] = self._rows
+        super()._finish()
+
+
+class RecordingConnection(TracingConnection):
+    """A DBAPI connection whose cursors record the statements they execute."""
+
+    cursor_class = RecordingCursor
+
+
+class QueryRecorder:
+    """Records every statement executed on its connections with its result set.
+
+    Recordings are gzip-compressed JSONL files holding one execution per line:
+    the statement, its parameters, column names, rows, and the time to first row
+    and wall time, which QueryReplayer replays.
+    """
+
+    statistics = False
+
+    def __init__(self, path: str | Path) -> None:
+        """Initializes the recorder.
+
+        Args:
+            path: The recording, which executions are appended to.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def wrap(
+            self,
+            connection: t.Any,  # noqa: ANN401
+            dbapi_error: type[Exception],
+    ) -> RecordingConnection:
+        """Wraps a DBAPI connection so that its statements are recorded.
+
+        Args:
+            connection: The DBAPI connection to wrap.
+            dbapi_error: The base error class of the DBAPI module.
+
+        Returns:
+            The wrapped connection.
+        """
+        return RecordingConnection(connection, self, dbapi_error)
+
+    def write(self, entry: dict[str, t.Any]) -> None:
+        """Appends an execution to the recording."""
+        entry["parameters"] = [encode_value(p) for p in entry["parameters"] or []]
+        entry["rows"] = [[encode_value(v) for v in row] for row in entry["rows"]]
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock, gzip.open(self.path, "at", encoding="utf-8") as recording:
+            recording.write(line + "\n")
+
+
+class ReplayCursor:
+    """A fake DBAPI cursor serving recorded result sets."""
+
+    arraysize = 1
+
+    def __init__(self, replayer: QueryReplayer) -> None:
+        """Initializes the cursor.
+
+        Args:
+            replayer: The replayer recorded executions are looked up in.
+        """
+        self._replayer = replayer
+        self._rows: list[tuple] = []
+        self._position = 0
+        self._row_delay = 0.0
+        self.description: list[tuple] | None = None
+        self.rowcount = -1
+        self.messages: list = []
+
+    def __iter__(self) -> t.Iterator[tuple]:
+        """Iterates over the remaining rows.
+
+        Yields:
+            One row at a time.
+        """
+        while (row := self.fetchone()) is not None:
+            yield row
+
+    def execute(self, statement: str, *parameters: t.Any) -> ReplayCursor:
+        """Looks up the recorded execution of a statement.
+
+        Returns:
+            The cursor.
+        """
+        if len(parameters) == 1 and isinstance(parameters[0], (list, tuple)):
+            parameters = tuple(parameters[0])
+        entry = self._replayer.get_entry(statement, list(parameters))
+        self._rows = [
+            tuple(decode_value(v) for v in row) for row in entry["rows"]
+        ]
+        self._position = 0
+        columns = entry["columns"]
+        self.description = (
+            None
+            if columns is None
+            else [(name, None, None, None, None, None, True) for name in columns]
+        )
+        self.rowcount = entry["rowcount"]
+
+        speed = self._replayer.speed
+        first_row_ms = entry["time_to_first_row_ms"] or entry["wall_time_ms"]
+        self._row_delay = (
+            speed * (entry["wall_time_ms"] - first_row_ms) / 1000 / len(self._rows)
+            if self._rows
+            else 0.0
+        )
+        time.sleep(speed * first_row_ms / 1000)
+        return self
+
+    def executemany(self, statement: str, _parameters: t.Any) -> None:  # noqa: ANN401
+        """Looks up the recorded execution of a statement executed for many rows.
+
+        Such executions are recorded once, without their parameters.
+        """
+        self._replayer.get_entry(statement, None)
+
+    def _fetch(self, size: int) -> list[tuple]:
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        if rows and self._row_delay:
+            time.sleep(self._row_delay * len(rows))
+        return rows
+
+    def fetchone(self) -> tuple | None:
+        """Fetches the next row.
+
+        Returns:
+            The row, or None once all rows have been read.
+        """
+        rows = self._fetch(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: int | None = None) -> list[tuple]:
+        """Fetches the next rows.
+
+        Returns:
+            The rows, or an empty list once all rows have been read.
+        """
+        return self._fetch(size or self.arraysize)
+
+    def fetchall(self) -> list[tuple]:
+        """Fetches all remaining rows.
+
+        Returns:
+            The rows.
+        """
+        return self._fetch(len(self._rows))
+
+    def nextset(self) -> bool:
+        """Recordings hold a single result set per execution.
+
+        Returns:
+            False.
+        """
+        return False
+
+    def close(self) -> None:
+        """Closes the cursor."""
+
+
+class ReplayConnection:
+    """A fake DBAPI connection serving recorded result sets."""
+
+    autocommit = False
+
+    def __init__(self, replayer: QueryReplayer) -> None:
+        """Initializes the connection.
+
+        Args:
+            replayer: The replayer recorded executions are looked up in.
+        """
+        self._replayer = replayer
+
+    def cursor(self) -> ReplayCursor:
+        """Opens a cursor.
+
+        Returns:
+            The cursor.
+        """
+        return ReplayCursor(self._replayer)
+
+    def add_output_converter(self, *args: t.Any) -> None:
+        """Recorded values are already converted."""
+
+    def getinfo(self, *args: t.Any) -> None:
+        """No driver information is recorded."""
+
+    def commit(self) -> None:
+        """Does nothing."""
+
+    def rollback(self) -> None:
+        """Does nothing."""
+
+    def close(self) -> None:
+        """Does nothing."""
+
+
+class QueryReplayer:
+    """Serves the executions recorded by QueryRecorder without a database.
+
+    Executions are looked up by statement and parameters, and repeated
+    executions are served in recorded order, the last one being served again
+    once all have been. With `any_parameters`, a statement executed with
+    parameters that were not recorded is served the executions of the statement
+    in the same way. Time to first row and fetch time are replayed, scaled by
+    `speed`.
+    """
+
+    def __init__(
+            self,
+            path: str | Path,
+            *,
+            speed: float = 1.0,
+            any_parameters: bool = False,
+    ) -> None:
+        """Initializes the replayer, loading the recording.
+
+        Args:
+            path: The recording.
+            speed: The factor recorded times are scaled by. 0 replays without
+                delays.
+            any_parameters: Whether statements executed with parameters that were
+                not recorded are served the executions of the statement with any
+                parameters.
+        """
+        self.speed = speed
+        self.any_parameters = any_parameters
+        self._lock = threading.Lock()
+        self._by_key: dict[str, collections.deque] = collections.defaultdict(
+            collections.deque
+        )
+        self._by_statement: dict[str, collections.deque] = collections.defaultdict(
+            collections.deque
+        )
+        with gzip.open(path, "rt", encoding="utf-8") as recording:
+            for line in recording:
+                entry = json.loads(line)
+                self._by_key[
+                    json.dumps([entry["statement"], entry["parameters"]])
+                ].append(entry)
+                self._by_statement[entry["statement"]].append(entry)
+
+    def connect(self, *args: t.Any, **kwargs: t.Any) -> ReplayConnection:  # noqa: ARG002
+        """Opens a fake DBAPI connection, ignoring the connection arguments.
+
+        Returns:
+            The connection.
+        """
+        return ReplayConnection(self)
+
+    @property
+    def dbapi(self) -> ReplayDBAPI:
+        """Returns a fake DBAPI module, to pass as `module` to create_engine.
+
+        Returns:
+            The module.
+        """
+        return ReplayDBAPI(self)
+
+    def get_entry(self, statement: str, parameters: list | None) -> dict[str, t.Any]:
+        """Returns the next recorded execution of a statement.
+
+        Returns:
+            The recorded execution.
+
+        Raises:
+            ProgrammingError: If the statement was not recorded with the
+                parameters, or at all with `any_parameters`.
+        """
+        with self._lock:
+            entries = self._by_key.get(get_statement_key(statement, parameters))
+            if not entries and self.any_parameters:
+                entries = self._by_statement.get(statement)
+            if not entries:
+                msg = (
+                    f"Statement was not recorded with parameters {parameters}: "
+                    f"{statement}"
+                )
+                raise ReplayDBAPI.ProgrammingError(msg)
+            return entries.popleft() if len(entries) > 1 else entries[0]
+
+
+class ReplayDBAPI:
+    """A fake pyodbc DBAPI module whose connections serve a recording."""
+
+    paramstyle = "qmark"
+    version = "5.0.0"
+    Cursor = ReplayCursor
+
+    class Error(Exception):
+        """Base class of DBAPI errors."""
+
+    class Warning(Exception):  # noqa: A001, N818
+        """DBAPI warning."""
+
+    class InterfaceError(Error):
+        """DBAPI interface error."""
+
+    class DatabaseError(Error):
+        """DBAPI database error."""
+
+    class DataError(DatabaseError):
+        """DBAPI data error."""
+
+    class OperationalError(DatabaseError):
+        """DBAPI operational error."""
+
+    class IntegrityError(DatabaseError):
+        """DBAPI integrity error."""
+
+    class InternalError(DatabaseError):
+        """DBAPI internal error."""
+
+    class ProgrammingError(DatabaseError):
+        """DBAPI programming error."""
+
+    class NotSupportedError(DatabaseError):
+        """DBAPI not supported error."""
+
+    def __init__(self, replayer: QueryReplayer) -> None:
+        """Initializes the module.
+
+        Args:
+            replayer: The replayer connections serve.
+        """
+        self.connect = replayer.connect
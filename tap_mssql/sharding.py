@@ -0,0 +1,138 @@
+"""Splitting of streams into key ranges and their assignment to shards.
+
+This includes parse_shard and get_key_ranges, which split the selected streams
+between several tap processes, assign_shards, which balances work items by
+their estimated size, and get_segment_ranges, which splits a columnstore table
+along its segments.
+"""
+
+from __future__ import annotations
+
+import typing as t
+import zlib
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """Parses a shard given as `i/n`, where i counts from 1.
+
+    Returns:
+        The zero-based shard index and the number of shards.
+
+    Raises:
+        ValueError: If the shard is not of the form `i/n` with 1 <= i <= n.
+    """
+    index, _, count = shard.partition("/")
+    try:
+        shard_index, shard_count = int(index) - 1, int(count)
+    except ValueError:
+        shard_index, shard_count = -1, 0
+    if not 0 <= shard_index < shard_count:
+        msg = f"Invalid shard '{shard}'. Expected 'i/n' with 1 <= i <= n."
+        raise ValueError(msg)
+    return shard_index, shard_count
+
+
+def size_bucket(size: int) -> int:
+    """Rounds a size to a power of two.
+
+    Sizes estimated by different processes at slightly different times only
+    disagree when they fall on either side of a power of two.
+
+    Returns:
+        The bit length of the size.
+    """
+    return max(size, 0).bit_length()
+
+
+def assign_shards(
+        sizes: dict[t.Hashable, int],
+        shard_count: int,
+) -> dict[t.Hashable, int]:
+    """Assigns work items to shards, balancing their estimated sizes.
+
+    Items are assigned largest first to the shard with the smallest total size,
+    with ties broken by a stable hash of the item and by shard index.
+
+    Args:
+        sizes: The estimated size of every item, keyed by a value with a stable
+            repr.
+        shard_count: The number of shards.
+
+    Returns:
+        The zero-based shard index of every item.
+    """
+    totals = [0] * shard_count
+    assignments = {}
+    items = sorted(
+        sizes,
+        key=lambda item: (
+            -size_bucket(sizes[item]),
+            zlib.crc32(repr(item).encode()),
+            repr(item),
+        ),
+    )
+    for item in items:
+        shard_index = min(range(shard_count), key=lambda i: (totals[i], i))
+        assignments[item] = shard_index
+        totals[shard_index] += 1 << size_bucket(sizes[item])
+    return assignments
+
+
+def get_key_ranges(
+        minimum: int,
+        maximum: int,
+        range_count: int,
+) -> list[tuple[int | None, int | None]]:
+    """Splits an integer key span into ranges of equal width.
+
+    The first and last ranges are unbounded, so that keys outside the span are
+    read as well, and the ranges together cover every key exactly once.
+
+    Args:
+        minimum: The smallest key.
+        maximum: The largest key.
+        range_count: The number of ranges.
+
+    Returns:
+        The exclusive lower and inclusive upper bound of every range, with None
+        for an unbounded side.
+    """
+    span = max(maximum - minimum + 1, 1)
+    uppers: list[int | None] = [
+        minimum + span * index // range_count - 1 for index in range(1, range_count)
+    ]
+    lowers: list[int | None] = [None, *uppers]
+    return list(zip(lowers, [*uppers, None]))
+
+
+def get_segment_ranges(
+        segments: t.Iterable[tuple[int, int, int]],
+        range_count: int,
+) -> list[tuple[int | None, int | None]]:
+    """Splits columnstore segments into key ranges holding similar row counts.
+
+    Range boundaries are the maximum values of segments, so that a segment is
+    read by a single range unless it overlaps other segments. The first and last
+    ranges are unbounded, so rows outside all segments (e.g. in delta stores)
+    are read as well.
+
+    Args:
+        segments: The minimum value, maximum value and row count of every segment.
+        range_count: The number of ranges to split into.
+
+    Returns:
+        The exclusive lower and inclusive upper bound of every range, with None
+        for an unbounded side.
+    """
+    segments = sorted(segments, key=lambda segment: segment[1])
+    total_rows = sum(row_count for _, _, row_count in segments)
+    uppers: list[int | None] = []
+    range_rows = 0
+    for _, segment_maximum, row_count in segments[:-1]:
+        range_rows += row_count
+        if range_rows * range_count >= total_rows * (len(uppers) + 1) and (
+                not uppers or segment_maximum > uppers[-1]
+        ):
+            uppers.append(segment_maximum)
+    lowers: list[int | None] = [None, *uppers]
+    return list(zip(lowers, [*uppers, None]))
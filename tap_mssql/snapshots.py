@@ -0,0 +1,106 @@
+"""Primary key snapshots for deleted-row detection.
+
+This includes diff_key_snapshot, which compares the primary keys of a table with
+those recorded by the previous sync without holding either set in memory.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import typing as t
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+
+def get_sort_key(key: list) -> list:
+    """Returns a key to sort primary keys by, in the order SQL Server sorts them.
+
+    Strings are sorted by their UTF-16 code units, as nvarchar values with a
+    binary collation are, rather than by code point, which differs for
+    characters outside the Basic Multilingual Plane.
+
+    Returns:
+        The key, with strings encoded as UTF-16.
+    """
+    return [
+        value.encode("utf-16-be") if isinstance(value, str) else value
+        for value in key
+    ]
+
+
+def read_key_snapshot(path: Path, key_properties: list[str]) -> t.Iterator[list]:
+    """Reads the keys recorded in a snapshot, in ascending order.
+
+    Snapshots recorded for different key properties are ignored.
+
+    Yields:
+        One key, as a list of primary key values, at a time.
+    """
+    if not path.exists():
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+        if json.loads(snapshot.readline()) != key_properties:
+            return
+        for line in snapshot:
+            yield json.loads(line)
+
+
+def diff_key_snapshot(
+        path: Path,
+        key_properties: list[str],
+        keys: t.Iterable[list],
+) -> t.Iterator[list]:
+    """Replaces a snapshot with the current keys, yielding the keys that are gone.
+
+    The snapshot is a gzip-compressed file holding the key properties on its
+    first line, followed by one JSON key per line. Both the recorded and the
+    current keys are read one at a time and merged, so memory use does not grow
+    with the number of keys. The snapshot is only replaced once all current keys
+    have been read.
+
+    Args:
+        path: The path of the snapshot.
+        key_properties: The names of the primary key properties.
+        keys: The current keys, in ascending order of get_sort_key.
+
+    Yields:
+        The recorded keys missing from the current keys, in ascending order of
+        get_sort_key.
+
+    Raises:
+        ValueError: If the current keys are not in ascending order.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    recorded_keys = read_key_snapshot(path, key_properties)
+    recorded_key = next(recorded_keys, None)
+    last_sort_key = None
+    try:
+        with gzip.open(temp_path, "wt", encoding="utf-8") as snapshot:
+            snapshot.write(json.dumps(key_properties) + "\n")
+            for key in keys:
+                key = list(key)  # noqa: PLW2901
+                sort_key = get_sort_key(key)
+                if last_sort_key is not None and sort_key <= last_sort_key:
+                    msg = "Primary keys must be read in ascending order."
+                    raise ValueError(msg)
+                last_sort_key = sort_key
+                snapshot.write(json.dumps(key, separators=(",", ":")) + "\n")
+                while (
+                        recorded_key is not None
+                        and get_sort_key(recorded_key) < sort_key
+                ):
+                    yield recorded_key
+                    recorded_key = next(recorded_keys, None)
+                if recorded_key == key:
+                    recorded_key = next(recorded_keys, None)
+        while recorded_key is not None:
+            yield recorded_key
+            recorded_key = next(recorded_keys, None)
+        temp_path.replace(path)
+    finally:
+        recorded_keys.close()
+        if temp_path.exists():
+            temp_path.unlink()
@@ -3,13 +3,31 @@
 from __future__ import annotations
 
 import copy
+import json
+import signal
+import sys
+import threading
+import typing as t
+from functools import cached_property
 from typing import Sequence
 
+import click
 from singer_sdk import SQLStream, SQLTap, Stream
 from singer_sdk import typing as th  # JSON schema typing helpers
 from singer_sdk._singerlib import Catalog, Metadata, Schema
 
-from tap_mssql.client import MSSQLChangeTrackingStream, MSSQLStream
+from tap_mssql.client import (
+    MSSQLChangeDataCaptureStream,
+    MSSQLChangeTrackingStream,
+    MSSQLConnector,
+    MSSQLStream,
+    MSSQLTemporalStream,
+)
+from tap_mssql.sharding import (
+    assign_shards,
+    get_key_ranges,
+    parse_shard,
+)
 
 
 class TapMSSQL(SQLTap):
@@ -18,6 +36,9 @@ class TapMSSQL(SQLTap):
     name = "tap-mssql"
     default_stream_class = MSSQLStream
 
+    # The shard given with --shard, which takes precedence over the shard setting.
+    cli_shard: str | None = None
+
     config_jsonschema = th.PropertiesList(
         th.Property(
             "host",
@@ -90,13 +111,309 @@ class TapMSSQL(SQLTap):
                 "this choice. One of `FULL_TABLE`, `INCREMENTAL`, or `LOG_BASED`."
             ),
         ),
+        th.Property(
+            "state_message_frequency",
+            th.IntegerType,
+            description=(
+                "Number of records after which a STATE message is written. Sorted "
+                "streams, including Change Tracking syncs, resume from the last "
+                "STATE message if interrupted. Defaults to 10000."
+            ),
+        ),
+        th.Property(
+            "fetch_pipeline_memory_mb",
+            th.IntegerType,
+            description=(
+                "Fetches rows on a background thread while the main thread processes "
+                "and writes records, queueing at most this many megabytes of rows. "
+                "Disabled by default."
+            ),
+        ),
+        th.Property(
+            "server_side_json",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Has SQL Server render FULL_TABLE and INCREMENTAL rows as JSON "
+                "(FOR JSON PATH), which reduces the per-column work done in Python "
+                "for wide tables."
+            ),
+        ),
+        th.Property(
+            "differential_sync",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Syncs FULL_TABLE streams with a single-column primary key "
+                "differentially: only primary key ranges whose row count or hash "
+                "changed since the previous sync are read again."
+            ),
+        ),
+        th.Property(
+            "differential_sync_range_rows",
+            th.IntegerType,
+            default=100000,
+            description=(
+                "The number of rows per primary key range hashed by differential "
+                "sync."
+            ),
+        ),
+        th.Property(
+            "deleted_row_detection",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Detects rows deleted from FULL_TABLE and INCREMENTAL streams by "
+                "diffing their primary keys against a snapshot kept on local disk, "
+                "and emits them with _sdc_deleted_at set."
+            ),
+        ),
+        th.Property(
+            "deleted_row_snapshot_dir",
+            th.StringType,
+            default=".deleted_row_snapshots",
+            description=(
+                "The directory the primary key snapshots of deleted-row detection "
+                "are kept in between syncs."
+            ),
+        ),
+        th.Property(
+            "shard",
+            th.StringType,
+            description=(
+                "Syncs only the selected streams, or primary key ranges of streams "
+                "in shard_key_bounds, assigned to shard i of n, given as 'i/n'. "
+                "Streams are balanced by their size in shard_stream_sizes."
+            ),
+        ),
+        th.Property(
+            "shard_stream_sizes",
+            th.ObjectType(additional_properties=th.IntegerType),
+            description=(
+                "The estimated size of streams, e.g. their row count, keyed by stream "
+                "id, which shards are balanced by. Streams without a size count as "
+                "empty."
+            ),
+        ),
+        th.Property(
+            "shard_key_bounds",
+            th.ObjectType(additional_properties=th.ArrayType(th.IntegerType)),
+            description=(
+                "The smallest and largest primary key of streams to split into one "
+                "primary key range per shard, keyed by stream id, e.g. "
+                '`{"dbo-Orders": [1, 90000000]}`. Keys outside the bounds are '
+                "read by the first and last range."
+            ),
+        ),
+        th.Property(
+            "trace_file",
+            th.StringType,
+            description=(
+                "Appends every SQL statement the tap executes to this JSONL file, "
+                "with its parameters, wall time, time to first row and row count."
+            ),
+        ),
+        th.Property(
+            "trace_statistics",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Adds the logical and physical reads and CPU time reported by "
+                "SET STATISTICS IO, TIME ON to the entries of `trace_file`."
+            ),
+        ),
+        th.Property(
+            "sql_record_file",
+            th.StringType,
+            description=(
+                "Records every SQL statement the tap executes, with its result "
+                "set, to this gzip-compressed JSONL file for `sql_replay_file`."
+            ),
+        ),
+        th.Property(
+            "sql_replay_file",
+            th.StringType,
+            description=(
+                "Serves the SQL statements recorded with `sql_record_file` instead "
+                "of connecting to SQL Server."
+            ),
+        ),
+        th.Property(
+            "sql_replay_speed",
+            th.NumberType,
+            default=1.0,
+            description=(
+                "The factor recorded query times are scaled by when replaying. "
+                "0 replays without delays."
+            ),
+        ),
+        th.Property(
+            "sql_replay_any_parameters",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Serves statements executed with parameters that were not recorded "
+                "the recorded executions of the statement with any parameters."
+            ),
+        ),
+        th.Property(
+            "parallel_workers",
+            th.IntegerType,
+            default=1,
+            description=(
+                "The number of connections tables with a columnstore index, heaps "
+                "and tables without a primary key are read with at once, in ranges "
+                "aligned with the columnstore segments or in page slices."
+            ),
+        ),
+        th.Property(
+            "read_replicas",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property(
+                        "host",
+                        th.StringType,
+                        required=True,
+                        description="Host of the readable secondary replica."
+                    ),
+                    th.Property(
+                        "port",
+                        th.IntegerType,
+                        description=(
+                            "Port of the readable secondary replica. Defaults to "
+                            "the port of the primary."
+                        )
+                    ),
+                )
+            ),
+            description=(
+                "Readable secondary replicas that the selected streams are "
+                "distributed across and read from with ApplicationIntent=ReadOnly. "
+                "LOG_BASED streams are read from the primary while their replica "
+                "lags behind the bookmark."
+            ),
+        ),
+        th.Property(
+            "skip_unchanged_streams",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Checks before the sync which selected streams changed since their "
+                "last sync, and only emits the state of streams without changes."
+            ),
+        ),
+        th.Property(
+            "follow_min_interval_seconds",
+            th.NumberType,
+            default=1.0,
+            description=(
+                "With --follow, the interval CHANGE_TRACKING_CURRENT_VERSION() is "
+                "polled at after changes were found."
+            ),
+        ),
+        th.Property(
+            "follow_max_interval_seconds",
+            th.NumberType,
+            default=30.0,
+            description=(
+                "With --follow, the interval the polling interval doubles up to "
+                "while no changes are found."
+            ),
+        ),
+        th.Property(
+            "transient_error_retries",
+            th.IntegerType,
+            default=0,
+            description=(
+                "The number of times a query failing with a transient error (e.g. "
+                "an Azure SQL failover or a deadlock) is retried on a new "
+                "connection. Reads of tables with a primary key are then ordered "
+                "by it, so that they resume after the last emitted record."
+            ),
+        ),
+        th.Property(
+            "discovery_include",
+            th.ArrayType(th.StringType),
+            description=(
+                "Glob patterns matched against `schema.table`, e.g. `sales.*`. Only "
+                "matching tables and views are discovered."
+            ),
+        ),
+        th.Property(
+            "discovery_exclude",
+            th.ArrayType(th.StringType),
+            description=(
+                "Glob patterns matched against `schema.table`, e.g. `*.tmp_*`. "
+                "Matching tables and views are not discovered."
+            ),
+        ),
+        th.Property(
+            "discovery_object_types",
+            th.ArrayType(th.StringType(allowed_values=["table", "view"])),
+            description=(
+                "The types of objects discovered, `table` and/or `view`. By default "
+                "both are discovered."
+            ),
+        ),
+        th.Property(
+            "sparse_records",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Leaves null values of nullable properties out of records, and "
+                "_sdc_deleted_at out of records of rows that were not deleted. The "
+                "properties left out and bytes saved are logged as metrics."
+            ),
+        ),
+        th.Property(
+            "composite_bookmarks",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Reads INCREMENTAL streams of tables with a primary key in replication "
+                "key and primary key order, and bookmarks the primary key of the last "
+                "row, so that rows sharing the bookmarked value are not read again. "
+                "Rows committed later with the bookmarked value and a lower primary "
+                "key are skipped; see composite_bookmark_lag_seconds."
+            ),
+        ),
+        th.Property(
+            "sample_percent",
+            th.ObjectType(additional_properties=th.NumberType),
+            description=(
+                "The percentage of rows to sample, keyed by stream id or glob "
+                'pattern, e.g. `{"dbo-Orders": 1, "sales-*": 5}`. Sampled '
+                "streams read a sample of the table, also when LOG_BASED, and do "
+                "not advance their bookmarks."
+            ),
+        ),
+        th.Property(
+            "composite_bookmark_lag_seconds",
+            th.NumberType,
+            default=300,
+            description=(
+                "With composite_bookmarks, the primary key is only bookmarked for "
+                "date and time replication key values older than this many seconds "
+                "at the start of the sync, so that rows committed later with the "
+                "bookmarked value are not skipped."
+            ),
+        ),
+        th.Property(
+            "cdc_lsn_range_minutes",
+            th.IntegerType,
+            description=(
+                "Reads Change Data Capture changes in LSN ranges covering at most "
+                "this many minutes of commits. By default all changes since the "
+                "bookmark are read at once."
+            ),
+        ),
     ).to_dict()
 
     @property
     def catalog(self) -> Catalog:  # noqa: C901
         """Get the tap's working catalog.
 
-        Override to do LOG_BASED modifications.
+        Override to do LOG_BASED and deleted-row detection modifications.
 
         Returns:
             A Singer catalog object.
@@ -106,8 +423,13 @@ class TapMSSQL(SQLTap):
         for stream in super().catalog.streams:
             stream_modified = False
             new_stream = copy.deepcopy(stream)
+            is_log_based = new_stream.replication_method == "LOG_BASED"
+            detects_deleted_rows = (
+                self.config.get("deleted_row_detection")
+                and bool(new_stream.key_properties)
+            )
             if (
-                    new_stream.replication_method == "LOG_BASED"
+                    (is_log_based or detects_deleted_rows)
                     and new_stream.schema.properties
             ):
                 for schema_property in new_stream.schema.properties.values():
@@ -134,7 +456,10 @@ class TapMSSQL(SQLTap):
                             )
                         }
                     )
-                if "_sdc_change_version" not in new_stream.schema.properties:
+                if (
+                        is_log_based
+                        and "_sdc_change_version" not in new_stream.schema.properties
+                ):
                     stream_modified = True
 
                     new_stream.schema.properties.update(
@@ -155,13 +480,399 @@ class TapMSSQL(SQLTap):
             new_catalog.add_stream(new_stream)
         if modified_streams:
             self.logger.info(
-                "One or more LOG_BASED catalog entries were modified "
+                "One or more LOG_BASED or deleted-row detection catalog entries "
+                "were modified "
                 "(%s) to allow nullability and include _sdc columns. "
                 "See README for further information.",
                 modified_streams
             )
         return new_catalog
 
+    def get_log_based_stream_class(
+            self,
+            catalog_entry: dict,
+    ) -> type[MSSQLChangeTrackingStream]:
+        """Chooses the stream class for a LOG_BASED catalog entry.
+
+        Change Tracking is preferred, followed by Change Data Capture and then
+        system-versioned temporal tables. Tables with none of these are handled
+        by MSSQLChangeTrackingStream, which falls back to a full table sync.
+
+        Returns:
+            The stream class to use.
+        """
+        table_name = catalog_entry.get("table_name")
+        if table_name in self.tap_connector.change_tracking_tables:
+            return MSSQLChangeTrackingStream
+        if table_name in self.tap_connector.cdc_capture_instances:
+            return MSSQLChangeDataCaptureStream
+        if table_name in self.tap_connector.temporal_tables:
+            return MSSQLTemporalStream
+        return MSSQLChangeTrackingStream
+
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        """Adds the --shard option to the tap's command line interface.
+
+        Returns:
+            A click.Command object.
+        """
+        command = super().get_singer_command()
+        command.params.append(
+            click.Option(
+                ["--shard"],
+                help=(
+                    "Sync only the streams assigned to shard i of n, given as 'i/n'."
+                ),
+            )
+        )
+        command.params.append(
+            click.Option(
+                ["--plan"],
+                is_flag=True,
+                is_eager=True,
+                help=(
+                    "Write the queries and estimated execution plans of the "
+                    "selected streams instead of syncing them."
+                ),
+            )
+        )
+        command.params.append(
+            click.Option(
+                ["--follow"],
+                is_flag=True,
+                is_eager=True,
+                help=(
+                    "Keep running after the sync, polling for change tracking "
+                    "changes and syncing the streams that changed, until SIGTERM."
+                ),
+            )
+        )
+        return command
+
+    @classmethod
+    def cb_discover(
+            cls,
+            ctx: click.Context,
+            param: click.Option,
+            value: bool,  # noqa: FBT001
+    ) -> None:
+        """Runs the tap in discovery mode, which --plan and --follow cannot be.
+
+        --plan and --follow are eager, so they are parsed before --discover.
+
+        Args:
+            ctx: Click context.
+            param: Click option.
+            value: Whether to run in discovery mode.
+
+        Raises:
+            UsageError: If --discover is given with --plan or --follow.
+        """
+        if value and (ctx.params.get("plan") or ctx.params.get("follow")):
+            msg = "--discover cannot be combined with --plan or --follow."
+            raise click.UsageError(msg, ctx)
+        super().cb_discover(ctx, param, value)
+
+    @classmethod
+    def invoke(  # type: ignore[override]
+            cls,
+            *,
+            shard: str | None = None,
+            plan: bool = False,
+            follow: bool = False,
+            **kwargs: t.Any,
+    ) -> None:
+        """Invokes the tap's command line interface.
+
+        Args:
+            shard: The shard given with --shard.
+            plan: Whether to write plans instead of syncing, given with --plan.
+            follow: Whether to keep following changes after the sync, given with
+                --follow.
+            kwargs: The other command line arguments.
+
+        Raises:
+            UsageError: If --plan and --follow are given together, or with --about.
+        """
+        cls.cli_shard = shard
+        if not plan and not follow:
+            super().invoke(**kwargs)
+            return
+        if plan and follow:
+            msg = "--plan cannot be combined with --follow."
+            raise click.UsageError(msg)
+        if kwargs.get("about"):
+            msg = "--about cannot be combined with --plan or --follow."
+            raise click.UsageError(msg)
+
+        cls.print_version(print_fn=cls.logger.info)
+        config_files, parse_env_config = cls.config_from_cli_args(
+            *kwargs.get("config", ())
+        )
+        tap = cls(
+            config=config_files,  # type: ignore[arg-type]
+            state=kwargs.get("state"),
+            catalog=kwargs.get("catalog"),
+            parse_env_config=parse_env_config,
+            validate_config=True,
+        )
+        if plan:
+            tap.write_plans()
+        else:
+            tap.follow()
+
+    def write_plans(self) -> None:
+        """Writes the plan of every selected stream to stdout, one JSON per line.
+
+        Nothing is extracted. The warnings of every plan are also logged.
+        """
+        for stream in self.streams.values():
+            if not stream.selected:
+                continue
+            plan = stream.get_plan()
+            for warning in plan["warnings"]:
+                self.logger.warning("%s: %s", stream.name, warning)
+            sys.stdout.write(json.dumps(plan, default=str) + "\n")
+        sys.stdout.flush()
+
+    def get_follow_streams(self) -> list[MSSQLChangeTrackingStream]:
+        """Returns the streams synced again by --follow as they change.
+
+        Streams of tables without change tracking or a primary key fall back to
+        full table syncs, which would reload the table whenever the database
+        version moves, so they are not followed.
+
+        Returns:
+            The selected change tracking streams of tables that can be followed.
+        """
+        follow_streams = []
+        for stream in self.streams.values():
+            if not stream.selected or type(stream) is not MSSQLChangeTrackingStream:
+                continue
+            if stream.table_is_change_tracking_enabled and stream.primary_keys:
+                follow_streams.append(stream)
+            else:
+                self.logger.info(
+                    "Not following %s, which has no change tracking or primary key.",
+                    stream.name,
+                )
+        return follow_streams
+
+    def follow(self) -> None:
+        """Syncs all streams, then keeps syncing change tracking streams as they change.
+
+        CHANGE_TRACKING_CURRENT_VERSION() is polled on an interval that doubles
+        from `follow_min_interval_seconds` up to `follow_max_interval_seconds`
+        while it does not move. Once it moves, the change tracking streams with
+        changes after their bookmark are synced again, reusing the connections
+        and metadata of the process. SIGTERM and SIGINT stop following once the
+        running stream sync has completed and emitted its state, also during the
+        initial sync of all streams.
+        """
+        stopped = threading.Event()
+        for stream in self.streams.values():
+            stream.stop_requested = stopped
+
+        def stop(signum: int, frame: t.Any) -> None:  # noqa: ANN401, ARG001
+            self.logger.info(
+                "Received signal %d. Stopping after the current sync.", signum
+            )
+            stopped.set()
+
+        previous_handlers = {
+            signum: signal.signal(signum, stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            self.sync_all()
+            follow_streams = self.get_follow_streams()
+            self.logger.info(
+                "Following %d change tracking streams.", len(follow_streams)
+            )
+
+            min_interval = self.config.get("follow_min_interval_seconds", 1.0)
+            max_interval = self.config.get("follow_max_interval_seconds", 30.0)
+            interval = min_interval
+            last_version = None
+            while follow_streams and not stopped.wait(interval):
+                current_version = self.tap_connector.change_tracking_current_version
+                changed_streams = []
+                if current_version != last_version:
+                    last_version = current_version
+                    changed_streams = [
+                        stream for stream in follow_streams if stream.has_changes()
+                    ]
+                for stream in changed_streams:
+                    if stopped.is_set():
+                        break
+                    stream.clear_sync_caches()
+                    stream.sync()
+                    stream.finalize_state_progress_markers()
+                interval = (
+                    min_interval if changed_streams
+                    else min(interval * 2, max_interval)
+                )
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def can_split_stream(self, stream: SQLStream) -> bool:
+        """Returns whether a stream can be split into primary key ranges between shards.
+
+        Returns:
+            True for FULL_TABLE streams with a single integer primary key that
+            keep no state of their own on local disk or in the stream state.
+        """
+        if (
+                type(stream) is not MSSQLStream
+                or stream.replication_method != "FULL_TABLE"
+                or len(stream.primary_keys or []) != 1
+                or self.config.get("differential_sync")
+                or self.config.get("deleted_row_detection")
+        ):
+            return False
+        key_schema = stream.schema["properties"][stream.primary_keys[0]]
+        return "integer" in key_schema.get("type", [])
+
+    def get_shard_streams(
+            self,
+            streams: list[SQLStream],
+            shard_index: int,
+            shard_count: int,
+    ) -> list[SQLStream]:
+        """Returns the streams that a shard syncs.
+
+        Selected streams are assigned to shards balanced by their size in
+        `shard_stream_sizes`, with ties broken by a stable hash of the stream id.
+        Streams with `shard_key_bounds` that can be split are divided into one
+        primary key range per shard instead. The assignment only depends on the
+        catalog and the config, so every process computes the same one.
+
+        Args:
+            streams: All streams.
+            shard_index: The zero-based index of the shard.
+            shard_count: The number of shards.
+
+        Returns:
+            The unselected streams and the selected streams assigned to the shard.
+
+        Raises:
+            ValueError: If `shard_key_bounds` of a stream are not a smallest and a
+                largest key.
+        """
+        key_bounds = self.config.get("shard_key_bounds") or {}
+        stream_sizes = self.config.get("shard_stream_sizes") or {}
+        split_streams = set()
+        for stream in streams:
+            bounds = key_bounds.get(stream.tap_stream_id)
+            if not stream.selected or bounds is None:
+                continue
+            if not self.can_split_stream(stream):
+                self.logger.warning(
+                    "Stream %s cannot be split into primary key ranges. It is "
+                    "synced by a single shard.",
+                    stream.tap_stream_id,
+                )
+            elif shard_count > 1:
+                if len(bounds) != 2 or bounds[0] > bounds[1]:  # noqa: PLR2004
+                    msg = (
+                        f"Invalid shard_key_bounds for {stream.tap_stream_id}: "
+                        f"{bounds}. Expected [smallest key, largest key]."
+                    )
+                    raise ValueError(msg)
+                split_streams.add(stream.tap_stream_id)
+        assignments = assign_shards(
+            {
+                stream.tap_stream_id: stream_sizes.get(stream.tap_stream_id, 0)
+                for stream in streams
+                if stream.selected and stream.tap_stream_id not in split_streams
+            },
+            shard_count,
+        )
+        shard_streams = []
+        for stream in streams:
+            if not stream.selected:
+                shard_streams.append(stream)
+            elif stream.tap_stream_id in split_streams:
+                bounds = key_bounds[stream.tap_stream_id]
+                key_ranges = get_key_ranges(bounds[0], bounds[1], shard_count)
+                stream.shard_key_ranges = [key_ranges[shard_index]]
+                shard_streams.append(stream)
+            elif assignments[stream.tap_stream_id] == shard_index:
+                shard_streams.append(stream)
+
+        self.logger.info(
+            "Shard %d/%d syncs %s.",
+            shard_index + 1,
+            shard_count,
+            [stream.tap_stream_id for stream in shard_streams if stream.selected],
+        )
+        return shard_streams
+
+    @cached_property
+    def replica_connectors(self) -> list[MSSQLConnector]:
+        """Returns the connectors to the configured read replicas.
+
+        Returns:
+            One connector per replica.
+        """
+        return [
+            self.tap_connector.get_replica_connector(replica)
+            for replica in self.config.get("read_replicas") or []
+        ]
+
+    def assign_replicas(self, streams: list[SQLStream]) -> None:
+        """Distributes the selected streams across the read replicas.
+
+        Streams are balanced by their estimated size.
+
+        Args:
+            streams: The streams to distribute.
+        """
+        table_sizes = self.tap_connector.table_sizes
+        assignments = assign_shards(
+            {
+                stream.tap_stream_id: table_sizes.get(stream.tap_stream_id, 0)
+                for stream in streams
+                if stream.selected
+            },
+            len(self.replica_connectors),
+        )
+        for stream in streams:
+            if stream.tap_stream_id in assignments:
+                stream.replica_connector = self.replica_connectors[
+                    assignments[stream.tap_stream_id]
+                ]
+
+    def mark_unchanged_streams(self) -> None:
+        """Marks the selected streams without changes since their last sync.
+
+        LOG_BASED streams compare their change tracking or Change Data Capture
+        bookmark with the changes recorded since, other streams compare a table
+        fingerprint with the one saved in their state.
+        """
+        unchanged_streams = []
+        for stream in self.streams.values():
+            if (
+                    stream.selected
+                    and isinstance(stream, MSSQLStream)
+                    and not stream.has_changes()
+            ):
+                stream.skip_extraction = True
+                unchanged_streams.append(stream.tap_stream_id)
+        self.logger.info(
+            "Skipping %d unchanged streams: %s",
+            len(unchanged_streams),
+            unchanged_streams,
+        )
+
+    def sync_all(self) -> None:
+        """Sync all streams, skipping unchanged ones with `skip_unchanged_streams`."""
+        if self.config.get("skip_unchanged_streams"):
+            self.mark_unchanged_streams()
+        super().sync_all()
+
     def discover_streams(self) -> Sequence[Stream]:
         """Initialize all available streams and return them as a list.
 
@@ -172,7 +883,7 @@ class TapMSSQL(SQLTap):
         for catalog_entry in self.catalog_dict["streams"]:
             if catalog_entry["replication_method"] == "LOG_BASED":
                 streams.append(
-                    MSSQLChangeTrackingStream(
+                    self.get_log_based_stream_class(catalog_entry)(
                         self, catalog_entry, connector=self.tap_connector
                     )
                 )
@@ -180,6 +891,12 @@ class TapMSSQL(SQLTap):
                 streams.append(
                     MSSQLStream(self, catalog_entry, connector=self.tap_connector)
                 )
+
+        shard = self.cli_shard or self.config.get("shard")
+        if shard:
+            streams = self.get_shard_streams(streams, *parse_shard(shard))
+        if self.replica_connectors:
+            self.assign_replicas(streams)
         return streams
 
 
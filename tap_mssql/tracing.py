@@ -0,0 +1,293 @@
+"""Tracing of the SQL statements executed by the tap.
+
+This includes StatementTracer, which wraps DBAPI connections so that every
+statement is written to a JSONL trace file with its timings and row count.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import re
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+STATISTICS_PATTERNS = {
+    "logical_reads": re.compile(r", logical reads (\d+)"),
+    "physical_reads": re.compile(r", physical reads (\d+)"),
+    "read_ahead_reads": re.compile(r", read-ahead reads (\d+)"),
+    "cpu_ms": re.compile(r"Execution Times:\s*CPU time = (\d+) ms"),
+    "elapsed_ms": re.compile(
+        r"Execution Times:\s*CPU time = \d+ ms,\s*elapsed time = (\d+) ms"
+    ),
+}
+
+
+def parse_statistics_messages(messages: list[str]) -> dict[str, int]:
+    """Sums the reads and times reported by SET STATISTICS IO, TIME ON.
+
+    Returns:
+        The logical, physical and read-ahead reads over all tables, and the
+        execution CPU and elapsed time in milliseconds.
+    """
+    return {
+        name: sum(
+            int(value) for message in messages for value in pattern.findall(message)
+        )
+        for name, pattern in STATISTICS_PATTERNS.items()
+    }
+
+
+def serialize_parameter(value: t.Any) -> t.Any:  # noqa: ANN401
+    """Converts a bind parameter that JSON cannot represent.
+
+    Returns:
+        Binary values as hex, anything else as its string representation.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return str(value)
+
+
+class StatementTracer:
+    """Writes every statement executed on its connections to a JSONL file.
+
+    Connections are traced once passed to `wrap`. Entries hold the
+    statement, its parameters, wall time, time to first row and row count, and
+    with `statistics` the reads and CPU time the server reported for it.
+    """
+
+    def __init__(self, path: str | Path, *, statistics: bool = False) -> None:
+        """Initializes the tracer.
+
+        Args:
+            path: The trace file, which entries are appended to.
+            statistics: Whether to turn on STATISTICS IO and TIME on every
+                connection and record the reported reads and times.
+        """
+        self.path = Path(path)
+        self.statistics = statistics
+        self._lock = threading.Lock()
+
+    def wrap(
+            self,
+            connection: t.Any,  # noqa: ANN401
+            dbapi_error: type[Exception],
+    ) -> TracingConnection:
+        """Wraps a DBAPI connection so that its statements are traced.
+
+        Args:
+            connection: The DBAPI connection to wrap.
+            dbapi_error: The base error class of the DBAPI module.
+
+        Returns:
+            The wrapped connection.
+        """
+        if self.statistics:
+            cursor = connection.cursor()
+            cursor.execute("SET STATISTICS IO, TIME ON")
+            cursor.close()
+        return TracingConnection(connection, self, dbapi_error)
+
+    def write(self, entry: dict[str, t.Any]) -> None:
+        """Appends an entry to the trace file."""
+        line = json.dumps(entry, default=serialize_parameter)
+        with self._lock, self.path.open("a", encoding="utf-8") as trace_file:
+            trace_file.write(line + "\n")
+
+
+class TracingCursor:
+    """A DBAPI cursor that traces the statements it executes.
+
+    An entry is written once the rows of a statement have been read, when the
+    cursor executes another statement or is closed.
+    """
+
+    def __init__(
+            self,
+            cursor: t.Any,  # noqa: ANN401
+            tracer: StatementTracer,
+            dbapi_error: type[Exception],
+    ) -> None:
+        """Initializes the cursor.
+
+        Args:
+            cursor: The DBAPI cursor to wrap.
+            tracer: The tracer entries are written to.
+            dbapi_error: The base error class of the DBAPI module.
+        """
+        self._cursor = cursor
+        self._tracer = tracer
+        self._dbapi_error = dbapi_error
+        self._entry: dict[str, t.Any] | None = None
+        self._started = 0.0
+        self._messages: list[str] = []
+
+    def __getattr__(self, name: str) -> t.Any:  # noqa: ANN401
+        """Delegates to the wrapped cursor."""
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value: t.Any) -> None:  # noqa: ANN401
+        """Delegates to the wrapped cursor, e.g. for fast_executemany."""
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        """Iterates over the remaining rows.
+
+        Yields:
+            One row at a time.
+        """
+        while (row := self.fetchone()) is not None:
+            yield row
+
+    def _collect_messages(self) -> None:
+        messages = getattr(self._cursor, "messages", None) or []
+        self._messages.extend(str(message[-1]) for message in messages)
+
+    def _start(self, statement: str, parameters: t.Any) -> None:  # noqa: ANN401
+        self._finish()
+        self._entry = {
+            "started_at": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+            "statement": statement,
+            "parameters": parameters,
+            "wall_time_ms": None,
+            "time_to_first_row_ms": None,
+            "row_count": 0,
+        }
+        self._messages = []
+        self._started = time.perf_counter()
+
+    def _add_rows(self, rows: list) -> None:
+        if self._entry is None:
+            return
+        if rows and self._entry["time_to_first_row_ms"] is None:
+            self._entry["time_to_first_row_ms"] = self._elapsed_ms()
+        self._entry["row_count"] += len(rows)
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._started) * 1000, 3)
+
+    def _finish(self) -> None:
+        if self._entry is None:
+            return
+        entry, self._entry = self._entry, None
+        entry["wall_time_ms"] = self._elapsed_ms()
+        if self._tracer.statistics:
+            try:
+                # Statistics are reported after the rows, in the following results.
+                while True:
+                    has_next_set = self._cursor.nextset()
+                    self._collect_messages()
+                    if not has_next_set:
+                        break
+            except self._dbapi_error as e:
+                logger.debug("Could not read the statistics of a statement: %s", e)
+            entry.update(parse_statistics_messages(self._messages))
+        self._tracer.write(entry)
+
+    def execute(self, statement: str, *parameters: t.Any) -> TracingCursor:
+        """Executes a statement, starting its trace entry.
+
+        Returns:
+            The cursor.
+        """
+        if len(parameters) == 1 and isinstance(parameters[0], (list, tuple)):
+            self._start(statement, list(parameters[0]))
+        else:
+            self._start(statement, list(parameters))
+        self._cursor.execute(statement, *parameters)
+        self._collect_messages()
+        return self
+
+    def executemany(self, statement: str, parameters: t.Any) -> None:  # noqa: ANN401
+        """Executes a statement for every set of parameters, tracing it once."""
+        self._start(statement, None)
+        self._cursor.executemany(statement, parameters)
+        self._collect_messages()
+
+    def fetchone(self) -> t.Any:  # noqa: ANN401
+        """Fetches the next row.
+
+        Returns:
+            The row, or None once all rows have been read.
+        """
+        row = self._cursor.fetchone()
+        self._add_rows([] if row is None else [row])
+        return row
+
+    def fetchmany(self, *args: t.Any) -> list:
+        """Fetches the next rows.
+
+        Returns:
+            The rows, or an empty list once all rows have been read.
+        """
+        rows = self._cursor.fetchmany(*args)
+        self._add_rows(rows)
+        return rows
+
+    def fetchall(self) -> list:
+        """Fetches all remaining rows.
+
+        Returns:
+            The rows.
+        """
+        rows = self._cursor.fetchall()
+        self._add_rows(rows)
+        return rows
+
+    def close(self) -> None:
+        """Writes the trace entry of the last statement and closes the cursor."""
+        self._finish()
+        self._cursor.close()
+
+
+class TracingConnection:
+    """A DBAPI connection whose cursors trace the statements they execute."""
+
+    cursor_class: type[TracingCursor] = TracingCursor
+
+    def __init__(
+            self,
+            connection: t.Any,  # noqa: ANN401
+            tracer: StatementTracer,
+            dbapi_error: type[Exception],
+    ) -> None:
+        """Initializes the connection.
+
+        Args:
+            connection: The DBAPI connection to wrap.
+            tracer: The tracer entries are written to.
+            dbapi_error: The base error class of the DBAPI module.
+        """
+        self._connection = connection
+        self._tracer = tracer
+        self._dbapi_error = dbapi_error
+
+    def __getattr__(self, name: str) -> t.Any:  # noqa: ANN401
+        """Delegates to the wrapped connection."""
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name: str, value: t.Any) -> None:  # noqa: ANN401
+        """Delegates to the wrapped connection, e.g. for autocommit."""
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._connection, name, value)
+
+    def cursor(self, *args: t.Any, **kwargs: t.Any) -> TracingCursor:
+        """Opens a cursor whose statements are traced.
+
+        Returns:
+            The wrapped cursor.
+        """
+        return self.cursor_class(
+            self._connection.cursor(*args, **kwargs), self._tracer, self._dbapi_error
+        )
@@ -0,0 +1,65 @@
+import pytest
+import sqlalchemy as sa
+
+from tap_mssql.client import MSSQLConnector
+from tests.conftest import persons_table
+
+
+@pytest.fixture(scope="function")
+def database_name():
+    return "melty_cdc"
+
+
+@pytest.fixture(scope="function")
+def database_statements(database_name):
+    """Creates a local stand-in for Change Data Capture.
+
+    Enabling CDC requires the SQL Server Agent, so the cdc schema objects the tap
+    reads are created by hand and changes are written to the change table directly.
+    """
+    return [
+        persons_table(database_name),
+        f"USE {database_name}",
+        "CREATE SCHEMA cdc",
+        """CREATE TABLE cdc.change_tables (
+                source_object_id int,
+                capture_instance sysname,
+                supports_net_changes bit,
+                create_date datetime
+            );""",
+        """INSERT INTO cdc.change_tables
+           VALUES (OBJECT_ID('dbo.Persons'), 'dbo_Persons', 1, GETDATE())""",
+        """CREATE TABLE cdc.dbo_Persons_CT (
+                __$start_lsn binary(10),
+                __$operation int,
+                PersonID int,
+                FirstName varchar(255),
+            );""",
+        """CREATE FUNCTION cdc.fn_cdc_get_net_changes_dbo_Persons (
+                @from_lsn binary(10),
+                @to_lsn binary(10),
+                @row_filter_option nvarchar(30)
+           )
+           RETURNS TABLE
+           AS RETURN
+           SELECT * FROM cdc.dbo_Persons_CT
+           WHERE __$start_lsn BETWEEN @from_lsn AND @to_lsn""",
+        "USE master",
+    ]
+
+
+@pytest.fixture(scope="function", autouse=True)
+def stand_in_cdc(monkeypatch):
+    """Replaces the sys.fn_cdc_* LSN lookups with reads of the stand-in change table."""
+    def cdc_maximum_lsn(self):
+        with self._connect() as conn:
+            return conn.execute(sa.text(
+                "SELECT ISNULL(MAX(__$start_lsn), 0x00000000000000000001) FROM cdc.dbo_Persons_CT"
+            )).first()[0]
+
+    monkeypatch.setattr(MSSQLConnector, "cdc_maximum_lsn", property(cdc_maximum_lsn))
+    monkeypatch.setattr(
+        MSSQLConnector,
+        "get_cdc_minimum_lsn",
+        lambda self, capture_instance: bytes(10),
+    )
@@ -0,0 +1,54 @@
+import sqlalchemy as sa
+from singer_sdk.testing import TapTestRunner
+
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_CDC
+
+
+def capture_change(db_connection, lsn, operation, person_id, first_name):
+    db_connection.execute(
+        sa.text(
+            """
+                INSERT INTO melty_cdc.cdc.dbo_Persons_CT (__$start_lsn, __$operation, PersonID, FirstName)
+                VALUES (CAST(:lsn AS binary(10)), :operation, :personid, :firstname)
+            """
+        ), {
+            "lsn": lsn.to_bytes(10, "big"),
+            "operation": operation,
+            "personid": person_id,
+            "firstname": first_name,
+        })
+    db_connection.commit()
+
+
+def test_cdc_changes(db_connection, insert_persons):
+    """Check that changes are read from the change table after an initial full sync"""
+    insert_persons(range(3))
+    capture_change(db_connection, 5, 2, 2, "Initial")
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_CDC,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+    )
+    test_runner.sync_all()
+    assert len(test_runner.record_messages) == 3
+    assert test_runner.state_messages[-1]["value"]["bookmarks"]["dbo-Persons"]["replication_key_value"] == 5
+
+    capture_change(db_connection, 6, 2, 3, "Inserted")
+    capture_change(db_connection, 7, 1, 1, None)
+
+    test_runner_after_changes = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_CDC,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+        state=test_runner.state_messages[-1]["value"]
+    )
+    test_runner_after_changes.sync_all()
+
+    records = [person["record"] for person in test_runner_after_changes.record_messages]
+    assert [record["PersonID"] for record in records] == [3, 1]
+    assert [record["_sdc_change_version"] for record in records] == [6, 7]
+    assert records[0]["FirstName"] == "Inserted"
+    assert records[0]["_sdc_deleted_at"] is None
+    assert records[1]["_sdc_deleted_at"] is not None
@@ -1,3 +1,6 @@
+import json
+
+import pytest
 import sqlalchemy as sa
 from faker import Faker
 from singer_sdk.testing import TapTestRunner
@@ -178,3 +181,202 @@ def test_record_deletion(db_connection):
     assert test_runner_after_delete.record_messages[0]["record"]["PersonID"] == 2
     assert test_runner_after_delete.record_messages[0]["record"]["_sdc_deleted_at"] is not None
     assert test_runner_after_delete.record_messages[0]["record"]["FirstName"] is None
+
+def test_unselected_column_update(db_connection):
+    """Check that updates touching only unselected columns are not emitted"""
+    fake = Faker()
+
+    person_ids = range(50)
+    for person_id in person_ids:
+        db_connection.execute(
+            sa.text(
+                """
+                    INSERT INTO melty_ct.dbo.Persons (PersonID, FirstName)
+                    VALUES (:personid, :firstname)
+                """
+            ), {
+                'personid': person_id,
+                "firstname": fake.first_name(),
+            })
+        db_connection.commit()
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_CHANGE_TRACKING,
+        catalog="tests/resources/persons_catalog_change_tracking_deselected.json",
+    )
+    test_runner.sync_all()
+    assert len(test_runner.record_messages) == 50
+
+    db_connection.execute(
+        sa.text("UPDATE melty_ct.dbo.Persons SET FirstName = 'Updated' WHERE PersonID = 1"))
+    db_connection.commit()
+    db_connection.execute(
+        sa.text("INSERT INTO melty_ct.dbo.Persons (PersonID, FirstName) VALUES (50, 'Inserted')"))
+    db_connection.commit()
+
+    test_runner_after_update = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_CHANGE_TRACKING,
+        catalog="tests/resources/persons_catalog_change_tracking_deselected.json",
+        state=test_runner.state_messages[0]["value"]
+    )
+    test_runner_after_update.sync_all()
+
+    # Only the insert should be emitted
+    assert len(test_runner_after_update.record_messages) == 1
+    assert test_runner_after_update.record_messages[0]["record"]["PersonID"] == 50
+
+
+def test_resume_after_interruption(db_connection):
+    """Check that a sync killed mid-stream resumes without duplicating or skipping rows"""
+    fake = Faker()
+
+    person_ids = range(50)
+    for person_id in person_ids:
+        db_connection.execute(
+            sa.text(
+                """
+                    INSERT INTO melty_ct.dbo.Persons (PersonID, FirstName)
+                    VALUES (:personid, :firstname)
+                """
+            ), {
+                'personid': person_id,
+                "firstname": fake.first_name(),
+            })
+        db_connection.commit()
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_CHANGE_TRACKING,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+    )
+    test_runner.sync_all()
+    assert len(test_runner.record_messages) == 50
+
+    # 25 changes with a version each, followed by 50 changes sharing one version
+    updated_person_ids = range(25)
+    for person_id in updated_person_ids:
+        db_connection.execute(
+            sa.text("UPDATE melty_ct.dbo.Persons SET FirstName = 'Updated' WHERE PersonID = :personid"),
+            {"personid": person_id})
+        db_connection.commit()
+    new_person_ids = range(50, 100)
+    db_connection.execute(
+        sa.text(
+            "INSERT INTO melty_ct.dbo.Persons (PersonID, FirstName) VALUES "
+            + ", ".join(f"({person_id}, 'Inserted')" for person_id in new_person_ids)
+        ))
+    db_connection.commit()
+
+    class Interrupted(Exception):
+        pass
+
+    messages = []
+
+    def write_message(message):
+        messages.append(message.to_dict())
+        if len([message for message in messages if message["type"] == "STATE"]) == 4:
+            raise Interrupted
+
+    config = {**SAMPLE_CONFIG_CHANGE_TRACKING, "state_message_frequency": 10}
+    interrupted_tap = TapMSSQL(
+        config=config,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+        state=test_runner.state_messages[-1]["value"],
+    )
+    interrupted_tap.write_message = write_message
+    with pytest.raises(Interrupted):
+        interrupted_tap.sync_all()
+
+    # Killed right after the third checkpoint, part way through the shared version
+    interrupted_person_ids = [message["record"]["PersonID"] for message in messages if message["type"] == "RECORD"]
+    assert len(interrupted_person_ids) == 30
+    assert messages[-1]["value"]["bookmarks"]["dbo-Persons"]["last_primary_key"] == [54]
+
+    test_runner_resumed = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=config,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+        state=messages[-1]["value"],
+    )
+    test_runner_resumed.sync_all()
+
+    resumed_person_ids = [person["record"]["PersonID"] for person in test_runner_resumed.record_messages]
+    all_person_ids = interrupted_person_ids + resumed_person_ids
+    assert len(all_person_ids) == len(set(all_person_ids))
+    assert set(all_person_ids) == set(updated_person_ids) | set(new_person_ids)
+    assert "last_primary_key" not in test_runner_resumed.state_messages[-1]["value"]["bookmarks"]["dbo-Persons"]
+
+
+def test_deletes_are_stamped_with_their_commit_time(db_connection):
+    """Check that deletes carry the commit time of their transaction, not the sync time"""
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_CHANGE_TRACKING,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+    )
+    test_runner.sync_all()
+
+    for person_id in (3, 4):
+        db_connection.execute(sa.text("DELETE FROM melty_ct.dbo.Persons WHERE PersonID = :personid"), {"personid": person_id})
+        db_connection.commit()
+
+    commit_times = dict(
+        db_connection.execute(
+            sa.text(
+                """
+                    SELECT c.SYS_CHANGE_VERSION, tc.commit_time
+                    FROM CHANGETABLE(CHANGES melty_ct.dbo.Persons, :version) AS c
+                    JOIN sys.dm_tran_commit_table AS tc ON tc.commit_ts = c.SYS_CHANGE_VERSION
+                """
+            ), {"version": test_runner.state_messages[-1]["value"]["bookmarks"]["dbo-Persons"]["replication_key_value"]}
+        ).all()
+    )
+
+    test_runner_after_delete = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_CHANGE_TRACKING,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+        state=test_runner.state_messages[-1]["value"],
+    )
+    test_runner_after_delete.sync_all()
+
+    deleted = [message["record"] for message in test_runner_after_delete.record_messages]
+    assert len(deleted) == 2
+    for record in deleted:
+        assert record["_sdc_deleted_at"] == commit_times[record["_sdc_change_version"]].strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def test_change_tracking_statement_is_parameterized(db_connection, tmp_path):
+    """Check that the CHANGETABLE statement text is the same for every bookmark"""
+    trace_file = tmp_path / "trace.jsonl"
+    config = {**SAMPLE_CONFIG_CHANGE_TRACKING, "trace_file": str(trace_file)}
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=config,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+    )
+    test_runner.sync_all()
+    state = test_runner.state_messages[-1]["value"]
+
+    for person_id in (100, 101):
+        db_connection.execute(
+            sa.text("INSERT INTO melty_ct.dbo.Persons (PersonID, FirstName) VALUES (:personid, 'Ada')"),
+            {"personid": person_id},
+        )
+        db_connection.commit()
+        test_runner = TapTestRunner(
+            tap_class=TapMSSQL,
+            config=config,
+            catalog="tests/resources/persons_catalog_change_tracking.json",
+            state=state,
+        )
+        test_runner.sync_all()
+        state = test_runner.state_messages[-1]["value"]
+
+    entries = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    change_queries = [entry for entry in entries if "_sdc_change_operation" in entry["statement"]]
+    assert len(change_queries) == 2
+    assert change_queries[0]["statement"] == change_queries[1]["statement"]
+    assert change_queries[0]["parameters"] != change_queries[1]["parameters"]
@@ -0,0 +1,64 @@
+import datetime
+import logging
+from types import SimpleNamespace
+
+import sqlalchemy as sa
+
+from tap_mssql.client import MSSQLChangeTrackingStream
+
+
+class StandInConnector:
+    def __init__(self, commit_times, error=None):
+        self.commit_times = commit_times
+        self.error = error
+        self.lookups = []
+
+    def get_delete_commit_times(self, table_name, previous_version):
+        self.lookups.append(previous_version)
+        if self.error:
+            raise self.error
+        return {version: commit_time for version, commit_time in self.commit_times.items() if version > previous_version}
+
+
+def stand_in_stream(connector):
+    stream = SimpleNamespace(
+        commit_times={},
+        commit_times_unavailable=False,
+        connector=connector,
+        fully_qualified_name="dbo.Persons",
+        logger=logging.getLogger("test"),
+    )
+    stream.load_commit_times = lambda version: MSSQLChangeTrackingStream.load_commit_times(stream, version)
+    return stream
+
+
+def test_commit_times_are_loaded_once_per_batch():
+    connector = StandInConnector(
+        {
+            7: datetime.datetime(2024, 5, 1, 9, 30, 0, 123000),
+            9: datetime.datetime(2024, 5, 1, 9, 31, 0),
+        }
+    )
+    stream = stand_in_stream(connector)
+    get_commit_time = MSSQLChangeTrackingStream.get_commit_time
+    assert [get_commit_time(stream, version) for version in (7, 7, 9, 9)] == [
+        "2024-05-01T09:30:00Z",
+        "2024-05-01T09:30:00Z",
+        "2024-05-01T09:31:00Z",
+        "2024-05-01T09:31:00Z",
+    ]
+    assert connector.lookups == [6]
+
+    # A version committed after the batch was loaded is looked up with the versions after it.
+    connector.commit_times[12] = datetime.datetime(2024, 5, 1, 9, 32, 0)
+    assert get_commit_time(stream, 12) == "2024-05-01T09:32:00Z"
+    assert connector.lookups == [6, 11]
+
+
+def test_unreadable_commit_times_fall_back_to_the_sync_time():
+    connector = StandInConnector({}, error=sa.exc.DBAPIError("SELECT", {}, Exception("permission denied")))
+    stream = stand_in_stream(connector)
+    deleted_at = MSSQLChangeTrackingStream.get_commit_time(stream, 7)
+    assert datetime.datetime.strptime(deleted_at, "%Y-%m-%dT%H:%M:%SZ")
+    MSSQLChangeTrackingStream.get_commit_time(stream, 8)
+    assert connector.lookups == [6]
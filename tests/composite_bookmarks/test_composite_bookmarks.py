@@ -0,0 +1,79 @@
+import datetime
+import decimal
+from types import SimpleNamespace
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mssql
+
+from tap_mssql.client import MSSQLConnector, MSSQLStream, from_json_compatible
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_CHANGE_TRACKING
+
+SERVER_TIME = datetime.datetime(2024, 5, 1, 12, 0)
+SERVER_OFFSET_TIME = datetime.datetime(2024, 5, 1, 12, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+
+
+def is_settled(value, lag_seconds=300):
+    stream = SimpleNamespace(
+        config={"composite_bookmark_lag_seconds": lag_seconds},
+        server_time=(SERVER_TIME, SERVER_OFFSET_TIME),
+    )
+    return MSSQLStream.is_settled(stream, value)
+
+
+def test_recent_replication_key_values_are_not_settled():
+    assert is_settled(datetime.datetime(2024, 5, 1, 11, 54))
+    assert not is_settled(datetime.datetime(2024, 5, 1, 11, 56))
+    assert is_settled(datetime.datetime(2024, 5, 1, 11, 56), lag_seconds=60)
+    assert is_settled("2024-05-01T11:54:00")
+
+
+def test_values_with_an_offset_are_compared_with_the_server_offset_time():
+    assert is_settled(datetime.datetime(2024, 5, 1, 9, 54, tzinfo=datetime.timezone.utc))
+    assert not is_settled("2024-05-01T09:56:00+00:00")
+
+
+def test_dates_are_settled_once_the_day_is_over():
+    assert is_settled(datetime.date(2024, 4, 30), lag_seconds=3600)
+    assert not is_settled(datetime.date(2024, 4, 30), lag_seconds=12 * 3600 + 1)
+    assert not is_settled(datetime.date(2024, 5, 1))
+
+
+def test_other_values_are_always_settled():
+    assert is_settled(42)
+    assert is_settled("not a time")
+
+
+def change_tracking_stream(monkeypatch, key_type):
+    monkeypatch.setattr(MSSQLConnector, "change_tracking_tables", ["Persons"])
+    tap = TapMSSQL(
+        config=SAMPLE_CONFIG_CHANGE_TRACKING, catalog="tests/resources/persons_catalog_change_tracking.json"
+    )
+    stream = tap.streams["dbo-Persons"]
+    stream.__dict__["change_tracking_fallback_reason"] = None
+    monkeypatch.setattr(
+        stream.connector,
+        "get_table_columns",
+        lambda full_table_name, column_names: {"PersonID": sa.Column("PersonID", key_type)},
+    )
+    return stream
+
+
+def test_change_tracking_primary_keys_are_saved_json_compatible(monkeypatch):
+    stream = change_tracking_stream(monkeypatch, mssql.DATETIME2)
+    stream._increment_stream_state({"_sdc_change_version": 5, "PersonID": SERVER_TIME})
+    assert stream.stream_state["last_primary_key"] == ["2024-05-01T12:00:00+00:00"]
+
+    parameters = stream.get_changes_parameters(5, stream.stream_state["last_primary_key"])
+    assert parameters["resume_primary_key_0"] == SERVER_TIME
+
+
+def test_state_values_are_converted_back_to_column_values():
+    assert from_json_compatible("2024-05-01T14:00:00+02:00", mssql.DATETIME2()) == SERVER_TIME
+    assert from_json_compatible("2024-05-01T14:00:00+02:00", mssql.DATETIMEOFFSET()) == SERVER_OFFSET_TIME.replace(
+        hour=14
+    )
+    assert from_json_compatible("2024-05-01", sa.Date()) == datetime.date(2024, 5, 1)
+    assert from_json_compatible(1.5, sa.Numeric(18, 4)) == decimal.Decimal("1.5")
+    assert from_json_compatible("1.5", sa.String()) == "1.5"
+    assert from_json_compatible(7, sa.Integer()) == 7
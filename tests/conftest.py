@@ -0,0 +1,65 @@
+import pytest
+import sqlalchemy as sa
+from faker import Faker
+
+from tests.settings import DB_SQLALCHEMY_URL
+
+
+def persons_table(database, *columns):
+    """Returns the statement creating the Persons table of a database, with extra columns."""
+    return f"""CREATE TABLE {database}.dbo.Persons (
+                    PersonID int PRIMARY KEY,
+                    FirstName varchar(255),
+                    {"".join(f"{column}, " for column in columns)}
+                );"""
+
+
+@pytest.fixture(scope="function")
+def database_statements(database_name):
+    """Statements creating the tables of the test database, a Persons table by default."""
+    return [persons_table(database_name)]
+
+
+@pytest.fixture(scope="function")
+def db_connection(database_name, database_statements):
+    """Fixture to connect with DB, creating the test database and dropping it afterwards.
+
+    Test directories set `database_name`, and `database_statements` to create other tables.
+    """
+    engine = sa.create_engine(DB_SQLALCHEMY_URL)
+    connection = engine.connect()
+
+    connection.execute(sa.text(f"CREATE DATABASE {database_name}"))
+    connection.commit()
+    for statement in database_statements:
+        connection.execute(sa.text(statement))
+        connection.commit()
+
+    yield connection
+
+    connection.execute(sa.text(
+        f"ALTER DATABASE {database_name} SET SINGLE_USER WITH ROLLBACK IMMEDIATE; DROP DATABASE {database_name}"))
+    connection.commit()
+    connection.close()
+
+
+@pytest.fixture(scope="function")
+def insert_persons(db_connection, database_name):
+    """Returns a function inserting persons with fake first names into the Persons table."""
+    fake = Faker()
+
+    def insert(person_ids):
+        for person_id in person_ids:
+            db_connection.execute(
+                sa.text(
+                    f"""
+                        INSERT INTO {database_name}.dbo.Persons (PersonID, FirstName)
+                        VALUES (:personid, :firstname)
+                    """
+                ), {
+                    'personid': person_id,
+                    "firstname": fake.first_name(),
+                })
+            db_connection.commit()
+
+    return insert
@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(scope="function")
+def database_name():
+    return "melty_deleted"
@@ -0,0 +1,40 @@
+import sqlalchemy as sa
+from singer_sdk.testing import TapTestRunner
+
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_DELETED_ROWS
+
+
+def run_sync(snapshot_dir):
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config={**SAMPLE_CONFIG_DELETED_ROWS, "deleted_row_snapshot_dir": str(snapshot_dir)},
+        catalog="tests/resources/persons_catalog.json",
+    )
+    test_runner.sync_all()
+    return test_runner
+
+
+def test_deleted_rows_are_emitted(db_connection, tmp_path, insert_persons):
+    """Check that rows deleted between full table syncs are emitted as tombstones"""
+    insert_persons(range(50))
+
+    test_runner = run_sync(tmp_path)
+    assert len(test_runner.record_messages) == 50
+    assert all(person["record"].get("_sdc_deleted_at") is None for person in test_runner.record_messages)
+
+    db_connection.execute(
+        sa.text("DELETE FROM melty_deleted.dbo.Persons WHERE PersonID IN (0, 17, 49)"))
+    db_connection.commit()
+
+    test_runner_after_deletes = run_sync(tmp_path)
+    deleted_records = [
+        person["record"] for person in test_runner_after_deletes.record_messages
+        if person["record"].get("_sdc_deleted_at") is not None
+    ]
+    assert sorted(person["PersonID"] for person in deleted_records) == [0, 17, 49]
+    assert len(test_runner_after_deletes.record_messages) == 47 + 3
+
+    # Deleted rows are only emitted once
+    test_runner_unchanged = run_sync(tmp_path)
+    assert len(test_runner_unchanged.record_messages) == 47
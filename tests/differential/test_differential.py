@@ -0,0 +1,45 @@
+import sqlalchemy as sa
+from singer_sdk.testing import TapTestRunner
+
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_DIFFERENTIAL
+
+
+def run_sync(state=None):
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_DIFFERENTIAL,
+        catalog="tests/resources/persons_catalog.json",
+        state=state,
+    )
+    test_runner.sync_all()
+    return test_runner
+
+
+def test_differential_sync(db_connection, insert_persons):
+    """Check that only the primary key ranges containing changes are read again"""
+    insert_persons(range(100))
+
+    test_runner = run_sync()
+    assert len(test_runner.record_messages) == 100
+    state = test_runner.state_messages[-1]["value"]
+    ranges = state["bookmarks"]["dbo-Persons"]["differential_ranges"]
+    assert len(ranges) == 10
+    assert sum(r["rows"] for r in ranges) == 100
+
+    test_runner_unchanged = run_sync(state)
+    assert len(test_runner_unchanged.record_messages) == 0
+
+    db_connection.execute(
+        sa.text("UPDATE melty_diff.dbo.Persons SET FirstName = 'Updated' WHERE PersonID = 15"))
+    db_connection.commit()
+    insert_persons(range(100, 103))
+
+    test_runner_after_changes = run_sync(state)
+    # The range holding PersonID 15 and the last, open-ended range are read again
+    all_person_ids_in_new_records = [person["record"]["PersonID"] for person in test_runner_after_changes.record_messages]
+    assert sorted(all_person_ids_in_new_records) == [*range(10, 20), *range(90, 103)]
+
+    state_after_changes = test_runner_after_changes.state_messages[-1]["value"]
+    test_runner_unchanged = run_sync(state_after_changes)
+    assert len(test_runner_unchanged.record_messages) == 0
@@ -0,0 +1,129 @@
+import contextlib
+from types import SimpleNamespace
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.mssql import pyodbc
+
+from tap_mssql.client import MSSQLConnector, glob_to_like
+from tests.settings import SAMPLE_CONFIG_CORE
+
+
+def test_glob_patterns_are_converted_to_like_patterns():
+    assert glob_to_like("sales.*") == "sales.%"
+    assert glob_to_like("dbo.Order?") == "dbo.Order_"
+    assert glob_to_like("dbo.tmp_[1]%") == "dbo.tmp[_][[]1][%]"
+
+
+def test_discovery_is_unfiltered_by_default():
+    assert MSSQLConnector(SAMPLE_CONFIG_CORE).get_discovery_query() is None
+
+
+def test_discovery_filters_are_pushed_into_the_query():
+    connector = MSSQLConnector(
+        {
+            **SAMPLE_CONFIG_CORE,
+            "discovery_include": ["sales.*", "dbo.Customer*"],
+            "discovery_exclude": ["*.tmp_*"],
+            "discovery_object_types": ["table"],
+        }
+    )
+    query = connector.get_discovery_query().compile(dialect=pyodbc.dialect())
+    qualified_name = "[INFORMATION_SCHEMA].[TABLES].[TABLE_SCHEMA] + :TABLE_SCHEMA_1 + [INFORMATION_SCHEMA].[TABLES].[TABLE_NAME]"
+    assert " ".join(str(query).split()) == (
+        "SELECT [INFORMATION_SCHEMA].[TABLES].[TABLE_SCHEMA], [INFORMATION_SCHEMA].[TABLES].[TABLE_NAME], "
+        "[INFORMATION_SCHEMA].[TABLES].[TABLE_TYPE] FROM [INFORMATION_SCHEMA].[TABLES] "
+        "WHERE [INFORMATION_SCHEMA].[TABLES].[TABLE_TYPE] IN (__[POSTCOMPILE_TABLE_TYPE_1]) "
+        f"AND (({qualified_name}) LIKE :param_1 OR ({qualified_name}) LIKE :param_2) "
+        f"AND ({qualified_name}) NOT LIKE :param_3 "
+        "ORDER BY [INFORMATION_SCHEMA].[TABLES].[TABLE_SCHEMA], [INFORMATION_SCHEMA].[TABLES].[TABLE_NAME]"
+    )
+    assert query.params == {
+        "TABLE_TYPE_1": ["BASE TABLE"],
+        "TABLE_SCHEMA_1": ".",
+        "param_1": "sales.%",
+        "param_2": "dbo.Customer%",
+        "param_3": "%.tmp[_]%",
+    }
+
+
+class FakeInspector:
+    """Reflects the columns of the objects it is asked for, recording the calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_multi_columns(self, *, schema, kind, filter_names):
+        self.calls.append(("columns", schema, kind, filter_names))
+        return {(schema, name): [{"name": "id"}] for name in filter_names}
+
+    def get_multi_pk_constraint(self, *, schema, filter_names):
+        self.calls.append(("pk", schema, filter_names))
+        return {(schema, name): {"constrained_columns": ["id"]} for name in filter_names}
+
+    def get_multi_indexes(self, *, schema, filter_names):
+        self.calls.append(("indexes", schema, filter_names))
+        return {}
+
+
+class ListingConnector(MSSQLConnector):
+    """Lists the given tables and views, and records the catalog entries created."""
+
+    def __init__(self, rows):
+        super().__init__({**SAMPLE_CONFIG_CORE, "discovery_include": ["*"]})
+        self.rows = rows
+        self.entries = []
+
+    @property
+    def _engine(self):
+        return "engine"
+
+    def _connect(self):
+        return contextlib.nullcontext(SimpleNamespace(execute=lambda query: self.rows))
+
+    def discover_catalog_entry(self, engine, inspected, schema_name, table, is_view, **kwargs):
+        self.entries.append((schema_name, table, is_view, kwargs["reflected_pk"]))
+        return SimpleNamespace(to_dict=lambda: {"tap_stream_id": f"{schema_name}-{table}"})
+
+
+def test_only_selected_objects_are_reflected(monkeypatch):
+    inspector = FakeInspector()
+    monkeypatch.setattr(sa, "inspect", lambda engine: inspector)
+    connector = ListingConnector(
+        [
+            ("dbo", "Customers", "BASE TABLE"),
+            ("dbo", "CustomerView", "VIEW"),
+            ("sales", "Orders", "BASE TABLE"),
+            ("staging", "Orders", "BASE TABLE"),
+        ]
+    )
+    entries = connector.entries
+
+    catalog = connector.discover_catalog_entries(exclude_schemas=["staging"])
+
+    assert [entry["tap_stream_id"] for entry in catalog] == [
+        "dbo-Customers", "dbo-CustomerView", "sales-Orders"
+    ]
+    assert entries[1] == ("dbo", "CustomerView", True, None)
+    assert inspector.calls == [
+        ("columns", "dbo", sa.engine.reflection.ObjectKind.TABLE, ["Customers"]),
+        ("pk", "dbo", ["Customers"]),
+        ("indexes", "dbo", ["Customers"]),
+        ("columns", "dbo", sa.engine.reflection.ObjectKind.ANY_VIEW, ["CustomerView"]),
+        ("columns", "sales", sa.engine.reflection.ObjectKind.TABLE, ["Orders"]),
+        ("pk", "sales", ["Orders"]),
+        ("indexes", "sales", ["Orders"]),
+    ]
+
+
+def test_names_are_reflected_in_batches_within_the_parameter_limit(monkeypatch):
+    inspector = FakeInspector()
+    monkeypatch.setattr(sa, "inspect", lambda engine: inspector)
+    names = [f"Table{i:04}" for i in range(2500)]
+    connector = ListingConnector([("dbo", name, "BASE TABLE") for name in names])
+
+    catalog = connector.discover_catalog_entries()
+
+    assert [entry["tap_stream_id"] for entry in catalog] == [f"dbo-{name}" for name in names]
+    batches = [call[-1] for call in inspector.calls]
+    assert max(len(batch) for batch in batches) <= 1000
+    assert [len(call[-1]) for call in inspector.calls if call[0] == "columns"] == [1000, 1000, 500]
@@ -0,0 +1,94 @@
+import logging
+import os
+import signal
+import threading
+from types import SimpleNamespace
+
+from tap_mssql.client import MSSQLConnector
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_CHANGE_TRACKING, SAMPLE_CONFIG_INCREMENTAL
+
+
+class StandInStream:
+    def __init__(self, name, changed_versions, tap):
+        self.name = name
+        self.changed_versions = changed_versions
+        self.tap = tap
+        self.syncs = []
+
+    def has_changes(self):
+        return self.tap.tap_connector.current_version in self.changed_versions
+
+    def clear_sync_caches(self):
+        pass
+
+    def sync(self):
+        self.syncs.append(self.tap.tap_connector.current_version)
+        if len(self.syncs) == 2:
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    def finalize_state_progress_markers(self):
+        self.tap.events.append(("state", self.name))
+
+
+class StandInConnector:
+    def __init__(self, versions):
+        self.versions = iter(versions)
+        self.current_version = None
+        self.polls = 0
+
+    @property
+    def change_tracking_current_version(self):
+        self.polls += 1
+        self.current_version = next(self.versions)
+        return self.current_version
+
+
+def test_follow_syncs_changed_streams_until_sigterm():
+    tap = SimpleNamespace(
+        config={"follow_min_interval_seconds": 0.001, "follow_max_interval_seconds": 0.004},
+        logger=logging.getLogger("test"),
+        tap_connector=StandInConnector([1, 1, 1, 2, 2, 3, 4, 5]),
+        events=[],
+    )
+    persons = StandInStream("Persons", {2, 3}, tap)
+    orders = StandInStream("Orders", {3}, tap)
+    tap.streams = {"dbo-Persons": persons, "dbo-Orders": orders}
+    tap.sync_all = lambda: tap.events.append(("sync_all",))
+    tap.get_follow_streams = lambda: [persons, orders]
+    previous_handler = signal.getsignal(signal.SIGTERM)
+
+    TapMSSQL.follow(tap)
+
+    assert tap.events[0] == ("sync_all",)
+    assert persons.syncs == [2, 3]
+    # The stream synced when SIGTERM arrived completes, the next one is not synced.
+    assert orders.syncs == []
+    assert tap.events[-1] == ("state", "Persons")
+    assert tap.tap_connector.polls == 6
+    assert signal.getsignal(signal.SIGTERM) == previous_handler
+    assert persons.stop_requested.is_set()
+
+
+def test_streams_are_not_synced_once_stop_is_requested():
+    tap = TapMSSQL(config=SAMPLE_CONFIG_INCREMENTAL, catalog="tests/resources/persons_catalog_incremental.json")
+    messages = []
+    tap.write_message = lambda message: messages.append(message.to_dict())
+    stopped = threading.Event()
+    stopped.set()
+    tap.streams["dbo-Persons"].stop_requested = stopped
+
+    tap.sync_all()
+    assert not [message for message in messages if message["type"] == "RECORD"]
+
+
+def test_only_streams_with_change_tracking_and_primary_keys_are_followed(monkeypatch):
+    monkeypatch.setattr(MSSQLConnector, "change_tracking_tables", ["Persons"])
+    tap = TapMSSQL(
+        config=SAMPLE_CONFIG_CHANGE_TRACKING, catalog="tests/resources/persons_catalog_change_tracking.json"
+    )
+    stream = tap.streams["dbo-Persons"]
+    stream.__dict__["table_is_change_tracking_enabled"] = True
+    assert tap.get_follow_streams() == [stream]
+    stream.__dict__["table_is_change_tracking_enabled"] = False
+    assert tap.get_follow_streams() == []
@@ -43,4 +43,65 @@ def test_incremental(db_connection):
         catalog="tests/resources/persons_catalog_incremental.json",
     )
     test_runner.sync_all()
-    assert len(test_runner.record_messages) == 1
\ No newline at end of file
+    assert len(test_runner.record_messages) == 1
+
+def test_incremental_composite_bookmark(db_connection):
+    """Check that a composite bookmark resumes after the bookmarked row"""
+    fake = Faker()
+    for person_id in (3, 4, 5):
+        db_connection.execute(
+            sa.text(
+                """
+                    INSERT INTO melty_inc.dbo.Persons (PersonID, FirstName, UpdatedAt)
+                    VALUES (:personid, :firstname, :updatedat)
+                """
+            ), {
+                "personid": person_id,
+                "firstname": fake.first_name(),
+                "updatedat": datetime.datetime(2022, 12, 1).isoformat()
+            })
+    db_connection.commit()
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config={**SAMPLE_CONFIG_INCREMENTAL, "composite_bookmarks": True},
+        catalog="tests/resources/persons_catalog_incremental.json",
+        state={
+            "bookmarks": {
+                "dbo-Persons": {
+                    "replication_key": "UpdatedAt",
+                    "replication_key_value": "2022-12-01T00:00:00+00:00",
+                    "last_primary_key": [3],
+                }
+            }
+        },
+    )
+    test_runner.sync_all()
+    assert [record["record"]["PersonID"] for record in test_runner.record_messages] == [4, 5]
+    bookmark = test_runner.state_messages[-1]["value"]["bookmarks"]["dbo-Persons"]
+    assert bookmark["last_primary_key"] == [5]
+
+
+def test_incremental_skips_unchanged_stream(db_connection):
+    """Check that a second sync of an unchanged table emits no records and keeps its bookmark"""
+    config = {**SAMPLE_CONFIG_INCREMENTAL, "skip_unchanged_streams": True}
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=config,
+        catalog="tests/resources/persons_catalog_incremental.json",
+    )
+    test_runner.sync_all()
+    assert test_runner.record_messages
+    state = test_runner.state_messages[-1]["value"]
+    bookmark = state["bookmarks"]["dbo-Persons"]
+    assert bookmark["table_fingerprint"]
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=config,
+        catalog="tests/resources/persons_catalog_incremental.json",
+        state=state,
+    )
+    test_runner.sync_all()
+    assert not test_runner.record_messages
+    assert test_runner.state_messages[-1]["value"]["bookmarks"]["dbo-Persons"] == bookmark
@@ -0,0 +1,56 @@
+import json
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.mssql import pyodbc
+
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_INCREMENTAL
+
+
+def keyless_persons_stream(workers=2):
+    with open("tests/resources/persons_catalog_incremental.json") as catalog_file:
+        catalog = json.load(catalog_file)
+    catalog_entry = catalog["streams"][0]
+    catalog_entry["key_properties"] = []
+    catalog_entry["replication_key"] = None
+    catalog_entry["metadata"][-1]["metadata"].update(
+        {"table-key-properties": [], "replication-key": None}
+    )
+    tap = TapMSSQL(config={**SAMPLE_CONFIG_INCREMENTAL, "parallel_workers": workers}, catalog=catalog)
+    return tap.streams["dbo-Persons"]
+
+
+def test_page_slices_partition_by_physical_location():
+    table = sa.Table("Staging", sa.MetaData(), sa.Column("Payload", sa.String), schema="dbo")
+    stream = keyless_persons_stream(workers=3)
+    queries = stream.get_page_slice_queries(table.select().order_by(table.c.Payload))
+    assert len(queries) == 3
+    for slice_index, query in enumerate(queries):
+        compiled = query.compile(dialect=pyodbc.dialect(), compile_kwargs={"literal_binds": True})
+        assert "ORDER BY" not in str(compiled)
+        assert (
+            f"WHERE CAST(CAST(REVERSE(SUBSTRING(%%physloc%%, 1, 4)) AS BINARY(4)) AS INT) % 3 = {slice_index}"
+            in str(compiled)
+        )
+
+
+def test_columnstore_ranges_keep_null_split_values(monkeypatch):
+    stream = keyless_persons_stream()
+    monkeypatch.setattr(
+        stream.connector, "get_column_segments",
+        lambda table_name, column_name: [(0, 99, 100), (100, 199, 100), (200, 299, 100)],
+    )
+    table = sa.Table(
+        "Persons", sa.MetaData(),
+        sa.Column("FirstName", sa.String),
+        sa.Column("PersonID", sa.Integer, nullable=True),
+        schema="dbo",
+    )
+    queries = stream.get_columnstore_queries(table, table.select())
+    conditions = [
+        str(query.compile(dialect=pyodbc.dialect(), compile_kwargs={"literal_binds": True})).split("WHERE ")[1]
+        for query in queries
+    ]
+    assert conditions[0] == "dbo.[Persons].[PersonID] <= 99 OR dbo.[Persons].[PersonID] IS NULL"
+    assert all("IS NULL" not in condition for condition in conditions[1:])
+    assert conditions[-1] == "dbo.[Persons].[PersonID] > 199"
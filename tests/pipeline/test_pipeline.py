@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from tap_mssql.pipeline import RowPrefetcher, estimate_block_size, merge_concurrently
+
+
+class FakeResult:
+    """Stands in for a MappingResult, optionally failing after some rows."""
+
+    def __init__(self, row_count, fail_after=None):
+        self.rows = [{"PersonID": person_id, "FirstName": "x" * 100} for person_id in range(row_count)]
+        self.fail_after = fail_after
+        self.position = 0
+
+    def fetchmany(self, size):
+        if self.fail_after is not None and self.position >= self.fail_after:
+            raise RuntimeError("connection lost")
+        block = self.rows[self.position:self.position + size]
+        self.position += len(block)
+        return block
+
+
+def test_rows_are_yielded_in_order():
+    result = FakeResult(2500)
+    rows = list(RowPrefetcher(result, block_size=100, memory_budget=1024 * 1024))
+    assert [row["PersonID"] for row in rows] == list(range(2500))
+
+
+def test_queue_is_bounded_by_memory_budget():
+    result = FakeResult(2500)
+    block_bytes = estimate_block_size(result.rows[:100])
+    prefetcher = RowPrefetcher(result, block_size=100, memory_budget=block_bytes * 3)
+
+    rows = iter(prefetcher)
+    next(rows)
+    # Give the fetching thread time to fill the queue
+    threading.Event().wait(0.2)
+    # One block is being consumed, three are queued and one waits for space
+    assert result.position <= 100 * 5
+    assert len(list(rows)) == 2499
+
+
+def test_fetch_errors_are_raised_after_fetched_rows():
+    result = FakeResult(2500, fail_after=1000)
+    yielded = []
+    with pytest.raises(RuntimeError, match="connection lost"):
+        for row in RowPrefetcher(result, block_size=100, memory_budget=1024 * 1024):
+            yielded.append(row)
+    assert len(yielded) == 1000
+
+
+def test_closing_early_stops_fetching():
+    result = FakeResult(100000)
+    block_bytes = estimate_block_size(result.rows[:100])
+    rows = iter(RowPrefetcher(result, block_size=100, memory_budget=block_bytes * 2))
+    next(rows)
+    rows.close()
+    assert result.position < 100000
+
+
+def test_merge_concurrently_yields_every_item_once():
+    iterables = [range(start, start + 2500) for start in range(0, 12500, 2500)]
+    items = list(merge_concurrently(iterables, workers=3, block_size=100))
+    assert sorted(items) == list(range(12500))
+
+
+def test_merge_concurrently_raises_errors():
+    def failing():
+        yield 1
+        raise RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        list(merge_concurrently([range(1000), failing()], workers=2, block_size=10))
@@ -0,0 +1,68 @@
+import pytest
+from click.testing import CliRunner
+
+from tap_mssql.planner import get_plan_warnings, parse_showplan
+from tap_mssql.tap import TapMSSQL
+
+SHOWPLAN_XML = """<?xml version="1.0" encoding="utf-16"?>
+<ShowPlanXML xmlns="http://schemas.microsoft.com/sqlserver/2004/07/showplan" Version="1.564" Build="16.0.1000.6">
+  <BatchSequence><Batch><Statements>
+    <StmtSimple StatementText="SELECT ..." StatementType="SELECT" StatementSubTreeCost="12.5" StatementEstRows="50000">
+      <QueryPlan>
+        <MissingIndexes>
+          <MissingIndexGroup Impact="87.2">
+            <MissingIndex Database="[melty]" Schema="[dbo]" Table="[Persons]">
+              <ColumnGroup Usage="INEQUALITY"><Column Name="[UpdatedAt]" ColumnId="3" /></ColumnGroup>
+              <ColumnGroup Usage="INCLUDE"><Column Name="[FirstName]" ColumnId="2" /></ColumnGroup>
+            </MissingIndex>
+          </MissingIndexGroup>
+        </MissingIndexes>
+        <RelOp NodeId="0" PhysicalOp="Sort" LogicalOp="Sort" EstimateRows="50000">
+          <Sort Distinct="0">
+            <RelOp NodeId="1" PhysicalOp="Clustered Index Scan" LogicalOp="Clustered Index Scan" EstimateRows="50000">
+              <IndexScan Ordered="0">
+                <Object Database="[melty]" Schema="[dbo]" Table="[Persons]" Index="[PK_Persons]" />
+              </IndexScan>
+            </RelOp>
+          </Sort>
+        </RelOp>
+      </QueryPlan>
+    </StmtSimple>
+  </Statements></Batch></BatchSequence>
+</ShowPlanXML>"""
+
+
+def test_parse_showplan():
+    summary = parse_showplan(SHOWPLAN_XML)
+    assert summary["estimated_rows"] == 50000
+    assert summary["estimated_cost"] == 12.5
+    assert summary["scans"] == [
+        {"operator": "Clustered Index Scan", "object": "[dbo].[Persons]", "estimated_rows": 50000}
+    ]
+    assert summary["sorts"] == [{"estimated_rows": 50000}]
+    assert summary["missing_indexes"] == [
+        {"object": "[dbo].[Persons]", "impact": 87.2, "inequality": ["[UpdatedAt]"], "include": ["[FirstName]"]}
+    ]
+
+
+def test_plan_warnings():
+    warnings = get_plan_warnings(parse_showplan(SHOWPLAN_XML))
+    assert warnings[0] == "Clustered Index Scan of [dbo].[Persons] (~50000 rows)."
+    assert warnings[1] == "Sort of ~50000 rows."
+    assert warnings[2].startswith("Missing index on [dbo].[Persons] (impact 87%)")
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--plan", "--about"],
+        ["--follow", "--about"],
+        ["--plan", "--follow"],
+        ["--discover", "--plan"],
+        ["--follow", "--discover"],
+    ],
+)
+def test_plan_and_follow_reject_other_modes(args):
+    result = CliRunner().invoke(TapMSSQL.cli, args)
+    assert result.exit_code == 2
+    assert "cannot be combined" in result.output
@@ -0,0 +1,128 @@
+import datetime
+import decimal
+import gzip
+import json
+import time
+import uuid
+
+import pytest
+import sqlalchemy as sa
+
+from tap_mssql.client import MSSQLConnector
+from tap_mssql.replay import QueryRecorder, QueryReplayer, ReplayDBAPI, decode_value, encode_value
+from tests.settings import SAMPLE_CONFIG_CORE
+
+# Statements SQLAlchemy executes when the first connection is opened.
+CONNECT_STATEMENTS = {
+    "SELECT CAST(SERVERPROPERTY('ProductVersion') AS VARCHAR)": [["16.0.1000.6"]],
+    "SELECT schema_name()": [["dbo"]],
+    "SELECT CAST('test max support' AS NVARCHAR(max))": [["test max support"]],
+    "SELECT 1": [[1]],
+}
+
+
+def write_recording(path, entries):
+    with gzip.open(path, "wt", encoding="utf-8") as recording:
+        for entry in entries:
+            recording.write(json.dumps(entry) + "\n")
+
+
+def recorded(statement, rows, parameters=(), wall_time_ms=0.0):
+    return {
+        "statement": statement,
+        "parameters": list(parameters),
+        "columns": ["value"],
+        "rowcount": -1,
+        "rows": rows,
+        "time_to_first_row_ms": wall_time_ms / 2 if rows else None,
+        "wall_time_ms": wall_time_ms,
+    }
+
+
+def test_values_keep_their_type():
+    values = [
+        None, True, 7, 1.5, "text", b"\x00\xff",
+        datetime.datetime(2024, 5, 1, 9, 30, tzinfo=datetime.timezone.utc),
+        datetime.date(2024, 5, 1), datetime.time(9, 30), decimal.Decimal("1.10"), uuid.uuid4(),
+    ]
+    decoded = [decode_value(json.loads(json.dumps(encode_value(value)))) for value in values]
+    assert decoded == values
+    assert [type(value) for value in decoded] == [type(value) for value in values]
+
+
+def test_recorded_statements_are_replayed(tmp_path):
+    path = tmp_path / "sync.jsonl.gz"
+    engine = sa.create_engine("sqlite://")
+    recorder = QueryRecorder(path)
+    sa.event.listen(
+        engine,
+        "do_connect",
+        lambda dialect, connection_record, cargs, cparams: recorder.wrap(
+            dialect.loaded_dbapi.connect(*cargs, **cparams), dialect.loaded_dbapi.Error
+        ),
+    )
+    with engine.connect() as conn:
+        conn.execute(sa.text("CREATE TABLE Persons (PersonID int, FirstName varchar(255))"))
+        conn.execute(sa.text("INSERT INTO Persons VALUES (1, 'Ada'), (2, 'Grace'), (3, NULL)"))
+        query = sa.text("SELECT PersonID, FirstName FROM Persons WHERE PersonID >= :min_id ORDER BY PersonID")
+        expected = [tuple(row) for row in conn.execute(query, {"min_id": 2})]
+        conn.execute(query, {"min_id": 3}).all()
+
+    replayer = QueryReplayer(path, speed=0)
+    cursor = replayer.connect().cursor()
+    statement = "SELECT PersonID, FirstName FROM Persons WHERE PersonID >= ? ORDER BY PersonID"
+    cursor.execute(statement, (2,))
+    assert [column[0] for column in cursor.description] == ["PersonID", "FirstName"]
+    assert cursor.fetchmany(1) + cursor.fetchall() == expected
+    cursor.execute(statement, (3,))
+    assert cursor.fetchall() == [(3, None)]
+    with pytest.raises(ReplayDBAPI.ProgrammingError):
+        cursor.execute("SELECT * FROM Orders")
+
+
+def test_repeated_statements_are_replayed_in_order(tmp_path):
+    path = tmp_path / "sync.jsonl.gz"
+    write_recording(path, [
+        recorded("SELECT CHANGE_TRACKING_CURRENT_VERSION()", [[5]]),
+        recorded("SELECT CHANGE_TRACKING_CURRENT_VERSION()", [[9]]),
+    ])
+    cursor = QueryReplayer(path, speed=0).connect().cursor()
+    versions = [cursor.execute("SELECT CHANGE_TRACKING_CURRENT_VERSION()").fetchone()[0] for _ in range(3)]
+    assert versions == [5, 9, 9]
+
+
+def test_unrecorded_parameters_fail_unless_any_parameters_are_served(tmp_path):
+    path = tmp_path / "sync.jsonl.gz"
+    write_recording(path, [recorded("SELECT PersonID FROM Persons WHERE PersonID > ?", [[3]], parameters=[2])])
+    statement = "SELECT PersonID FROM Persons WHERE PersonID > ?"
+    cursor = QueryReplayer(path, speed=0).connect().cursor()
+    with pytest.raises(ReplayDBAPI.ProgrammingError, match=r"parameters \[7\]"):
+        cursor.execute(statement, (7,))
+
+    cursor = QueryReplayer(path, speed=0, any_parameters=True).connect().cursor()
+    assert cursor.execute(statement, (7,)).fetchall() == [(3,)]
+
+
+def test_recorded_times_are_replayed(tmp_path):
+    path = tmp_path / "sync.jsonl.gz"
+    write_recording(path, [recorded("SELECT value FROM Numbers", [[i] for i in range(10)], wall_time_ms=200.0)])
+    cursor = QueryReplayer(path, speed=0.5).connect().cursor()
+    started = time.perf_counter()
+    cursor.execute("SELECT value FROM Numbers")
+    assert len(cursor.fetchall()) == 10
+    assert time.perf_counter() - started >= 0.1
+
+
+def test_connector_replays_without_database(tmp_path):
+    path = tmp_path / "sync.jsonl.gz"
+    write_recording(path, [
+        *(recorded(statement, rows) for statement, rows in CONNECT_STATEMENTS.items()),
+        recorded("SELECT CHANGE_TRACKING_CURRENT_VERSION()", [[1042]]),
+    ])
+    connector = MSSQLConnector(config={
+        **SAMPLE_CONFIG_CORE,
+        "password": "replayed",
+        "sql_replay_file": str(path),
+        "sql_replay_speed": 0,
+    })
+    assert connector.change_tracking_current_version == 1042
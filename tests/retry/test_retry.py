@@ -0,0 +1,124 @@
+import contextlib
+import json
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects.mssql import pyodbc
+
+from tap_mssql.client import MSSQLConnector
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_CORE
+
+
+class FakePyodbcError(Exception):
+    """Stands in for pyodbc.Error, holding the SQLSTATE and message."""
+
+
+def dbapi_error(sqlstate, message):
+    return sa.exc.DBAPIError("SELECT", {}, FakePyodbcError(sqlstate, message))
+
+
+DEADLOCK = dbapi_error("40001", "[40001] [Microsoft][ODBC Driver 18 for SQL Server][SQL Server]Transaction (Process ID 52) "
+                                "was deadlocked on lock resources with another process and has been chosen as the deadlock "
+                                "victim. Rerun the transaction. (1205) (SQLExecDirectW)")
+FAILOVER = dbapi_error("42000", "[42000] [Microsoft][ODBC Driver 18 for SQL Server][SQL Server]Database 'melty' on server "
+                                "'melty' is not currently available. (40613) (SQLDriverConnect)")
+INVALID_OBJECT = dbapi_error("42S02", "[42S02] [Microsoft][ODBC Driver 18 for SQL Server][SQL Server]Invalid object name "
+                                      "'dbo.Missing'. (208) (SQLExecDirectW)")
+
+
+class FakeConnection:
+    """Serves rows for queries, failing after a number of rows where scripted."""
+
+    def __init__(self, rows, failures):
+        self.rows = rows
+        self.failures = failures
+        self.executed = []
+
+    def execute(self, query, parameters):
+        self.executed.append((query, parameters))
+        start = parameters.get("after", -1) + 1
+        failure = self.failures.pop(0) if self.failures else None
+
+        def rows():
+            for index, row in enumerate(self.rows[start:]):
+                if failure is not None and index == failure[0]:
+                    raise failure[1]
+                yield row
+
+        return SimpleNamespace(mappings=rows)
+
+
+def persons_stream(rows, failures, retries=3):
+    """Builds the Persons stream from its catalog entry, stubbing only the connection."""
+    with open("tests/resources/persons_catalog.json") as catalog_file:
+        catalog = json.load(catalog_file)
+    tap = TapMSSQL(config={**SAMPLE_CONFIG_CORE, "transient_error_retries": retries}, catalog=catalog)
+    stream = tap.streams["dbo-Persons"]
+    stream.TRANSIENT_ERROR_BACKOFF_SECONDS = 0.001
+    stream.TRANSIENT_ERROR_MAX_BACKOFF_SECONDS = 0.002
+    connection = FakeConnection(rows, failures)
+    stream.connector._connect = lambda: contextlib.nullcontext(connection)
+    return stream, connection
+
+
+ROWS = [{"PersonID": person_id} for person_id in range(10)]
+
+
+def resume(record):
+    return "resumed", {"after": record["PersonID"]}
+
+
+def test_transient_errors_are_classified():
+    connector = MSSQLConnector(SAMPLE_CONFIG_CORE)
+    assert connector.is_transient_error(DEADLOCK)
+    assert connector.is_transient_error(FAILOVER)
+    assert connector.is_transient_error(dbapi_error("08S01", "[08S01] Communication link failure (10054)"))
+    assert not connector.is_transient_error(INVALID_OBJECT)
+    assert connector.is_transient_error(DEADLOCK.orig)
+
+
+def test_query_failing_before_any_record_is_run_again():
+    stream, connection = persons_stream(ROWS, [(0, FAILOVER), (0, DEADLOCK)])
+    records = list(stream.fetch_records("query"))
+    assert records == ROWS
+    assert [query for query, _ in connection.executed] == ["query", "query", "query"]
+
+
+def test_read_resumes_after_the_last_emitted_record():
+    stream, connection = persons_stream(ROWS, [(4, DEADLOCK), (2, FAILOVER)])
+    records = list(stream.fetch_records("query", resume=resume))
+    assert records == ROWS
+    assert connection.executed == [("query", {}), ("resumed", {"after": 3}), ("resumed", {"after": 5})]
+
+
+def test_read_that_cannot_resume_fails():
+    stream, _ = persons_stream(ROWS, [(4, DEADLOCK)])
+    records = []
+    with pytest.raises(sa.exc.DBAPIError):
+        records.extend(stream.fetch_records("query"))
+    assert records == ROWS[:4]
+
+
+def test_fatal_errors_and_exhausted_retries_fail():
+    stream, connection = persons_stream(ROWS, [(0, INVALID_OBJECT)])
+    with pytest.raises(sa.exc.DBAPIError, match="Invalid object name"):
+        list(stream.fetch_records("query", resume=resume))
+    assert len(connection.executed) == 1
+
+    stream, connection = persons_stream(ROWS, [(0, DEADLOCK)] * 3, retries=2)
+    with pytest.raises(sa.exc.DBAPIError, match="deadlock"):
+        list(stream.fetch_records("query", resume=resume))
+    assert len(connection.executed) == 3
+
+
+def test_resume_condition_orders_by_replication_key_then_primary_key():
+    table = sa.Table("Orders", sa.MetaData(), sa.Column("UpdatedAt", sa.Integer), sa.Column("OrderID", sa.Integer))
+    stream, _ = persons_stream(ROWS, [])
+    condition = stream.get_resume_condition([table.c.UpdatedAt, table.c.OrderID], {"UpdatedAt": 7, "OrderID": 3})
+    compiled = condition.compile(dialect=pyodbc.dialect(), compile_kwargs={"literal_binds": True})
+    assert str(compiled) == (
+        '[Orders].[UpdatedAt] > 7 OR [Orders].[UpdatedAt] = 7 AND [Orders].[OrderID] > 3'
+    )
+    assert stream.get_resume_condition([table.c.UpdatedAt], {"UpdatedAt": None}) is None
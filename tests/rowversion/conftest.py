@@ -0,0 +1,13 @@
+import pytest
+
+from tests.conftest import persons_table
+
+
+@pytest.fixture(scope="function")
+def database_name():
+    return "melty_rv"
+
+
+@pytest.fixture(scope="function")
+def database_statements(database_name):
+    return [persons_table(database_name, "RowVersion rowversion")]
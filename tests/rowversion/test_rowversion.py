@@ -0,0 +1,54 @@
+import sqlalchemy as sa
+from singer_sdk.testing import TapTestRunner
+
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_ROWVERSION
+
+
+def test_rowversion_discovery(db_connection):
+    """Check that a rowversion column is discovered as an integer replication key"""
+    tap = TapMSSQL(config=SAMPLE_CONFIG_ROWVERSION)
+    catalog_entry = next(
+        stream for stream in tap.catalog_dict["streams"]
+        if stream["tap_stream_id"] == "dbo-Persons"
+    )
+    assert catalog_entry["schema"]["properties"]["RowVersion"]["type"][0] == "integer"
+    stream_metadata = next(
+        metadata["metadata"] for metadata in catalog_entry["metadata"]
+        if metadata["breadcrumb"] == []
+    )
+    assert stream_metadata["valid-replication-keys"] == ["RowVersion"]
+
+
+def test_rowversion_incremental(db_connection, insert_persons):
+    """Check that only rows changed after the integer bookmark are emitted"""
+    insert_persons(range(50))
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_ROWVERSION,
+        catalog="tests/resources/persons_catalog_rowversion.json",
+    )
+    test_runner.sync_all()
+    assert len(test_runner.record_messages) == 50
+    assert all(isinstance(person["record"]["RowVersion"], int) for person in test_runner.record_messages)
+
+    bookmark = test_runner.state_messages[-1]["value"]["bookmarks"]["dbo-Persons"]["replication_key_value"]
+    assert isinstance(bookmark, int)
+
+    insert_persons(range(50, 53))
+    db_connection.execute(
+        sa.text("UPDATE melty_rv.dbo.Persons SET FirstName = 'Updated' WHERE PersonID = 1"))
+    db_connection.commit()
+
+    test_runner_after_changes = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_ROWVERSION,
+        catalog="tests/resources/persons_catalog_rowversion.json",
+        state=test_runner.state_messages[-1]["value"]
+    )
+    test_runner_after_changes.sync_all()
+
+    # The bookmark row itself is not emitted again
+    all_person_ids_in_new_records = [person["record"]["PersonID"] for person in test_runner_after_changes.record_messages]
+    assert sorted(all_person_ids_in_new_records) == [1, 50, 51, 52]
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.mssql import pyodbc
+
+from tap_mssql.client import MSSQLStream
+
+ORDERS = sa.Table(
+    "Orders",
+    sa.MetaData(),
+    sa.Column("OrderID", sa.Integer),
+    sa.Column("UpdatedAt", sa.Integer),
+    schema="dbo",
+)
+
+
+def get_sample_percent(tap_stream_id, sample_percent):
+    stream = SimpleNamespace(
+        tap_stream_id=tap_stream_id, config={"sample_percent": sample_percent}
+    )
+    return MSSQLStream.sample_percent.func(stream)
+
+
+def test_streams_are_sampled_by_stream_id_or_pattern():
+    sample_percent = {"sales-*": 5, "dbo-Orders": 1}
+    assert get_sample_percent("dbo-Orders", sample_percent) == 1
+    assert get_sample_percent("sales-Invoices", sample_percent) == 5
+    assert get_sample_percent("dbo-Persons", sample_percent) is None
+    assert get_sample_percent("dbo-Orders", None) is None
+
+
+def compile_sample_query(is_view):
+    stream = SimpleNamespace(
+        sample_percent=2.5,
+        _singer_catalog_entry=SimpleNamespace(is_view=is_view),
+    )
+    query = sa.select(ORDERS).where(ORDERS.c.UpdatedAt > 7).order_by(ORDERS.c.OrderID)
+    compiled = MSSQLStream.get_sample_query(stream, ORDERS, query).compile(
+        dialect=pyodbc.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return " ".join(str(compiled).split())
+
+
+def test_tables_are_sampled_by_page():
+    assert compile_sample_query(is_view=False) == (
+        "SELECT [Orders].[OrderID], [Orders].[UpdatedAt] "
+        "FROM dbo.[Orders] AS [Orders] TABLESAMPLE system(2.5 PERCENT) "
+        "WHERE [Orders].[UpdatedAt] > 7 ORDER BY [Orders].[OrderID]"
+    )
+
+
+def test_views_are_sampled_by_row():
+    assert compile_sample_query(is_view=True) == (
+        "SELECT dbo.[Orders].[OrderID], dbo.[Orders].[UpdatedAt] FROM dbo.[Orders] "
+        "WHERE dbo.[Orders].[UpdatedAt] > 7 AND RAND(CHECKSUM(NEWID())) * 100 < 2.5 "
+        "ORDER BY dbo.[Orders].[OrderID]"
+    )
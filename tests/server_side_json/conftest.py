@@ -0,0 +1,39 @@
+import pytest
+
+WIDE_COLUMN_COUNT = 10
+ROW_COUNT = 5000
+
+
+@pytest.fixture(scope="function")
+def database_name():
+    return "melty_json"
+
+
+@pytest.fixture(scope="function")
+def database_statements(database_name):
+    typed_columns = ", ".join(
+        f"Amount{index} decimal(18, 4), CreatedAt{index} datetime2, "
+        f"Uid{index} uniqueidentifier, Payload{index} varbinary(16), Flag{index} bit, "
+        f"Note{index} nvarchar(100)"
+        for index in range(WIDE_COLUMN_COUNT)
+    )
+    typed_values = ", ".join(
+        f"CAST(n.id * 1.5 AS decimal(18, 4)), DATEADD(SECOND, n.id, '2022-10-20T12:34:56.123456'), "
+        f"NEWID(), CAST(n.id AS varbinary(16)), n.id % 2, "
+        f"CASE WHEN n.id % 3 = 0 THEN NULL ELSE N'note ' + CAST(n.id AS nvarchar(10)) END"
+        for _ in range(WIDE_COLUMN_COUNT)
+    )
+    return [
+        f"""CREATE TABLE {database_name}.dbo.Wide (
+                WideID int PRIMARY KEY,
+                {typed_columns}
+            );""",
+        f"""
+        WITH n AS (
+            SELECT TOP ({ROW_COUNT}) ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS id
+            FROM sys.all_objects a CROSS JOIN sys.all_objects b
+        )
+        INSERT INTO {database_name}.dbo.Wide
+        SELECT n.id, {typed_values} FROM n
+        """,
+    ]
@@ -0,0 +1,30 @@
+import pytest
+from singer_sdk.testing import TapTestRunner
+
+from tap_mssql.tap import TapMSSQL
+from tests.server_side_json.conftest import ROW_COUNT
+from tests.settings import SAMPLE_CONFIG_SERVER_SIDE_JSON
+
+
+def sync_records(server_side_json):
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config={**SAMPLE_CONFIG_SERVER_SIDE_JSON, "server_side_json": server_side_json},
+    )
+    test_runner.sync_all()
+    return [
+        message["record"] for message in test_runner.record_messages
+        if message["stream"] == "dbo-Wide"
+    ]
+
+
+@pytest.mark.usefixtures("db_connection")
+def test_server_side_json_matches_python_conversion():
+    """Check that records rendered by FOR JSON match the ones converted in Python"""
+    records = sync_records(server_side_json=False)
+    json_records = sync_records(server_side_json=True)
+
+    assert len(json_records) == ROW_COUNT
+    records_by_id = {record["WideID"]: record for record in records}
+    for json_record in json_records:
+        assert json_record == records_by_id[json_record["WideID"]]
@@ -29,107 +29,31 @@ SAMPLE_CONFIG_CORE = {
     ]
 }
 
-SAMPLE_CONFIG_COLUMN_NAMES = {
-    "host": "localhost",
-    "port": 1433,
-    "username": "sa",
-    "password": "!Melty8Melty!",
-    "database": "melty_column_names",
-    "sqlalchemy_url_query_options": [
-        {
-            "key": "driver",
-            "value": "ODBC Driver 18 for SQL Server"
-        },
-        {
-            "key": "TrustServerCertificate",
-            "value": "Yes"
-        },
-        {
-            "key": "authentication",
-            "value": "SqlPassword"
-        },
-        {
-            "key": "autocommit",
-            "value": "true"
-        }
-    ]
-}
+SAMPLE_CONFIG_COLUMN_NAMES = {**SAMPLE_CONFIG_CORE, "database": "melty_column_names"}
 
-SAMPLE_CONFIG_COLUMN_NAMES_CHANGE_TRACKING = {
-    "host": "localhost",
-    "port": 1433,
-    "username": "sa",
-    "password": "!Melty8Melty!",
-    "database": "melty_column_names_ct",
-    "sqlalchemy_url_query_options": [
-        {
-            "key": "driver",
-            "value": "ODBC Driver 18 for SQL Server"
-        },
-        {
-            "key": "TrustServerCertificate",
-            "value": "Yes"
-        },
-        {
-            "key": "authentication",
-            "value": "SqlPassword"
-        },
-        {
-            "key": "autocommit",
-            "value": "true"
-        }
-    ]
-}
+SAMPLE_CONFIG_COLUMN_NAMES_CHANGE_TRACKING = {**SAMPLE_CONFIG_CORE, "database": "melty_column_names_ct"}
 
-SAMPLE_CONFIG_CHANGE_TRACKING = {
-    "host": "localhost",
-    "port": 1433,
-    "username": "sa",
-    "password": "!Melty8Melty!",
-    "database": "melty_ct",
-    "sqlalchemy_url_query_options": [
-        {
-            "key": "driver",
-            "value": "ODBC Driver 18 for SQL Server"
-        },
-        {
-            "key": "TrustServerCertificate",
-            "value": "Yes"
-        },
-        {
-            "key": "authentication",
-            "value": "SqlPassword"
-        },
-        {
-            "key": "autocommit",
-            "value": "true"
-        }
-    ]
-}
+SAMPLE_CONFIG_CHANGE_TRACKING = {**SAMPLE_CONFIG_CORE, "database": "melty_ct"}
 
 SAMPLE_CONFIG_INCREMENTAL = {
-    "host": "localhost",
-    "port": 1433,
-    "username": "sa",
-    "password": "!Melty8Melty!",
+    **SAMPLE_CONFIG_CORE,
     "database": "melty_inc",
-    "sqlalchemy_url_query_options": [
-        {
-            "key": "driver",
-            "value": "ODBC Driver 18 for SQL Server"
-        },
-        {
-            "key": "TrustServerCertificate",
-            "value": "Yes"
-        },
-        {
-            "key": "authentication",
-            "value": "SqlPassword"
-        },
-        {
-            "key": "autocommit",
-            "value": "true"
-        }
-    ],
     "start_date": datetime.datetime(2022, 11, 1).isoformat()
-}
\ No newline at end of file
+}
+
+SAMPLE_CONFIG_TEMPORAL = {**SAMPLE_CONFIG_CORE, "database": "melty_temporal"}
+
+SAMPLE_CONFIG_ROWVERSION = {**SAMPLE_CONFIG_CORE, "database": "melty_rv"}
+
+SAMPLE_CONFIG_CDC = {**SAMPLE_CONFIG_CORE, "database": "melty_cdc"}
+
+SAMPLE_CONFIG_SERVER_SIDE_JSON = {**SAMPLE_CONFIG_CORE, "database": "melty_json"}
+
+SAMPLE_CONFIG_DIFFERENTIAL = {
+    **SAMPLE_CONFIG_CORE,
+    "database": "melty_diff",
+    "differential_sync": True,
+    "differential_sync_range_rows": 10,
+}
+
+SAMPLE_CONFIG_DELETED_ROWS = {**SAMPLE_CONFIG_CORE, "database": "melty_deleted", "deleted_row_detection": True}
@@ -0,0 +1,100 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from tap_mssql.sharding import (
+    assign_shards,
+    get_key_ranges,
+    get_segment_ranges,
+    parse_shard,
+)
+from tap_mssql.tap import TapMSSQL
+
+
+def test_parse_shard():
+    assert parse_shard("1/3") == (0, 3)
+    assert parse_shard("3/3") == (2, 3)
+    for shard in ("0/3", "4/3", "1", "a/b", "1/0"):
+        with pytest.raises(ValueError, match="Invalid shard"):
+            parse_shard(shard)
+
+
+def test_every_item_is_assigned_once_and_balanced():
+    sizes = {(f"dbo-Table{i}", None): 2 ** (i % 12) for i in range(40)}
+    assignments = assign_shards(sizes, 4)
+    assert set(assignments) == set(sizes)
+    totals = [sum(sizes[item] for item, index in assignments.items() if index == shard_index) for shard_index in range(4)]
+    assert max(totals) - min(totals) <= max(sizes.values())
+
+
+def test_assignment_ignores_small_size_changes():
+    sizes = {(f"dbo-Table{i}", None): 1000 * (i + 1) for i in range(10)}
+    resized = {item: size + 1 for item, size in sizes.items() if item != ("dbo-Table9", None)}
+    resized[("dbo-Table9", None)] = sizes[("dbo-Table9", None)]
+    assert assign_shards(sizes, 3) == assign_shards(dict(reversed(resized.items())), 3)
+
+
+def test_key_ranges_cover_all_keys_once():
+    assert get_key_ranges(0, 999, 3) == [(None, 332), (332, 665), (665, None)]
+    ranges = get_key_ranges(1, 1000, 4)
+    assert ranges[0][0] is None
+    assert ranges[-1][1] is None
+    for (_, upper), (lower, _) in zip(ranges, ranges[1:]):
+        assert upper == lower
+    assert get_key_ranges(5, 5, 3) == [(None, 4), (4, 4), (4, None)]
+
+
+def test_segment_ranges_end_on_segment_boundaries():
+    segments = [(0, 99, 100), (100, 199, 100), (200, 299, 100), (300, 399, 100)]
+    assert get_segment_ranges(reversed(segments), 2) == [(None, 199), (199, None)]
+    assert get_segment_ranges(segments, 8) == [(None, 99), (99, 199), (199, 299), (299, None)]
+    assert get_segment_ranges(segments[:1], 4) == [(None, None)]
+    assert get_segment_ranges([], 4) == [(None, None)]
+
+
+def test_every_stream_and_key_range_is_synced_by_one_shard():
+    def get_streams():
+        return [
+            SimpleNamespace(tap_stream_id=f"dbo-Table{i}", selected=True, shard_key_ranges=None)
+            for i in range(5)
+        ]
+
+    tap = SimpleNamespace(
+        config={"shard_key_bounds": {"dbo-Table3": [0, 999]}, "shard_stream_sizes": {"dbo-Table0": 10}},
+        can_split_stream=lambda stream: True,
+        logger=logging.getLogger("test"),
+    )
+    synced = [
+        (stream.tap_stream_id, stream.shard_key_ranges)
+        for shard_index in range(3)
+        for stream in TapMSSQL.get_shard_streams(tap, get_streams(), shard_index, 3)
+    ]
+    assert sorted(synced, key=str) == sorted(
+        [
+            *((f"dbo-Table{i}", None) for i in (0, 1, 2, 4)),
+            *(("dbo-Table3", [key_range]) for key_range in get_key_ranges(0, 999, 3)),
+        ],
+        key=str,
+    )
+
+
+def test_streams_are_balanced_by_their_configured_size():
+    streams = [SimpleNamespace(tap_stream_id=f"dbo-Table{i}", selected=True) for i in range(7)]
+    tap = SimpleNamespace(
+        config={"shard_stream_sizes": {"dbo-Table5": 4000, "dbo-Table2": 2000, "dbo-Table6": 2000}},
+        logger=logging.getLogger("test"),
+    )
+    shards = [
+        [stream.tap_stream_id for stream in TapMSSQL.get_shard_streams(tap, streams, shard_index, 2)]
+        for shard_index in range(2)
+    ]
+    large_streams = sorted(
+        [stream_id for stream_id in shard if stream_id in tap.config["shard_stream_sizes"]] for shard in shards
+    )
+    assert large_streams == [["dbo-Table2", "dbo-Table6"], ["dbo-Table5"]]
+    assert [len(shard) for shard in shards] in ([4, 3], [3, 4])
+    assert shards == [
+        [stream.tap_stream_id for stream in TapMSSQL.get_shard_streams(tap, streams[::-1], shard_index, 2)][::-1]
+        for shard_index in range(2)
+    ]
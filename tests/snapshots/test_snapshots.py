@@ -0,0 +1,53 @@
+import pytest
+
+from tap_mssql.snapshots import diff_key_snapshot, read_key_snapshot
+
+
+def test_first_snapshot_has_no_deleted_keys(tmp_path):
+    path = tmp_path / "persons.jsonl.gz"
+    deleted = list(diff_key_snapshot(path, ["PersonID"], ([i] for i in range(100))))
+    assert deleted == []
+    assert list(read_key_snapshot(path, ["PersonID"])) == [[i] for i in range(100)]
+
+
+def test_missing_keys_are_yielded(tmp_path):
+    path = tmp_path / "persons.jsonl.gz"
+    list(diff_key_snapshot(path, ["PersonID"], ([i] for i in range(100))))
+
+    current = [[i] for i in range(5, 120) if i % 10 != 0]
+    deleted = list(diff_key_snapshot(path, ["PersonID"], iter(current)))
+    assert deleted == [[0], [1], [2], [3], [4], [10], [20], [30], [40], [50], [60], [70], [80], [90]]
+    assert list(read_key_snapshot(path, ["PersonID"])) == current
+
+
+def test_composite_keys(tmp_path):
+    path = tmp_path / "orders.jsonl.gz"
+    list(diff_key_snapshot(path, ["OrderID", "Line"], iter([[1, "a"], [1, "b"], [2, "a"]])))
+    deleted = list(diff_key_snapshot(path, ["OrderID", "Line"], iter([(1, "a"), (2, "a")])))
+    assert deleted == [[1, "b"]]
+
+
+def test_snapshot_for_other_key_properties_is_ignored(tmp_path):
+    path = tmp_path / "persons.jsonl.gz"
+    list(diff_key_snapshot(path, ["PersonID"], ([i] for i in range(10))))
+    assert list(diff_key_snapshot(path, ["Email"], iter([["a@example.com"]]))) == []
+
+
+def test_snapshot_is_kept_when_keys_are_unsorted(tmp_path):
+    path = tmp_path / "persons.jsonl.gz"
+    list(diff_key_snapshot(path, ["PersonID"], ([i] for i in range(10))))
+    with pytest.raises(ValueError, match="ascending order"):
+        list(diff_key_snapshot(path, ["PersonID"], iter([[1], [0]])))
+    assert list(read_key_snapshot(path, ["PersonID"])) == [[i] for i in range(10)]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_string_keys_are_compared_in_server_order(tmp_path):
+    path = tmp_path / "persons.jsonl.gz"
+    # Latin1_General_BIN2 sorts nvarchar by UTF-16 code unit, so a supplementary
+    # character (a surrogate pair) sorts before U+FF21.
+    server_order = [["a"], ["\U0001F600"], ["Ａ"]]
+    list(diff_key_snapshot(path, ["Name"], iter(server_order)))
+    deleted = list(diff_key_snapshot(path, ["Name"], iter([["a"], ["Ａ"]])))
+    assert deleted == [["\U0001F600"]]
+    assert list(read_key_snapshot(path, ["Name"])) == [["a"], ["Ａ"]]
@@ -0,0 +1,64 @@
+import json
+import logging
+from functools import cached_property
+
+from tap_mssql.client import MSSQLChangeTrackingStream, MSSQLStream
+
+
+class StandInStream:
+    """Holds the attributes sparse records are computed from."""
+
+    sparse_properties = cached_property(MSSQLStream.sparse_properties.func)
+    get_sparse_record = MSSQLStream.get_sparse_record
+    log_sparse_metrics = MSSQLStream.log_sparse_metrics
+
+    def __init__(self, schema, primary_keys, sparse_properties=frozenset()):
+        self.name = "dbo-Orders"
+        self.schema = {"properties": schema}
+        self.primary_keys = primary_keys
+        self.SPARSE_PROPERTIES = sparse_properties
+        self.sparse_omitted_properties = 0
+        self.sparse_bytes_saved = 0
+        self.metrics_logger = logging.getLogger("test.metrics")
+
+
+def test_only_nullable_properties_outside_the_primary_key_are_sparse():
+    stream = StandInStream(
+        {
+            "OrderID": {"type": ["integer", "null"]},
+            "Note": {"type": ["string", "null"]},
+            "Total": {"type": "integer"},
+            "_sdc_deleted_at": {"type": ["string"]},
+        },
+        ["OrderID"],
+        MSSQLChangeTrackingStream.SPARSE_PROPERTIES,
+    )
+    assert stream.sparse_properties == {"Note", "_sdc_deleted_at"}
+
+    record = {"OrderID": None, "Note": None, "Total": None, "_sdc_deleted_at": None}
+    assert stream.get_sparse_record(record) == {"OrderID": None, "Total": None}
+
+
+def test_bytes_saved_match_the_serialized_record(caplog):
+    schema = {name: {"type": ["string", "null"]} for name in ("id", "Notiz", "Größe", "Ort")}
+    stream = StandInStream(schema, ["id"])
+    record = {"id": "1", "Notiz": None, "Größe": None, "Ort": "Köln"}
+
+    sparse_record = stream.get_sparse_record(record)
+
+    def size(value):
+        return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode())
+
+    assert sparse_record == {"id": "1", "Ort": "Köln"}
+    assert stream.sparse_omitted_properties == 2
+    assert stream.sparse_bytes_saved == size(record) - size(sparse_record)
+
+    with caplog.at_level(logging.INFO, logger="test.metrics"):
+        stream.log_sparse_metrics()
+    assert [json.loads(message.removeprefix("METRIC: ")) for message in caplog.messages] == [
+        {"type": "counter", "metric": "sparse_omitted_properties", "value": 2,
+         "tags": {"stream": "dbo-Orders"}},
+        {"type": "counter", "metric": "sparse_bytes_saved", "value": size(record) - size(sparse_record),
+         "tags": {"stream": "dbo-Orders"}},
+    ]
+    assert stream.sparse_bytes_saved == 0
@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.fixture(scope="function")
+def database_name():
+    return "melty_temporal"
+
+
+@pytest.fixture(scope="function")
+def database_statements(database_name):
+    return [f"""CREATE TABLE {database_name}.dbo.Persons (
+                    PersonID int PRIMARY KEY,
+                    FirstName varchar(255),
+                    ValidFrom datetime2 GENERATED ALWAYS AS ROW START HIDDEN,
+                    ValidTo datetime2 GENERATED ALWAYS AS ROW END HIDDEN,
+                    PERIOD FOR SYSTEM_TIME (ValidFrom, ValidTo)
+                )
+                WITH (SYSTEM_VERSIONING = ON (HISTORY_TABLE = dbo.PersonsHistory));"""]
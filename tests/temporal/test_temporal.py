@@ -0,0 +1,71 @@
+import sqlalchemy as sa
+from singer_sdk.testing import TapTestRunner
+
+from tap_mssql.tap import TapMSSQL
+from tests.settings import SAMPLE_CONFIG_TEMPORAL
+
+
+def test_initial_sync(db_connection, insert_persons):
+    """Check that the entire table is replicated on a first sync"""
+    person_ids = range(50)
+    insert_persons(person_ids)
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_TEMPORAL,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+    )
+    test_runner.sync_all()
+    assert len(test_runner.record_messages) == 50
+
+    all_person_ids_in_records = [person["record"]["PersonID"] for person in test_runner.record_messages]
+    assert set(all_person_ids_in_records).issuperset(person_ids)
+
+
+def test_changes_since_bookmark(db_connection, insert_persons):
+    """Check that only inserted, updated and deleted rows are emitted after a first sync"""
+    insert_persons(range(50))
+
+    test_runner = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_TEMPORAL,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+    )
+    test_runner.sync_all()
+    assert len(test_runner.record_messages) == 50
+
+    insert_persons(range(50, 53))
+    db_connection.execute(
+        sa.text("UPDATE melty_temporal.dbo.Persons SET FirstName = 'Updated' WHERE PersonID = 1"))
+    db_connection.execute(
+        sa.text("UPDATE melty_temporal.dbo.Persons SET FirstName = 'Twice' WHERE PersonID = 1"))
+    db_connection.execute(
+        sa.text("DELETE FROM melty_temporal.dbo.Persons WHERE PersonID = 2"))
+    db_connection.commit()
+
+    test_runner_after_changes = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_TEMPORAL,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+        state=test_runner.state_messages[-1]["value"]
+    )
+    test_runner_after_changes.sync_all()
+
+    records = {
+        person["record"]["PersonID"]: person["record"]
+        for person in test_runner_after_changes.record_messages
+    }
+    assert len(test_runner_after_changes.record_messages) == 5
+    assert set(records) == {1, 2, 50, 51, 52}
+    assert records[1]["FirstName"] == "Twice"
+    assert records[1]["_sdc_deleted_at"] is None
+    assert records[2]["_sdc_deleted_at"] is not None
+
+    test_runner_unchanged = TapTestRunner(
+        tap_class=TapMSSQL,
+        config=SAMPLE_CONFIG_TEMPORAL,
+        catalog="tests/resources/persons_catalog_change_tracking.json",
+        state=test_runner_after_changes.state_messages[-1]["value"]
+    )
+    test_runner_unchanged.sync_all()
+    assert len(test_runner_unchanged.record_messages) == 0
@@ -0,0 +1,159 @@
+import json
+import logging
+
+import pytest
+import sqlalchemy as sa
+
+from tap_mssql.tracing import StatementTracer, TracingConnection, parse_statistics_messages
+
+STATISTICS_MESSAGES = [
+    "[Microsoft][ODBC Driver 18 for SQL Server][SQL Server]Table 'Persons'. Scan count 1, "
+    "logical reads 12, physical reads 1, page server reads 0, read-ahead reads 8, "
+    "page server read-ahead reads 0, lob logical reads 4, lob physical reads 0",
+    "[Microsoft][ODBC Driver 18 for SQL Server][SQL Server]\n SQL Server Execution Times:\n"
+    "   CPU time = 15 ms,  elapsed time = 21 ms.",
+]
+
+
+class FakeDBAPIError(Exception):
+    """Stands in for pyodbc.Error."""
+
+
+class FakeCursor:
+    """Stands in for a pyodbc cursor returning a fixed set of rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.messages = []
+        self.arraysize = 1
+        self.next_set_error = None
+
+    def execute(self, statement, *parameters):
+        self.position = 0
+        return self
+
+    def fetchone(self):
+        if self.position >= len(self.rows):
+            return None
+        self.position += 1
+        return self.rows[self.position - 1]
+
+    def fetchmany(self, size=None):
+        block = self.rows[self.position:self.position + (size or self.arraysize)]
+        self.position += len(block)
+        return block
+
+    def fetchall(self):
+        return self.fetchmany(len(self.rows))
+
+    def nextset(self):
+        if self.next_set_error is not None:
+            raise self.next_set_error
+        self.messages = [("01000", message) for message in STATISTICS_MESSAGES]
+        return False
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.autocommit = False
+
+    def cursor(self):
+        return FakeCursor(self.rows)
+
+
+def read_trace(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_statements_are_traced(tmp_path):
+    trace_path = tmp_path / "trace.jsonl"
+    connection = TracingConnection(FakeConnection([(1,), (2,), (3,)]), StatementTracer(trace_path), FakeDBAPIError)
+    connection.autocommit = True
+    assert connection._connection.autocommit
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT PersonID FROM dbo.Persons WHERE PersonID > ?", (0,))
+    assert cursor.fetchmany(2) == [(1,), (2,)]
+    assert cursor.fetchall() == [(3,)]
+    cursor.execute("SELECT 1")
+    cursor.close()
+
+    entries = read_trace(trace_path)
+    assert [entry["statement"] for entry in entries] == [
+        "SELECT PersonID FROM dbo.Persons WHERE PersonID > ?",
+        "SELECT 1",
+    ]
+    assert entries[0]["parameters"] == [0]
+    assert entries[0]["row_count"] == 3
+    assert entries[1]["row_count"] == 0
+    assert entries[1]["time_to_first_row_ms"] is None
+    assert entries[0]["time_to_first_row_ms"] <= entries[0]["wall_time_ms"]
+    assert "logical_reads" not in entries[0]
+
+
+def test_statistics_are_traced(tmp_path):
+    trace_path = tmp_path / "trace.jsonl"
+    connection = TracingConnection(FakeConnection([(b"\x00\x01",)]), StatementTracer(trace_path, statistics=True), FakeDBAPIError)
+    cursor = connection.cursor()
+    cursor.execute("SELECT RowVersion FROM dbo.Persons WHERE RowVersion > ?", (b"\x00\x01",))
+    cursor.fetchall()
+    cursor.close()
+
+    [entry] = read_trace(trace_path)
+    assert entry["parameters"] == ["0001"]
+    assert entry["logical_reads"] == 12
+    assert entry["cpu_ms"] == 15
+    assert entry["elapsed_ms"] == 21
+
+
+def test_statistics_that_cannot_be_read_are_skipped(tmp_path, caplog):
+    trace_path = tmp_path / "trace.jsonl"
+    connection = TracingConnection(FakeConnection([(1,)]), StatementTracer(trace_path, statistics=True), FakeDBAPIError)
+    cursor = connection.cursor()
+    cursor.next_set_error = FakeDBAPIError("HY010", "Function sequence error")
+    cursor.execute("SELECT 1")
+    cursor.fetchall()
+    with caplog.at_level(logging.DEBUG, logger="tap_mssql.tracing"):
+        cursor.close()
+
+    [entry] = read_trace(trace_path)
+    assert entry["row_count"] == 1
+    assert entry["logical_reads"] == 0
+    assert "Function sequence error" in caplog.text
+
+    cursor = connection.cursor()
+    cursor.next_set_error = RuntimeError("not a DBAPI error")
+    cursor.execute("SELECT 1")
+    with pytest.raises(RuntimeError):
+        cursor.close()
+
+
+def test_parse_statistics_messages():
+    assert parse_statistics_messages(STATISTICS_MESSAGES) == {
+        "logical_reads": 12,
+        "physical_reads": 1,
+        "read_ahead_reads": 8,
+        "cpu_ms": 15,
+        "elapsed_ms": 21,
+    }
+
+
+def test_engine_connections_are_traced(tmp_path):
+    trace_path = tmp_path / "trace.jsonl"
+    engine = sa.create_engine("sqlite://")
+    tracer = StatementTracer(trace_path)
+    sa.event.listen(
+        engine,
+        "do_connect",
+        lambda dialect, connection_record, cargs, cparams: tracer.wrap(
+            dialect.loaded_dbapi.connect(*cargs, **cparams), dialect.loaded_dbapi.Error
+        ),
+    )
+    with engine.connect() as conn:
+        assert conn.execute(sa.text("SELECT :value"), {"value": 7}).scalar() == 7
+
+    assert any(entry["statement"] == "SELECT ?" and entry["parameters"] == [7] for entry in read_trace(trace_path))
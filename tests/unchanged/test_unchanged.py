@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+from tap_mssql.client import (
+    MSSQLChangeDataCaptureStream,
+    MSSQLChangeTrackingStream,
+    MSSQLStream,
+    lsn_to_bytes,
+)
+
+FINGERPRINT = [3, "2024-05-01T09:00:00", "2024-05-01T09:30:00", "2024-04-01T00:00:00"]
+
+
+def test_streams_are_unchanged_while_their_fingerprint_matches():
+    stream = SimpleNamespace(table_fingerprint=FINGERPRINT, stream_state={"table_fingerprint": list(FINGERPRINT)})
+    assert not MSSQLStream.has_changes(stream)
+    stream.stream_state = {"table_fingerprint": [4, *FINGERPRINT[1:]]}
+    assert MSSQLStream.has_changes(stream)
+    stream.stream_state = {}
+    assert MSSQLStream.has_changes(stream)
+    stream.table_fingerprint = None
+    assert MSSQLStream.has_changes(stream)
+
+
+class StandInConnector:
+    def __init__(self, current_version, changed_versions=()):
+        self.change_tracking_current_version = current_version
+        self.changed_versions = changed_versions
+        self.cdc_lsns = [lsn_to_bytes(version) for version in changed_versions]
+
+    def has_change_tracking_changes(self, table_name, version):
+        return any(changed > version for changed in self.changed_versions)
+
+    def has_cdc_changes(self, capture_instance, from_lsn):
+        return any(lsn >= from_lsn for lsn in self.cdc_lsns)
+
+
+def change_tracking_stream(bookmark, connector, **state):
+    return SimpleNamespace(
+        stream_state={"replication_key_value": bookmark, **state},
+        primary_keys=["PersonID"],
+        table_is_change_tracking_enabled=True,
+        minimum_valid_version=10,
+        connector=connector,
+        fully_qualified_name="dbo.Persons",
+        capture_instance=("dbo_Persons", True),
+    )
+
+
+def test_change_tracking_streams_compare_their_bookmark():
+    has_changes = MSSQLChangeTrackingStream.has_changes
+    assert not has_changes(change_tracking_stream(42, StandInConnector(42, [42])))
+    assert not has_changes(change_tracking_stream(42, StandInConnector(50, [40])))
+    assert has_changes(change_tracking_stream(42, StandInConnector(50, [43])))
+    assert has_changes(change_tracking_stream(None, StandInConnector(42)))
+    assert has_changes(change_tracking_stream(9, StandInConnector(9)))
+    assert has_changes(change_tracking_stream(42, StandInConnector(42), last_primary_key=[1]))
+
+
+def test_change_data_capture_streams_compare_their_bookmark():
+    has_changes = MSSQLChangeDataCaptureStream.has_changes
+    assert not has_changes(change_tracking_stream(42, StandInConnector(0, [42])))
+    assert has_changes(change_tracking_stream(42, StandInConnector(0, [43])))
+    assert has_changes(change_tracking_stream(5, StandInConnector(0)))